@@ -0,0 +1,310 @@
+import heapq
+import math
+import sys
+import time
+import weakref
+from background import PROGRESS_INTERVAL
+from csr_graph import CSRGraph
+
+# Number of ALT landmarks used when process_graph picks the heuristic itself
+DEFAULT_LANDMARKS = 4
+
+# Landmark tables already built for a loaded graph
+_landmark_cache = weakref.WeakKeyDictionary()
+
+
+def astar_csr(graph, source, target=None, heuristic=None, stats=None, progress=None):
+    """
+    A* search over node ids.
+
+    Args:
+        graph (CSRGraph): Graph with non-negative weights.
+        source (int): Source node id.
+        target (int): Target node id; the search stops once it is settled.
+            Without a target the whole reachable graph is settled.
+        heuristic (callable): ``heuristic(node_id)`` returning a lower bound on
+            the distance from that node to the target. None means 0 (Dijkstra).
+        stats (dict): If given, receives ``expanded``, the number of nodes
+            taken off the queue and expanded, and the heap counters
+            ``heap_pops``, ``heap_pushes``, ``stale_skips`` and ``relaxations``.
+        progress (callable): If given, called as ``progress(expanded)`` every
+            ``PROGRESS_INTERVAL`` expansions; it may raise to abandon the search.
+
+    Returns:
+        tuple: ``(dist, pred)`` lists indexed by node id, like ``dijkstra_csr``.
+    """
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [float('inf')] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    dist[source] = 0
+    h = heuristic or (lambda node: 0)
+    open_queue = [(h(source), 0, source)]
+    expanded = 0
+    pops = 0
+
+    while open_queue:
+        _, current_distance, current_node = heapq.heappop(open_queue)
+        pops += 1
+        # Stale entry; a node is only expanded again if a shorter route to it appeared
+        if current_distance > dist[current_node]:
+            continue
+
+        expanded += 1
+        if progress is not None and not expanded % PROGRESS_INTERVAL:
+            progress(expanded)
+        if current_node == target:
+            break
+
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                pred[neighbor] = current_node
+                heapq.heappush(open_queue, (distance + h(neighbor), distance, neighbor))
+
+    if stats is not None:
+        stats['expanded'] = expanded
+        stats['heap_pops'] = pops
+        stats['heap_pushes'] = pops + len(open_queue)
+        stats['stale_skips'] = pops - expanded
+        stats['relaxations'] = stats['heap_pushes'] - 1
+    return dist, pred
+
+
+def astar(graph, start, end, heuristic=None, stats=None, progress=None):
+    """
+    A* search between two labelled nodes.
+
+    Args:
+        graph (CSRGraph or dict): The graph.
+        start (str): Start node label.
+        end (str): End node label.
+        heuristic (callable): ``heuristic(node, end)`` on labels, returning a
+            lower bound on the remaining distance. None uses ALT landmarks.
+        stats (dict): Optional counters, see ``astar_csr``.
+        progress (callable): Optional progress callback, see ``astar_csr``.
+
+    Returns:
+        dict: ``{node: (previous, distance)}`` for the nodes reached, the same
+        format ``dijkstra()`` returns, ready for ``reconstruct_path``.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+
+    source, target = graph.node_id(start), graph.node_id(end)
+    if heuristic is None:
+        node_heuristic = get_landmarks(graph).heuristic(target)
+    else:
+        labels = graph.labels
+        node_heuristic = lambda node: heuristic(labels[node], end)
+
+    dist, pred = astar_csr(graph, source, target, node_heuristic, stats, progress)
+    return graph.to_shortest_paths(dist, pred)
+
+
+# ----- coordinate heuristics -----
+
+def read_coordinates(file_path):
+    """
+    Reads a coordinate file with one ``node x y`` line per node.
+
+    Returns:
+        dict: ``{node: (x, y)}``. Lines that do not parse are skipped.
+    """
+    coordinates = {}
+    with open(file_path, 'r') as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) != 3:
+                continue
+            try:
+                coordinates[parts[0]] = (float(parts[1]), float(parts[2]))
+            except ValueError:
+                print(f"Skipping invalid line: {line.strip()}")
+    return coordinates
+
+
+def euclidean(a, b):
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+METRICS = {"euclidean": euclidean, "manhattan": manhattan}
+
+
+def coordinate_heuristic(coordinates, metric="euclidean", scale=1.0):
+    """
+    Builds a label heuristic from node coordinates.
+
+    The result is admissible only when every edge weight is at least
+    ``scale`` times the metric distance between its endpoints. Nodes without
+    coordinates get 0, which is always safe.
+
+    Args:
+        coordinates (dict): ``{node: (x, y)}``, e.g. from ``read_coordinates``.
+        metric (str): ``"euclidean"`` or ``"manhattan"``.
+        scale (float): Factor converting coordinate distance to weight units.
+
+    Returns:
+        callable: ``heuristic(node, end)`` for ``astar``.
+    """
+    distance = METRICS[metric]
+
+    def heuristic(node, end):
+        if node not in coordinates or end not in coordinates:
+            return 0
+        return scale * distance(coordinates[node], coordinates[end])
+
+    return heuristic
+
+
+# ----- ALT (landmarks + triangle inequality) -----
+
+class Landmarks:
+    """
+    Precomputed distances from and to a few landmark nodes.
+
+    For any node ``v``, target ``t`` and landmark ``L`` the triangle
+    inequality gives ``d(v, t) >= d(L, t) - d(L, v)`` and
+    ``d(v, t) >= d(v, L) - d(t, L)``; the heuristic is the largest of these
+    bounds. It is admissible and consistent for non-negative weights.
+
+    Args:
+        graph (CSRGraph): Graph with non-negative weights.
+        count (int): Number of landmarks, picked farthest-first.
+    """
+
+    def __init__(self, graph, count=DEFAULT_LANDMARKS):
+        self.graph = graph
+        self.landmarks = []
+        self.from_landmark = []
+        self.to_landmark = []
+        if graph.num_nodes == 0:
+            return
+
+        inf = float('inf')
+        reverse = graph.reverse()
+        # Start from the node with the most out-edges, then keep taking the
+        # node farthest from every landmark chosen so far
+        offsets = graph.offsets
+        landmark = max(range(graph.num_nodes), key=lambda v: offsets[v + 1] - offsets[v])
+        nearest = [inf] * graph.num_nodes
+        for _ in range(min(count, graph.num_nodes)):
+            self.landmarks.append(landmark)
+            from_dist, _ = astar_csr(graph, landmark)
+            to_dist, _ = astar_csr(reverse, landmark)
+            self.from_landmark.append(from_dist)
+            self.to_landmark.append(to_dist)
+            for v in range(graph.num_nodes):
+                closest = min(from_dist[v], to_dist[v])
+                if closest < nearest[v]:
+                    nearest[v] = closest
+            candidates = [v for v in range(graph.num_nodes) if nearest[v] > 0]
+            if not candidates:
+                break
+            # Nodes no landmark touches yet come first, then the farthest ones
+            landmark = max(candidates, key=lambda v: (nearest[v] == inf, nearest[v] if nearest[v] != inf else 0))
+
+    def heuristic(self, target):
+        """
+        Returns the ALT lower bound ``h(node_id)`` towards ``target``.
+        """
+        inf = float('inf')
+        tables = [
+            (from_dist, to_dist, from_dist[target], to_dist[target])
+            for from_dist, to_dist in zip(self.from_landmark, self.to_landmark)
+        ]
+
+        def h(node):
+            best = 0
+            for from_dist, to_dist, from_target, to_target in tables:
+                from_node = from_dist[node]
+                if from_target != inf and from_node != inf and from_target - from_node > best:
+                    best = from_target - from_node
+                to_node = to_dist[node]
+                if to_node != inf and to_target != inf and to_node - to_target > best:
+                    best = to_node - to_target
+            return best
+
+        return h
+
+
+def get_landmarks(graph, count=DEFAULT_LANDMARKS):
+    """
+    Returns the ALT landmarks for ``graph``, building them on first use.
+    """
+    landmarks = _landmark_cache.get(graph)
+    if landmarks is None or len(landmarks.landmarks) < min(count, graph.num_nodes):
+        landmarks = Landmarks(graph, count)
+        _landmark_cache[graph] = landmarks
+    return landmarks
+
+
+# ----- benchmark -----
+
+def compare_with_dijkstra(graph, start, end, heuristic=None):
+    """
+    Runs plain Dijkstra (stopping at ``end``) and A* on the same query.
+
+    Returns:
+        dict: Distance, expanded nodes and time in ms for both searches.
+    """
+    from dijkstra import dijkstra_csr
+
+    source, target = graph.node_id(start), graph.node_id(end)
+    results = {}
+    if heuristic is None:
+        get_landmarks(graph)  # Preprocessing is not part of the query time
+
+    dijkstra_stats = {}
+    start_time = time.perf_counter()
+    dist, _ = dijkstra_csr(graph, source, target, stats=dijkstra_stats)
+    results["dijkstra"] = {
+        "distance": dist[target],
+        "expanded": dijkstra_stats['settled'],
+        "time_ms": (time.perf_counter() - start_time) * 1000,
+    }
+
+    astar_stats = {}
+    start_time = time.perf_counter()
+    shortest_paths = astar(graph, start, end, heuristic, astar_stats)
+    results["astar"] = {
+        "distance": shortest_paths[end][1] if end in shortest_paths else float('inf'),
+        "expanded": astar_stats['expanded'],
+        "time_ms": (time.perf_counter() - start_time) * 1000,
+    }
+    return results
+
+
+def main(argv):
+    """
+    Usage: python astar.py <graph file> <start> <end> [coordinate file] [euclidean|manhattan]
+
+    Without a coordinate file the ALT landmark heuristic is used.
+    """
+    if len(argv) < 3:
+        print(main.__doc__.strip())
+        return
+
+    from graph_loader import load_graph
+
+    graph, _, _ = load_graph(argv[0])
+    heuristic = None
+    if len(argv) > 3:
+        metric = argv[4] if len(argv) > 4 else "euclidean"
+        heuristic = coordinate_heuristic(read_coordinates(argv[3]), metric)
+
+    results = compare_with_dijkstra(graph, argv[1], argv[2], heuristic)
+    for name, result in results.items():
+        print(f"{name:>8}: distance {result['distance']}, expanded {result['expanded']} nodes, {result['time_ms']:.3f} ms")
+    if results["dijkstra"]["expanded"]:
+        ratio = results["astar"]["expanded"] / results["dijkstra"]["expanded"]
+        print(f"A* expanded {ratio:.1%} of the nodes Dijkstra settled")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
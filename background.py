@@ -0,0 +1,81 @@
+import threading
+
+# Solvers given a progress callback call it every this many settled nodes or pops
+PROGRESS_INTERVAL = 1024
+
+
+class Cancelled(Exception):
+    """
+    Raised inside a background job once its run was cancelled.
+    """
+
+
+class BackgroundTask:
+    """
+    Runs ``work(task)`` on a daemon thread and hands the outcome back to the
+    Tk main loop, which polls for it with ``after`` so the window keeps
+    handling events while the job runs.
+
+    The job calls ``task.report(message)`` to publish progress; once the task
+    is cancelled that call raises ``Cancelled`` and unwinds the job. Only the
+    latest message is shown, so reporting often is cheap.
+
+    Args:
+        root: Tk widget whose ``after`` schedules the callbacks.
+        work (callable): ``work(task)`` returning the result. It runs off the
+            UI thread and must not touch Tk widgets or pyplot.
+        on_done (callable): ``on_done(result)``, called on the UI thread.
+        on_error (callable): ``on_error(exception)``, called on the UI thread
+            for failures and for ``Cancelled``.
+        on_progress (callable): ``on_progress(message)``, called on the UI thread.
+        poll_ms (int): How often the UI thread checks on the job.
+    """
+
+    def __init__(self, root, work, on_done, on_error, on_progress=None, poll_ms=50):
+        self.root = root
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.poll_ms = poll_ms
+        self._cancel = threading.Event()
+        self._progress = None
+        self._outcome = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    @property
+    def running(self):
+        return self._outcome is None
+
+    def cancel(self):
+        self._cancel.set()
+
+    def report(self, message):
+        if self._cancel.is_set():
+            raise Cancelled()
+        self._progress = message
+
+    def _run(self):
+        try:
+            self._outcome = (True, self.work(self))
+        except Exception as e:
+            self._outcome = (False, e)
+
+    def _poll(self):
+        message, self._progress = self._progress, None
+        if message is not None and self.on_progress is not None:
+            self.on_progress(message)
+        if self._outcome is None:
+            self.root.after(self.poll_ms, self._poll)
+            return
+
+        succeeded, value = self._outcome
+        if succeeded and self._cancel.is_set():
+            # Finished after all, but the user no longer wants the result
+            self.on_error(Cancelled())
+        elif succeeded:
+            self.on_done(value)
+        else:
+            self.on_error(value)
@@ -0,0 +1,237 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+from array import array
+from csr_graph import INDEX_TYPE, CSRGraph, predecessor_path
+from dijkstra import dijkstra_targets
+from graph_loader import load_graph
+from k_shortest import yen_k_shortest_paths
+from telemetry import telemetry
+
+# Graph attached by each worker process (or by the parent when running inline)
+_worker_graph = None
+_worker_memory = None
+
+
+class SharedGraph:
+    """
+    CSR arrays laid out back to back in one int64 buffer:
+    ``offsets`` (num_nodes + 1), then ``targets`` and ``weights`` (num_edges each).
+
+    It carries just what ``dijkstra_csr`` reads, so workers can search a
+    graph that lives in shared memory without unpickling a copy.
+    """
+
+    def __init__(self, buffer, num_nodes, num_edges):
+        view = memoryview(buffer)[:8 * (num_nodes + 1 + 2 * num_edges)].cast(INDEX_TYPE)
+        self.num_nodes = num_nodes
+        self.offsets = view[:num_nodes + 1]
+        self.targets = view[num_nodes + 1:num_nodes + 1 + num_edges]
+        self.weights = view[num_nodes + 1 + num_edges:]
+        self._reverse = None
+
+    def reverse(self):
+        """
+        Returns the transposed graph, built in this process on first use (the
+        k-shortest-paths searches need it); its labels are the node ids.
+        """
+        if self._reverse is None:
+            offsets = self.offsets
+            sources = array(INDEX_TYPE)
+            for u in range(self.num_nodes):
+                sources.extend([u] * (offsets[u + 1] - offsets[u]))
+            self._reverse = CSRGraph.from_id_edges(range(self.num_nodes), self.targets, sources, self.weights)
+        return self._reverse
+
+
+def share_graph(graph):
+    """
+    Copies the CSR arrays of ``graph`` into a new shared memory block.
+
+    Returns:
+        SharedMemory: The block; the caller closes and unlinks it.
+    """
+    size = 8 * (graph.num_nodes + 1 + 2 * graph.num_edges)
+    memory = SharedMemory(create=True, size=max(size, 8))
+    shared = SharedGraph(memory.buf, graph.num_nodes, graph.num_edges)
+    shared.offsets[:] = memoryview(graph.offsets)
+    shared.targets[:] = memoryview(graph.targets)
+    shared.weights[:] = memoryview(graph.weights)
+    del shared
+    return memory
+
+
+def _attach_worker(name, num_nodes, num_edges):
+    global _worker_graph, _worker_memory
+    _worker_memory = SharedMemory(name=name)
+    _worker_graph = SharedGraph(_worker_memory.buf, num_nodes, num_edges)
+    # Drop the views before the block is closed when the worker exits
+    Finalize(None, _detach_worker, exitpriority=10)
+
+
+def _detach_worker():
+    global _worker_graph, _worker_memory
+    _worker_graph = None
+    if _worker_memory is not None:
+        _worker_memory.close()
+        _worker_memory = None
+
+
+def _solve_source(task):
+    # One Dijkstra search per source answers every target queried from it and
+    # stops once they (or the nearest ones) are settled; with k, each target
+    # gets its k shortest paths instead. Results are (target, rank, distance,
+    # path) rows, rank None outside k mode and distance None when unreachable.
+    source, targets, nearest, k = task
+    stats = telemetry.stats()
+    start_time = time.perf_counter()
+    results = []
+    if k is not None:
+        reverse = _worker_graph.reverse()
+        for target in targets:
+            search_stats = {}
+            paths = yen_k_shortest_paths(_worker_graph, source, target, k, search_stats, reverse=reverse)
+            if stats is not None:
+                for key, value in search_stats.items():
+                    stats[key] = stats.get(key, 0) + value
+            results.extend((target, rank, distance, path) for rank, (distance, path) in enumerate(paths, 1))
+            if not paths:
+                results.append((target, None, None, []))
+        return source, results, (time.perf_counter() - start_time) * 1000, stats
+
+    dist, pred, found = dijkstra_targets(_worker_graph, source, targets, nearest, stats)
+    solve_time = (time.perf_counter() - start_time) * 1000
+    # All queried targets in query order, or just the nearest ones found, nearest first
+    answered = [target for target, _ in found] if nearest is not None else targets
+    for target in answered:
+        if dist[target] == float('inf'):
+            results.append((target, None, None, []))
+            continue
+        results.append((target, None, dist[target], predecessor_path(pred, source, target)))
+    return source, results, solve_time, stats
+
+
+def read_queries(file_path):
+    """
+    Reads one ``source target`` pair per line, grouped by source.
+
+    Returns:
+        dict: ``{source: [targets]}`` in first-seen order. Lines that do not
+        hold exactly two labels are skipped.
+    """
+    queries = {}
+    with open(file_path, 'r') as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) != 2:
+                if parts:
+                    print(f"Skipping invalid line: {line.strip()}")
+                continue
+            queries.setdefault(parts[0], []).append(parts[1])
+    return queries
+
+
+def run_batch(graph_file, query_file, output_file, workers=None, nearest=None, k=None):
+    """
+    Answers every query in ``query_file`` and writes the results to ``output_file``.
+
+    The graph is loaded once and copied into shared memory. Sources are spread
+    over a process pool and each result is written as soon as its source finishes.
+    Output lines are tab-separated: ``source, target, distance, path``, with
+    ``inf`` and an empty path when there is no route. With ``k`` a rank column
+    follows the target (``-`` when there is no route).
+
+    Args:
+        graph_file (str): Graph in the ``num_nodes / num_edges / u v w`` format.
+        query_file (str): One ``source target`` pair per line.
+        output_file (str): Results file to write.
+        workers (int): Worker processes; None uses every core, 1 runs inline.
+        nearest (int): Only answer the nearest this many targets of each
+            source, nearest first; unreachable ones are left out.
+        k (int): Write the k shortest loopless paths of every query.
+
+    Returns:
+        int: Number of queries answered.
+    """
+    global _worker_graph
+
+    load_start = time.perf_counter()
+    graph, _, _ = load_graph(graph_file)
+    load_time = (time.perf_counter() - load_start) * 1000
+    if graph.min_weight < 0:
+        raise ValueError("Batch queries use Dijkstra, which needs non-negative weights")
+
+    tasks = []
+    for source, targets in read_queries(query_file).items():
+        missing = [node for node in [source] + targets if node not in graph]
+        if missing:
+            print(f"Skipping unknown node(s) in queries from {source}: {', '.join(missing)}")
+            targets = [node for node in targets if node in graph]
+            if source not in graph or not targets:
+                continue
+        tasks.append((graph.node_id(source), [graph.node_id(node) for node in targets], nearest, k))
+
+    workers = workers or os.cpu_count() or 1
+    answered = 0
+    memory = None
+    pool = None
+    try:
+        if workers == 1 or len(tasks) <= 1:
+            _worker_graph = graph
+            results = map(_solve_source, tasks)
+        else:
+            memory = share_graph(graph)
+            pool = Pool(min(workers, len(tasks)), initializer=_attach_worker,
+                        initargs=(memory.name, graph.num_nodes, graph.num_edges))
+            results = pool.imap_unordered(_solve_source, tasks)
+
+        with open(output_file, 'w') as file:
+            for source, source_results, solve_time, stats in results:
+                for target, rank, distance, path in source_results:
+                    distance_text = "inf" if distance is None else str(distance)
+                    rank_text = "" if k is None else ("-" if rank is None else str(rank)) + "\t"
+                    file.write(f"{graph.label(source)}\t{graph.label(target)}\t{rank_text}{distance_text}\t{' -> '.join(graph.path_labels(path))}\n")
+                # In k mode every query starts with rank 1, or "-" when it has no route
+                queries = len(source_results) if k is None else sum(1 for row in source_results if row[1] in (None, 1))
+                answered += queries
+                file.flush()
+                # One record per source tree; the load time is shared by all of them
+                telemetry.record("batch", graph_file=graph_file, source=graph.label(source),
+                                 targets=queries, nearest=nearest, k=k, num_nodes=graph.num_nodes,
+                                 num_edges=graph.num_edges, load_ms=load_time,
+                                 solve_ms=solve_time, **(stats or {}))
+    finally:
+        _worker_graph = None
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if memory is not None:
+            memory.close()
+            memory.unlink()
+    return answered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer many shortest-path queries on one graph.")
+    parser.add_argument("graph_file", help="graph file (num_nodes / num_edges / u v w)")
+    parser.add_argument("query_file", help="one 'source target' pair per line")
+    parser.add_argument("output_file", help="tab-separated results to write")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--nearest", type=int, help="only answer the nearest N targets of each source")
+    parser.add_argument("--k", type=int, help="write the k shortest loopless paths of every query")
+    args = parser.parse_args()
+    if args.nearest is not None and args.k is not None:
+        parser.error("--nearest and --k cannot be combined")
+    if any(value is not None and value < 1 for value in (args.nearest, args.k)):
+        parser.error("--nearest and --k must be positive")
+
+    start_time = time.perf_counter()
+    answered = run_batch(args.graph_file, args.query_file, args.output_file, args.workers, args.nearest, args.k)
+    print(f"Answered {answered} queries in {time.perf_counter() - start_time:.6f} seconds")
+
+
+if __name__ == "__main__":
+    main()
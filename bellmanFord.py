@@ -1,213 +1,420 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox
-import networkx as nx
-import matplotlib.pyplot as plt
-import cv2
-import os
 import time
+from collections import deque
+from background import PROGRESS_INTERVAL
+from csr_graph import predecessor_path
+from graph_loader import load_graph
+from telemetry import telemetry
 
-# Function to save and display graphs
-def save_and_display_graphs(graph_files_folder):
-    images = []
-    for file_name in sorted(os.listdir(graph_files_folder)):
-        if file_name.endswith(".png"):
-            img = cv2.imread(os.path.join(graph_files_folder, file_name))
-            images.append(img)
-
-    for img in images:
-        cv2.imshow("Graph Visualization", img)
-        key = cv2.waitKey(0)  # Wait for user input to show the next graph
-        if key == 27:  # Press ESC to exit early
-            break
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for method="numpy"
+    np = None
 
-    cv2.destroyAllWindows()
+# Bellman-Ford variants offered by bellman_ford(method=...) and the GUI
+BELLMAN_FORD_METHODS = ("scalar", "numpy")
 
 # Function to read a graph from a file
 def read_graph_from_file(file_name):
-    graph = nx.DiGraph()
-    with open(file_name, 'r') as file:
-        n_nodes = int(file.readline().strip())  # Number of nodes
-        n_edges = int(file.readline().strip())  # Number of edges
-        for _ in range(n_edges):
-            line = file.readline().strip()
-            if not line:  # Skip empty lines
-                continue
-            try:
-                u, v, w = line.split()
-                w = int(w)  # Convert weight to integer
-                graph.add_edge(u, v, weight=w)
-            except ValueError:
-                print(f"Skipping invalid line: {line}")
-                continue  # Skip invalid lines
-    return graph, n_nodes, n_edges
-
-
-# Bellman-Ford with visualization and saving graphs
-def bellman_ford_with_visualization(graph, source, destination, output_folder):
-    distances = {node: float('inf') for node in graph.nodes}
-    distances[source] = 0
-    predecessors = {node: None for node in graph.nodes}  # Track predecessors
-
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-
-    plt.figure(figsize=(10, 6))  # Adjust the figure size for better compactness
-    pos = nx.spring_layout(graph, seed=42, k=0.15)  # Reduce the k-value to pull nodes closer together
-
-    # Shift the nodes upward by adjusting their y-coordinates
-    for node in pos:
-        pos[node] = (pos[node][0], pos[node][1] + 0.1)  # Increase the y-coordinate by 0.1
-
-    nx.draw(graph, pos, with_labels=True, node_color='lavender', node_size=400, font_size=8, font_weight='bold', edge_color='black')
-    edge_labels = nx.get_edge_attributes(graph, 'weight')
-    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=8)
-    plt.title(f"Initial Graph (Source: {source})", fontsize=12)
-    plt.tight_layout(pad=1)  # Adjust padding to make sure everything fits
-    plt.savefig(os.path.join(output_folder, "graph_0.png"))
-    plt.close()
-
-    for i in range(len(graph.nodes) - 1):
+    # Chunked parse on first load, memory-mapped binary sidecar afterwards
+    return load_graph(file_name)
+
+
+# Bellman-Ford core: relaxes the flat CSR edge arrays, no drawing involved.
+# on_relax(pass_number, u, v, new_distance) is called with node ids for every
+# successful relaxation when given; stats receives the passes and relaxations made.
+# progress(passes), when given, is called after every pass and may raise to stop.
+def bellman_ford(graph, source, on_relax=None, stats=None, method="scalar", progress=None):
+    if method == "numpy":
+        return bellman_ford_numpy(graph, source, on_relax, stats, progress)
+
+    edge_sources, edge_targets, edge_weights = graph.edge_sources(), graph.targets, graph.weights
+    inf = float('inf')
+    dist = [inf] * graph.num_nodes
+    pred = [-1] * graph.num_nodes  # Track predecessors
+    dist[source] = 0
+    passes = 0
+    relaxations = 0
+    converged = False
+
+    for i in range(graph.num_nodes - 1):
+        passes += 1
         updated = False
-        for u, v, weight in graph.edges(data='weight'):
-            if distances[u] != float('inf') and distances[u] + weight < distances[v]:
-                distances[v] = distances[u] + weight
-                predecessors[v] = u
+        for u, v, weight in zip(edge_sources, edge_targets, edge_weights):
+            distance = dist[u]
+            if distance != inf and distance + weight < dist[v]:
+                dist[v] = distance + weight
+                pred[v] = u
                 updated = True
-
-                plt.figure(figsize=(10, 6))  # Adjust the figure size again for compactness
-                nx.draw(graph, pos, with_labels=True, node_color='lavender', node_size=400, font_size=8, font_weight='bold', edge_color='black')
-                nx.draw_networkx_edges(graph, pos, edgelist=[(u, v)], edge_color='green', width=2)
-                edge_labels = nx.get_edge_attributes(graph, 'weight')
-                nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=8)
-                annotation_text = f"Relaxed Edge ({u}, {v})\nNew Dist: {distances[v]}"
-                plt.annotate(annotation_text, xy=pos[v], xytext=(pos[v][0] + 0.03, pos[v][1] + 0.05),  # Adjusted offsets
-                             arrowprops=dict(arrowstyle="->", lw=1.5), fontsize=8, fontweight='bold', color='red')
-                plt.title(f"Iteration {i + 1}: Relaxed Edge ({u}, {v})", fontsize=12)
-                plt.tight_layout(pad=1)
-                plt.savefig(os.path.join(output_folder, f"graph_{i + 1}_{u}_{v}.png"))
-                plt.close()
+                relaxations += 1
+                if on_relax is not None:
+                    on_relax(i + 1, u, v, distance + weight)
 
         if not updated:
+            converged = True
+            break
+        if progress is not None:
+            progress(passes)
+
+    if not converged:
+        # All passes ran; without a negative cycle the distances are final anyway
+        converged = not any(dist[u] != inf and dist[u] + weight < dist[v]
+                            for u, v, weight in zip(edge_sources, edge_targets, edge_weights))
+    if converged:
+        pred = canonical_predecessors(graph, source, dist)
+
+    if stats is not None:
+        stats['passes'] = passes
+        stats['relaxations'] = relaxations
+    return dist, pred
+
+
+# Bellman-Ford keeps whichever predecessor relaxed a node last, so between
+# equally short paths the choice depends on the order edges are relaxed in.
+# Once the distances are final this rebuilds the tree the same way for every
+# variant: breadth-first over the edges that lie on shortest paths, a node's
+# predecessor is the lowest-id node on the level before it. Following fewest
+# edges first also keeps zero-weight cycles out of the tree. Returns pred as
+# a list of node ids, -1 for the source and unreachable nodes.
+def canonical_predecessors(graph, source, dist):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    pred = [-1] * graph.num_nodes
+    seen = bytearray(graph.num_nodes)
+    seen[source] = 1
+    level = [source]
+    while level:
+        next_level = []
+        for u in level:  # In id order, so the first node to reach v has the lowest id
+            distance = dist[u]
+            for edge in range(offsets[u], offsets[u + 1]):
+                v = targets[edge]
+                if not seen[v] and distance + weights[edge] == dist[v]:
+                    seen[v] = 1
+                    pred[v] = u
+                    next_level.append(v)
+        next_level.sort()
+        level = next_level
+    return pred
+
+
+# Batched Bellman-Ford over NumPy src/dst/w arrays. Each pass gathers dist[src] + w
+# for every edge at once and scatter-mins the candidates into dist[dst], stopping
+# early when a pass changes nothing. Distances equal the scalar version's, and so
+# do the predecessors: both rebuild them with the tie-break of
+# canonical_predecessors once the distances are final. Behind a negative cycle
+# they stay as relaxed, since find_negative_cycles reads the cycle off them.
+def bellman_ford_numpy(graph, source, on_relax=None, stats=None, progress=None):
+    if np is None:
+        raise ImportError("bellman_ford(method='numpy') requires NumPy")
+
+    src = np.asarray(graph.edge_sources(), dtype=np.int64)
+    dst = np.asarray(graph.targets, dtype=np.int64)
+    weight = np.asarray(graph.weights, dtype=np.float64)
+    dist = np.full(graph.num_nodes, np.inf)
+    pred = np.full(graph.num_nodes, -1, dtype=np.int64)
+    dist[source] = 0
+    passes = 0
+    relaxations = 0
+    converged = False
+
+    for i in range(graph.num_nodes - 1):
+        passes += 1
+        candidate = dist[src] + weight
+        improving = np.flatnonzero(candidate < dist[dst])
+        if improving.size == 0:
+            converged = True
             break
 
-    # Final visualization with shortest path
-    path = []
-    current_node = destination
-    while current_node is not None:
-        path.insert(0, current_node)
-        current_node = predecessors.get(current_node)
-
-    if distances[destination] != float('inf'):
-        shortest_path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-
-        plt.figure(figsize=(10, 6))
-        nx.draw(graph, pos, with_labels=True, node_color='lavender', node_size=400, font_size=8, font_weight='bold', edge_color='black')
-        nx.draw_networkx_edges(graph, pos, edgelist=shortest_path_edges, edge_color='purple', width=5)
-        edge_labels = nx.get_edge_attributes(graph, 'weight')
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=8)
-        for node, dist in distances.items():
-            if dist != float('inf'):
-                plt.annotate(f"Dist: {dist}", xy=pos[node], xytext=(pos[node][0] + 0.03, pos[node][1] + 0.05),  # Adjusted offsets
-                             fontsize=8, fontweight='bold', color='blue')
-        plt.title(f"Final Graph with Shortest Path from {source} to {destination}", fontsize=12)
-        plt.tight_layout(pad=1)
-        plt.savefig(os.path.join(output_folder, "graph_final_with_shortest_path.png"))
-        plt.close()
-
-    plt.figure(figsize=(10, 6))
-    nx.draw(graph, pos, with_labels=True, node_color='lavender', node_size=400, font_size=8, font_weight='bold', edge_color='black')
-    edge_labels = nx.get_edge_attributes(graph, 'weight')
-    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=8)
-    for node, dist in distances.items():
-        if dist != float('inf'):
-            plt.annotate(f"Dist: {dist}", xy=pos[node], xytext=(pos[node][0] + 0.03, pos[node][1] + 0.05),  # Adjusted offsets
-                         fontsize=8, fontweight='bold', color='blue')
-    plt.title("Final Graph with Shortest Path Distances", fontsize=12)
-    plt.tight_layout(pad=1)
-    plt.savefig(os.path.join(output_folder, "graph_final.png"))
-    plt.close()
-
-    if destination not in distances or distances[destination] == float('inf'):
-        return None, distances, None
-    return distances[destination], distances, path
-
-
-# Function to log execution details
-def log_execution_details(file_name, source_node, num_nodes, num_edges, execution_time, end_node=None, path=None):
-    log_file = "bellman.txt"
-    with open(log_file, "a") as file:
-        file.write(f"Graph File: {file_name}\n")
-        file.write(f"Source Node: {source_node}\n")
-        if end_node:
-            file.write(f"End Node: {end_node}\n")
-        file.write(f"Number of Nodes: {num_nodes}\n")
-        file.write(f"Number of Edges: {num_edges}\n")
-        file.write(f"Execution Time: {execution_time:.6f} seconds\n")
-        if path:
-            file.write(f"Path: {' -> '.join(path)}\n")
-        file.write("-" * 50 + "\n")
-
-# GUI Application
-def main_gui():
-    def select_file():
-        file_path = filedialog.askopenfilename(title="Select Graph File", filetypes=[("Text Files", "*.txt")])
-        if file_path:
-            file_label.config(text=f"Selected File: {os.path.basename(file_path)}")
-            file_label.file_path = file_path
-
-    def run_algorithm():
-        if not hasattr(file_label, 'file_path'):
-            messagebox.showerror("Error", "Please select a graph file first!")
-            return
-
-        source_node = source_entry.get()
-        destination_node = destination_entry.get()
-
-        if not source_node or not destination_node:
-            messagebox.showerror("Error", "Please enter both source and destination nodes!")
-            return
-
-        graph, num_nodes, num_edges = read_graph_from_file(file_label.file_path)
+        new_dist = dist.copy()
+        np.minimum.at(new_dist, dst[improving], candidate[improving])
+        winners = improving[candidate[improving] == new_dist[dst[improving]]]
+        nodes, first = np.unique(dst[winners], return_index=True)
+        pred[nodes] = src[winners[first]]
+        dist = new_dist
+        relaxations += nodes.size
+
+        if on_relax is not None:
+            for v in nodes.tolist():
+                on_relax(i + 1, int(pred[v]), v, int(dist[v]))
+        if progress is not None:
+            progress(passes)
+
+    if not converged:
+        converged = not np.any(dist[src] + weight < dist[dst])
+    if converged:
+        pred = _canonical_predecessors_numpy(graph, source, src, dst, weight, dist)
+
+    if stats is not None:
+        stats['passes'] = passes
+        stats['relaxations'] = relaxations
+    inf = float('inf')
+    return [int(d) if d != inf else inf for d in dist.tolist()], pred.tolist()
+
+
+# canonical_predecessors one level at a time over the edges on shortest paths.
+# Those edges stay grouped by source in id order, so among the edges from one
+# level the first to reach a node comes from its lowest-id predecessor.
+def _canonical_predecessors_numpy(graph, source, src, dst, weight, dist):
+    n = graph.num_nodes
+    tight = np.flatnonzero(np.isfinite(dist[src]) & (dist[src] + weight == dist[dst]))
+    tight_dst = dst[tight]
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src[tight], minlength=n), out=offsets[1:])
+
+    pred = np.full(n, -1, dtype=np.int64)
+    seen = np.zeros(n, dtype=bool)
+    seen[source] = True
+    level = np.array([source], dtype=np.int64)
+    while level.size:
+        counts = offsets[level + 1] - offsets[level]
+        edges = np.arange(counts.sum()) + np.repeat(offsets[level] - (np.cumsum(counts) - counts), counts)
+        parents = np.repeat(level, counts)
+        fresh = ~seen[tight_dst[edges]]
+        level, first = np.unique(tight_dst[edges[fresh]], return_index=True)
+        pred[level] = parents[fresh][first]
+        seen[level] = True
+    return pred
+
+
+# Queue-based Bellman-Ford (SPFA) with the small-label-first rule: only edges out
+# of nodes whose distance changed are relaxed again. A node relaxed num_nodes
+# times lies on or behind a negative cycle; the cycle is read off the
+# predecessor graph, and every node reachable from it gets distance -inf and is
+# left out of the rest of the search. Returns (dist, pred, cycles), where cycles
+# lists each negative cycle found as node ids in edge order. progress(pops), when
+# given, is called every PROGRESS_INTERVAL pops and may raise to stop.
+def spfa(graph, source, on_relax=None, stats=None, progress=None):
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = graph.num_nodes
+    inf = float('inf')
+    dist = [inf] * n
+    pred = [-1] * n
+    relax_count = [0] * n
+    in_queue = bytearray(n)
+    dead = bytearray(n)  # Distance is -inf because of a negative cycle
+    cycles = []
+    dist[source] = 0
+    queue = deque([source])
+    in_queue[source] = 1
+    pops = 0
+    relaxations = 0
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        if dead[u]:
+            continue
+        pops += 1
+        if progress is not None and not pops % PROGRESS_INTERVAL:
+            progress(pops)
+        distance = dist[u]
+
+        for edge in range(offsets[u], offsets[u + 1]):
+            v = targets[edge]
+            if dead[v] or distance + weights[edge] >= dist[v]:
+                continue
+            dist[v] = distance + weights[edge]
+            pred[v] = u
+            relaxations += 1
+            if on_relax is not None:
+                on_relax(relax_count[v] + 1, u, v, dist[v])
+
+            relax_count[v] += 1
+            if relax_count[v] >= n:
+                # With the queue reordered the count alone is only a hint, so
+                # confirm it by finding the cycle in the predecessor graph
+                relax_count[v] = 0
+                cycle = find_predecessor_cycle(pred, v)
+                if cycle:
+                    cycles.append(cycle)
+                    for node in reachable_from(graph, cycle):
+                        dead[node] = 1
+                        dist[node] = -inf
+                    if dead[u]:
+                        break
+                    continue
+
+            if not in_queue[v]:
+                in_queue[v] = 1
+                # Small label first: better candidates jump the queue
+                if queue and dist[v] < dist[queue[0]]:
+                    queue.appendleft(v)
+                else:
+                    queue.append(v)
+
+    if stats is not None:
+        stats['pops'] = pops
+        stats['relaxations'] = relaxations
+        stats['negative_cycles'] = len(cycles)
+    return dist, pred, cycles
+
+
+# Function to find the cycle behind node in the predecessor graph, if any.
+# Any cycle there has negative total weight.
+def find_predecessor_cycle(pred, node):
+    # Walking back len(pred) steps from a node behind a cycle lands inside it
+    for _ in range(len(pred)):
+        if pred[node] < 0:
+            break
+        node = pred[node]
+    else:
+        cycle = [node]
+        current = pred[node]
+        while current != node:
+            cycle.append(current)
+            current = pred[current]
+        cycle.reverse()
+        return cycle
+
+    # The walk reached the source: no cycle behind this node
+    return []
+
+
+# Function to check the result of bellman_ford for negative cycles. An edge that
+# still relaxes after num_nodes - 1 passes lies on or behind one, and so does
+# everything reachable from it. Returns (dist, cycles) like spfa: dist is a copy
+# with -inf behind the cycles, cycles holds one of them as node ids in edge
+# order (empty when there is none). Costs a single pass when there is none;
+# progress(passes), when given, is called after every pass and may raise to stop.
+def find_negative_cycles(graph, dist, pred, progress=None):
+    edge_sources, edge_targets, edge_weights = graph.edge_sources(), graph.targets, graph.weights
+    inf = float('inf')
+    relaxed_dist, relaxed_pred = list(dist), list(pred)
+    behind = []
+    cycle = []
+    for i in range(graph.num_nodes):
+        last = -1
+        for u, v, weight in zip(edge_sources, edge_targets, edge_weights):
+            distance = relaxed_dist[u]
+            if distance != inf and distance + weight < relaxed_dist[v]:
+                relaxed_dist[v] = distance + weight
+                relaxed_pred[v] = u
+                last = v
+                if i == 0:
+                    behind.append(v)
+        if last < 0:
+            break
+        if progress is not None:
+            progress(i + 1)
+        # Later passes only serve to close a cycle in the predecessor graph
+        cycle = find_predecessor_cycle(relaxed_pred, last)
+        if cycle:
+            break
 
-        if source_node not in graph.nodes:
-            messagebox.showerror("Error", f"Source node '{source_node}' is not in the graph!")
+    if not behind:
+        return list(dist), []
+    dist = list(dist)
+    for node in reachable_from(graph, behind):
+        dist[node] = -inf
+    return dist, [cycle] if cycle else []
+
+
+# Function to collect every node reachable from the given nodes
+def reachable_from(graph, nodes):
+    offsets, targets = graph.offsets, graph.targets
+    seen = set(nodes)
+    stack = list(nodes)
+    while stack:
+        u = stack.pop()
+        for edge in range(offsets[u], offsets[u + 1]):
+            v = targets[edge]
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+    return seen
+
+
+# Function to rebuild the path to target from the predecessor ids, as labels;
+# [] when the chain does not lead back to source (e.g. it loops round a negative cycle)
+def path_from_predecessors(graph, pred, source, target):
+    return graph.path_labels(predecessor_path(pred, source, target))
+
+
+# Records relaxation events for the visualization, keeping every
+# frame_every-th one and at most max_frames of them
+class RelaxationRecorder:
+    def __init__(self, frame_every=1, max_frames=None):
+        self.frame_every = max(1, frame_every)
+        self.max_frames = max_frames
+        self.seen = 0
+        self.events = []
+
+    def __call__(self, pass_number, u, v, distance):
+        self.seen += 1
+        if (self.seen - 1) % self.frame_every:
             return
-        if destination_node not in graph.nodes:
-            messagebox.showerror("Error", f"Destination node '{destination_node}' is not in the graph!")
+        if self.max_frames is not None and len(self.events) >= self.max_frames:
             return
+        self.events.append((pass_number, u, v, distance))
 
-        output_folder = "graph_outputs"
-
-        start_time = time.perf_counter()
-        shortest_distance, distances, path = bellman_ford_with_visualization(graph, source_node, destination_node, output_folder)
-        end_time = time.perf_counter()
-
-        if shortest_distance is not None:
-            messagebox.showinfo("Result", f"Shortest distance from {source_node} to {destination_node}: {shortest_distance}\nPath: {' -> '.join(path)}")
-        else:
-            messagebox.showinfo("Result", f"Destination node {destination_node} is unreachable from source node {source_node}.")
 
-        log_execution_details(file_label.file_path, source_node, num_nodes, num_edges, end_time - start_time, destination_node, path)
-        save_and_display_graphs(output_folder)
+# Solves source -> destination and returns (distance or None, {node: distance}, path or None).
+# The distance is -inf, with no path, behind a negative cycle.
+# Frames are only recorded and drawn when export_file (a .gif or video file) is given.
+def bellman_ford_with_visualization(graph, source, destination, export_file=None, frame_every=1, max_frames=None):
+    recorder = RelaxationRecorder(frame_every, max_frames) if export_file else None
+    source_id, destination_id = graph.node_id(source), graph.node_id(destination)
+    dist, pred = bellman_ford(graph, source_id, recorder)
+    dist, _ = find_negative_cycles(graph, dist, pred)
 
-    root = tk.Tk()
-    root.title("Bellman-Ford Algorithm with Visualization")
+    if export_file:
+        # Drawing needs matplotlib, networkx and OpenCV; plain solving does not
+        from bellman_ford_gui import RelaxationFrames, export_frames
+        export_frames(RelaxationFrames(graph, source, destination, dist, pred, recorder.events), export_file)
 
-    tk.Label(root, text="Bellman-Ford Algorithm", font=("Helvetica", 16, "bold")).pack(pady=10)
-    tk.Button(root, text="Select Graph File", command=select_file, font=("Helvetica", 12)).pack(pady=5)
-    file_label = tk.Label(root, text="No file selected", font=("Helvetica", 10))
-    file_label.pack(pady=5)
+    distances = {graph.label(n): d for n, d in enumerate(dist)}
+    if dist[destination_id] == float('inf'):
+        return None, distances, None
+    if dist[destination_id] == float('-inf'):
+        return dist[destination_id], distances, None
+    return dist[destination_id], distances, path_from_predecessors(graph, pred, source_id, destination_id)
 
-    tk.Label(root, text="Enter Source Node:", font=("Helvetica", 12)).pack(pady=5)
-    source_entry = tk.Entry(root, font=("Helvetica", 12))
-    source_entry.pack(pady=5)
 
-    tk.Label(root, text="Enter Destination Node:", font=("Helvetica", 12)).pack(pady=5)
-    destination_entry = tk.Entry(root, font=("Helvetica", 12))
-    destination_entry.pack(pady=5)
+# Function to log execution details
+# Records one structured entry in the shared telemetry file; execution_time is the
+# solve time in ms, metrics holds load_ms and the solver counters
+def log_execution_details(file_name, source_node, num_nodes, num_edges, execution_time, end_node=None, path=None, **metrics):
+    telemetry.record("bellman_ford", graph_file=file_name, source=source_node, target=end_node,
+                     num_nodes=num_nodes, num_edges=num_edges, solve_ms=execution_time,
+                     path=" -> ".join(path) if path else None, **metrics)
+
+# The GUI and the animation live in bellman_ford_gui.py so that solving never
+# loads Tk, matplotlib, networkx or OpenCV; these names keep resolving from
+# here, imported on first use
+def __getattr__(name):
+    if name in ("main_gui", "RelaxationFrames", "show_frames", "export_frames", "to_networkx", "EXPORT_FPS"):
+        import bellman_ford_gui
+        return getattr(bellman_ford_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Headless timing of every Bellman-Ford variant from one source
+def compare_methods(graph, source, repeats=3):
+    source_id = graph.node_id(source)
+    solvers = {"scalar": lambda: bellman_ford(graph, source_id)}
+    if np is not None:
+        solvers["numpy"] = lambda: bellman_ford(graph, source_id, method="numpy")
+    solvers["spfa"] = lambda: spfa(graph, source_id)[:2]
+
+    results = {}
+    reference = None
+    for name, solve in solvers.items():
+        times = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            dist, _ = solve()
+            times.append(time.perf_counter() - start_time)
+        if reference is None:
+            reference = dist
+        results[name] = {"best_time": min(times), "same_distances": dist == reference}
+    return results
 
-    tk.Button(root, text="Run Algorithm", command=run_algorithm, font=("Helvetica", 12), bg="lightgreen").pack(pady=10)
-    root.mainloop()
 
 if __name__ == "__main__":
-    main_gui()
+    import sys
+    if len(sys.argv) == 4 and sys.argv[1] == "--compare":
+        graph, _, _ = read_graph_from_file(sys.argv[2])
+        for name, result in compare_methods(graph, sys.argv[3]).items():
+            print(f"{name:>6}: {result['best_time']:.6f} seconds, same distances: {result['same_distances']}")
+    else:
+        from bellman_ford_gui import main_gui
+        main_gui()
@@ -0,0 +1,421 @@
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import cv2
+import networkx as nx
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from background import BackgroundTask, Cancelled
+from bellmanFord import (RelaxationRecorder, bellman_ford, find_negative_cycles, log_execution_details,
+                         path_from_predecessors, read_graph_from_file, spfa)
+from telemetry import telemetry
+
+# Playback speed of exported animations, in frames per second
+EXPORT_FPS = 2
+
+# Function to step through the frames; each one is drawn only when shown. Given
+# the app's root it opens a window next to it and returns at once; without one
+# it runs its own main loop until the window is closed.
+def show_frames(frames, root=None):
+    if root is not None:
+        return FrameViewer(root, frames)
+    root = tk.Tk()
+    root.withdraw()
+    FrameViewer(root, frames, on_close=root.destroy)
+    root.mainloop()
+
+
+# Window stepping through an animation: Right, Space or Enter shows the next
+# frame, Left, B or Backspace the previous one, and Escape closes it. Frames are
+# drawn on a worker thread and handed back through the Tk main loop, so the
+# other windows keep responding; keys pressed meanwhile skip to the latest frame.
+class FrameViewer:
+    def __init__(self, root, frames, on_close=None):
+        self.root = root
+        self.frames = frames
+        self.on_close = on_close
+        self.index = 0
+        self.task = None
+        self.closed = False
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Graph Visualization")
+        self.image_label = tk.Label(self.window)
+        self.image_label.pack()
+        self.status_label = tk.Label(self.window, text="Drawing...", font=("Helvetica", 10))
+        self.status_label.pack(pady=5)
+        for key in ("<Right>", "<space>", "<Return>"):
+            self.window.bind(key, lambda event: self.step(1))
+        for key in ("<Left>", "<b>", "<BackSpace>"):
+            self.window.bind(key, lambda event: self.step(-1))
+        self.window.bind("<Escape>", lambda event: self.close())
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.window.focus_set()
+        self.show(0)
+
+    def step(self, offset):
+        index = self.index + offset
+        if index >= len(self.frames):
+            self.close()  # Stepping past the last frame ends the playback
+        elif index >= 0:
+            self.show(index)
+
+    def show(self, index):
+        self.index = index
+        if self.task is None:
+            # The task polls through the main root, which outlives this window
+            self.task = BackgroundTask(self.root, lambda task: self.frames[index],
+                                       lambda frame: self.drawn(index, frame), self.failed)
+
+    def drawn(self, index, frame):
+        self.task = None
+        if self.closed:
+            return
+        if index != self.index:
+            self.show(self.index)
+            return
+        from PIL import Image, ImageTk  # Installed with matplotlib
+        image = ImageTk.PhotoImage(Image.fromarray(frame), master=self.window)
+        self.image_label.config(image=image)
+        self.image_label.image = image  # Tk does not keep a reference of its own
+        self.status_label.config(text=f"Frame {index + 1} of {len(self.frames)}: "
+                                      "Right/Space next, Left/B back, Esc close")
+
+    def failed(self, error):
+        self.task = None
+        if not self.closed:
+            self.status_label.config(text=f"Cannot draw frame {self.index + 1}: {error}")
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.window.destroy()
+        if self.on_close is not None:
+            self.on_close()
+
+
+# Function to write the frames to one animation file: a GIF for .gif, otherwise
+# a video through OpenCV (MP4 for .mp4, Motion JPEG for anything else)
+def export_frames(frames, file_path, fps=EXPORT_FPS, progress=None):
+    def rendered():
+        for index in range(len(frames)):
+            if progress is not None:
+                progress(f"Exporting frame {index + 1} of {len(frames)}...")
+            yield frames[index]
+
+    if file_path.lower().endswith(".gif"):
+        from PIL import Image  # Installed with matplotlib
+        images = (Image.fromarray(frame) for frame in rendered())
+        first = next(images)
+        first.save(file_path, save_all=True, append_images=images, duration=int(1000 / fps), loop=0)
+        return
+
+    height, width = frames.size
+    codec = "mp4v" if file_path.lower().endswith(".mp4") else "MJPG"
+    writer = cv2.VideoWriter(file_path, cv2.VideoWriter_fourcc(*codec), fps, (width, height))
+    if not writer.isOpened():
+        raise ValueError(f"Cannot write video file '{file_path}'")
+    try:
+        for frame in rendered():
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+    finally:
+        writer.release()
+
+# Function to build a NetworkX graph for drawing
+def to_networkx(graph):
+    nx_graph = nx.DiGraph()
+    nx_graph.add_nodes_from(graph.labels)
+    labels = graph.labels
+    nx_graph.add_weighted_edges_from((labels[u], labels[v], w) for u, v, w in graph.edges())
+    return nx_graph
+
+
+# The animation of one run as a lazy sequence of RGB images (numpy arrays).
+# The graph itself is drawn once; each frame restores that background and draws
+# only its overlay (the relaxed edge, the final path or the distances), so memory
+# does not grow with the number of relaxations. Uses a standalone Figure rather
+# than pyplot, so it can be built on a worker thread; a lock lets the viewer and
+# an export draw frames from different threads.
+class RelaxationFrames:
+    def __init__(self, csr, source, destination, dist, pred, events):
+        self.graph = to_networkx(csr)
+        self.labels = csr.labels
+        self.source = source
+        self.destination = destination
+        self.events = events
+
+        pos = nx.spring_layout(self.graph, seed=42, k=0.15)  # Reduce the k-value to pull nodes closer together
+
+        # Shift the nodes upward by adjusting their y-coordinates
+        for node in pos:
+            pos[node] = (pos[node][0], pos[node][1] + 0.1)  # Increase the y-coordinate by 0.1
+        self.pos = pos
+
+        self.distances = {self.labels[n]: d for n, d in enumerate(dist) if d != float('inf')}
+        self.path_edges = None
+        destination_id = csr.node_id(destination)
+        # -inf distances sit behind a negative cycle and have no simple path
+        if abs(dist[destination_id]) != float('inf'):
+            path = path_from_predecessors(csr, pred, csr.node_id(source), destination_id)
+            self.path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
+
+        self.figure = Figure(figsize=(10, 6))  # Adjust the figure size for better compactness
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        nx.draw(self.graph, pos, ax=self.ax, with_labels=True, node_color='lavender', node_size=400, font_size=8, font_weight='bold', edge_color='black')
+        edge_labels = nx.get_edge_attributes(self.graph, 'weight')
+        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels, font_size=8, ax=self.ax)
+        self.title = self.ax.set_title(" ", fontsize=12)
+        self.title.set_animated(True)  # Drawn per frame, not part of the background
+        self.figure.tight_layout(pad=1)  # Adjust padding to make sure everything fits
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.lock = threading.Lock()  # Every frame is drawn on the one shared canvas
+
+    @property
+    def size(self):
+        # (height, width) of every frame in pixels
+        width, height = self.canvas.get_width_height()
+        return height, width
+
+    def __len__(self):
+        # Initial graph, one frame per relaxation, then the final path (when
+        # there is one) and the final distances
+        return 1 + len(self.events) + (self.path_edges is not None) + 1
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        with self.lock:
+            return self.draw_frame(index)
+
+    def draw_frame(self, index):
+        self.canvas.restore_region(self.background)
+        overlay = []
+        if index == 0:
+            self.title.set_text(f"Initial Graph (Source: {self.source})")
+        elif index <= len(self.events):
+            pass_number, u_id, v_id, new_distance = self.events[index - 1]
+            u, v = self.labels[u_id], self.labels[v_id]
+            overlay += self.draw_edges([(u, v)], 'green', 2)
+            annotation_text = f"Relaxed Edge ({u}, {v})\nNew Dist: {new_distance}"
+            overlay.append(self.ax.annotate(annotation_text, xy=self.pos[v], xytext=(self.pos[v][0] + 0.03, self.pos[v][1] + 0.05),  # Adjusted offsets
+                                            arrowprops=dict(arrowstyle="->", lw=1.5), fontsize=8, fontweight='bold', color='red'))
+            self.title.set_text(f"Iteration {pass_number}: Relaxed Edge ({u}, {v})")
+        else:
+            if self.path_edges is not None and index == len(self.events) + 1:
+                overlay += self.draw_edges(self.path_edges, 'purple', 5)
+                self.title.set_text(f"Final Graph with Shortest Path from {self.source} to {self.destination}")
+            else:
+                self.title.set_text("Final Graph with Shortest Path Distances")
+            for node, distance in self.distances.items():
+                overlay.append(self.ax.annotate(f"Dist: {distance}", xy=self.pos[node], xytext=(self.pos[node][0] + 0.03, self.pos[node][1] + 0.05),  # Adjusted offsets
+                                                fontsize=8, fontweight='bold', color='blue'))
+
+        for artist in overlay + [self.title]:
+            artist.set_animated(True)
+            self.ax.draw_artist(artist)
+        for artist in overlay:
+            artist.remove()
+        return np.array(self.canvas.buffer_rgba())[:, :, :3]
+
+    def draw_edges(self, edges, color, width):
+        artists = nx.draw_networkx_edges(self.graph, self.pos, edgelist=edges, edge_color=color, width=width, ax=self.ax)
+        return artists if isinstance(artists, list) else [artists]
+
+
+# GUI Application
+def main_gui():
+    def select_file():
+        file_path = filedialog.askopenfilename(title="Select Graph File", filetypes=[("Text Files", "*.txt")])
+        if file_path:
+            file_label.config(text=f"Selected File: {os.path.basename(file_path)}")
+            file_label.file_path = file_path
+
+    def run_algorithm():
+        if current_task is not None:
+            return
+        if not hasattr(file_label, 'file_path'):
+            messagebox.showerror("Error", "Please select a graph file first!")
+            return
+
+        source_node = source_entry.get()
+        destination_node = destination_entry.get()
+
+        if not source_node or not destination_node:
+            messagebox.showerror("Error", "Please enter both source and destination nodes!")
+            return
+
+        frame_every = None
+        if visualize_var.get():
+            try:
+                frame_every = int(frame_every_entry.get() or 1)
+            except ValueError:
+                messagebox.showerror("Error", "Frame interval must be a whole number!")
+                return
+
+        file_path = file_label.file_path
+        algorithm = algorithm_var.get()
+
+        # Runs on the worker thread: load, solve and draw, but never touch Tk
+        def work(task):
+            task.report("Loading graph...")
+            load_start = time.perf_counter()
+            graph, num_nodes, num_edges = read_graph_from_file(file_path)
+            load_time = (time.perf_counter() - load_start) * 1000
+
+            if source_node not in graph:
+                raise ValueError(f"Source node '{source_node}' is not in the graph!")
+            if destination_node not in graph:
+                raise ValueError(f"Destination node '{destination_node}' is not in the graph!")
+            source_id, destination_id = graph.node_id(source_node), graph.node_id(destination_node)
+
+            # Only the algorithm is timed; frames are recorded through a cheap callback
+            # and drawn afterwards, and only when visualization is switched on
+            recorder = RelaxationRecorder(frame_every) if frame_every is not None else None
+            unit = "nodes processed" if algorithm == "SPFA" else "passes completed"
+            progress = lambda count: task.report(f"{algorithm}: {count} {unit}...")
+            cycles = []
+            stats = telemetry.stats()
+            task.report(f"Running {algorithm}...")
+            start_time = time.perf_counter()
+            if algorithm == "SPFA":
+                dist, pred, cycles = spfa(graph, source_id, recorder, stats, progress)
+            elif algorithm == "Bellman-Ford (NumPy)":
+                dist, pred = bellman_ford(graph, source_id, recorder, stats, method="numpy", progress=progress)
+            else:
+                dist, pred = bellman_ford(graph, source_id, recorder, stats, progress=progress)
+            if algorithm != "SPFA":
+                # Plain Bellman-Ford leaves finite but wrong distances behind a
+                # negative cycle; one more pass finds them and marks them -inf
+                task.report("Checking for negative cycles...")
+                dist, cycles = find_negative_cycles(graph, dist, pred,
+                                                    lambda passes: task.report(f"Negative cycle check: {passes} passes..."))
+            end_time = time.perf_counter()
+
+            path = None
+            if abs(dist[destination_id]) != float('inf'):
+                path = path_from_predecessors(graph, pred, source_id, destination_id)
+            frames = None
+            if recorder is not None:
+                task.report("Drawing the graph...")
+                frames = RelaxationFrames(graph, source_node, destination_node, dist, pred, recorder.events)
+            return {
+                "num_nodes": num_nodes, "num_edges": num_edges, "load_ms": load_time,
+                "solve_ms": (end_time - start_time) * 1000, "stats": stats,
+                "distance": dist[destination_id], "path": path,
+                "cycles": [graph.path_labels(cycle + cycle[:1]) for cycle in cycles],
+                "frames": frames,
+            }
+
+        def done(result):
+            nonlocal last_frames
+            last_frames = result["frames"]
+            finish(f"Finished in {result['solve_ms']:.3f} ms.")
+            distance, path = result["distance"], result["path"]
+            if distance == float('-inf'):
+                cycle_text = "\n".join(" -> ".join(cycle) for cycle in result["cycles"])
+                messagebox.showinfo("Result", f"Distance from {source_node} to {destination_node} is -infinity.\nNegative cycle(s):\n{cycle_text}")
+            elif distance != float('inf'):
+                messagebox.showinfo("Result", f"Shortest distance from {source_node} to {destination_node}: {distance}\nPath: {' -> '.join(path)}")
+            else:
+                messagebox.showinfo("Result", f"Destination node {destination_node} is unreachable from source node {source_node}.")
+
+            log_execution_details(file_path, source_node, result["num_nodes"], result["num_edges"], result["solve_ms"],
+                                  destination_node, path, algorithm=algorithm, load_ms=result["load_ms"],
+                                  distance=distance, **(result["stats"] or {}))
+            if last_frames is not None:
+                show_frames(last_frames, root)
+
+        start_task(work, done, "Run")
+
+    def export_animation():
+        if current_task is not None or last_frames is None:
+            return
+        export_file = filedialog.asksaveasfilename(title="Export Animation", defaultextension=".gif",
+                                                   filetypes=[("GIF", "*.gif"), ("MP4 Video", "*.mp4"), ("AVI Video", "*.avi")])
+        if not export_file:
+            return
+        frames = last_frames
+
+        def work(task):
+            export_frames(frames, export_file, progress=task.report)
+
+        start_task(work, lambda result: finish(f"Exported {len(frames)} frames to {os.path.basename(export_file)}."), "Export")
+
+    # Runs work(task) on a worker thread with the buttons disabled
+    def start_task(work, on_done, name):
+        nonlocal current_task
+
+        def failed(error):
+            if isinstance(error, Cancelled):
+                finish(f"{name} cancelled.")
+            else:
+                finish(f"{name} failed.")
+                messagebox.showerror("Error", str(error))
+
+        run_button.config(state=tk.DISABLED)
+        export_button.config(state=tk.DISABLED)
+        cancel_button.config(state=tk.NORMAL)
+        current_task = BackgroundTask(root, work, on_done, failed, lambda message: status_label.config(text=message))
+
+    def finish(message):
+        nonlocal current_task
+        current_task = None
+        run_button.config(state=tk.NORMAL)
+        if last_frames is not None:
+            export_button.config(state=tk.NORMAL)
+        cancel_button.config(state=tk.DISABLED)
+        status_label.config(text=message)
+
+    def cancel_run():
+        if current_task is not None:
+            current_task.cancel()
+            status_label.config(text="Cancelling...")
+
+    current_task = None
+    last_frames = None  # Animation of the latest run, kept for exporting
+    root = tk.Tk()
+    root.title("Bellman-Ford Algorithm with Visualization")
+
+    tk.Label(root, text="Bellman-Ford Algorithm", font=("Helvetica", 16, "bold")).pack(pady=10)
+    tk.Button(root, text="Select Graph File", command=select_file, font=("Helvetica", 12)).pack(pady=5)
+    file_label = tk.Label(root, text="No file selected", font=("Helvetica", 10))
+    file_label.pack(pady=5)
+
+    tk.Label(root, text="Enter Source Node:", font=("Helvetica", 12)).pack(pady=5)
+    source_entry = tk.Entry(root, font=("Helvetica", 12))
+    source_entry.pack(pady=5)
+
+    tk.Label(root, text="Enter Destination Node:", font=("Helvetica", 12)).pack(pady=5)
+    destination_entry = tk.Entry(root, font=("Helvetica", 12))
+    destination_entry.pack(pady=5)
+
+    tk.Label(root, text="Algorithm:", font=("Helvetica", 12)).pack(pady=5)
+    algorithm_var = tk.StringVar(value="Bellman-Ford")
+    tk.OptionMenu(root, algorithm_var, "Bellman-Ford", "Bellman-Ford (NumPy)", "SPFA").pack(pady=5)
+
+    visualize_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(root, text="Visualize relaxations", variable=visualize_var, font=("Helvetica", 12)).pack(pady=5)
+    tk.Label(root, text="Draw every Nth relaxation:", font=("Helvetica", 12)).pack(pady=5)
+    frame_every_entry = tk.Entry(root, font=("Helvetica", 12))
+    frame_every_entry.insert(0, "1")
+    frame_every_entry.pack(pady=5)
+
+    run_button = tk.Button(root, text="Run Algorithm", command=run_algorithm, font=("Helvetica", 12), bg="lightgreen")
+    run_button.pack(pady=10)
+    export_button = tk.Button(root, text="Export Animation", command=export_animation, font=("Helvetica", 12), state=tk.DISABLED)
+    export_button.pack(pady=5)
+    cancel_button = tk.Button(root, text="Cancel", command=cancel_run, font=("Helvetica", 12), state=tk.DISABLED)
+    cancel_button.pack(pady=5)
+    status_label = tk.Label(root, text="", font=("Helvetica", 10))
+    status_label.pack(pady=5)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main_gui()
@@ -0,0 +1,370 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+from astar import astar_csr, get_landmarks
+from bellmanFord import bellman_ford, np, spfa
+from csr_graph import CSRGraph, INDEX_TYPE
+from delta_stepping import delta_stepping
+from dijkstra import bidirectional_dijkstra_csr, dijkstra_csr, dijkstra_targets
+from k_shortest import yen_k_shortest_paths
+
+# Default output read back by compare.py
+RESULTS_FILE = "benchmark_results.json"
+
+# Targets per one-to-many query: the query's target plus random others
+MANY_TARGETS = 16
+
+
+# ----- graph families -----
+# Each generator builds a graph with roughly num_edges edges. Labels are
+# zero-padded numbers so their sorted order matches the node numbering.
+
+def _build(num_nodes, src, dst, weights):
+    width = len(str(max(num_nodes - 1, 0)))
+    labels = [str(i).zfill(width) for i in range(num_nodes)]
+    return CSRGraph.from_id_edges(labels, array(INDEX_TYPE, src), array(INDEX_TYPE, dst), array(INDEX_TYPE, weights))
+
+
+def random_sparse(num_edges, rng):
+    # Uniform random edges, average out-degree 4
+    n = max(2, num_edges // 4)
+    src = [rng.randrange(n) for _ in range(num_edges)]
+    dst = [rng.randrange(n) for _ in range(num_edges)]
+    return _build(n, src, dst, [rng.randint(1, 100) for _ in range(num_edges)])
+
+
+def random_dense(num_edges, rng):
+    # Uniform random edges, average out-degree about sqrt(num_edges)
+    n = max(2, int(num_edges ** 0.5))
+    src = [rng.randrange(n) for _ in range(num_edges)]
+    dst = [rng.randrange(n) for _ in range(num_edges)]
+    return _build(n, src, dst, [rng.randint(1, 100) for _ in range(num_edges)])
+
+
+def grid(num_edges, rng):
+    # Square road-like grid, edges both ways between 4-neighbours
+    side = max(2, int((num_edges / 4) ** 0.5))
+    src, dst = [], []
+    for row in range(side):
+        for col in range(side):
+            node = row * side + col
+            for d_row, d_col in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+                r, c = row + d_row, col + d_col
+                if 0 <= r < side and 0 <= c < side:
+                    src.append(node)
+                    dst.append(r * side + c)
+    return _build(side * side, src, dst, [rng.randint(1, 100) for _ in src])
+
+
+def scale_free(num_edges, rng, links=3):
+    # Preferential attachment: each new node links to `links` nodes picked in
+    # proportion to their degree, with edges both ways
+    n = max(links + 1, num_edges // (2 * links))
+    src, dst = [], []
+    endpoints = list(range(links))
+    for node in range(links, n):
+        chosen = {rng.choice(endpoints) for _ in range(links)}
+        for other in chosen:
+            src += [node, other]
+            dst += [other, node]
+            endpoints += [node, other]
+    return _build(n, src, dst, [rng.randint(1, 100) for _ in src])
+
+
+def negative_dag(num_edges, rng):
+    # Edges only go from lower to higher numbers, so negative weights form no cycles
+    n = max(2, num_edges // 4)
+    src, dst = [], []
+    for _ in range(num_edges):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u == v:
+            continue
+        src.append(min(u, v))
+        dst.append(max(u, v))
+    return _build(n, src, dst, [rng.randint(-20, 80) for _ in src])
+
+
+FAMILIES = {
+    "random_sparse": random_sparse,
+    "random_dense": random_dense,
+    "grid": grid,
+    "scale_free": scale_free,
+    "negative_dag": negative_dag,
+}
+
+
+# ----- solvers -----
+# Each solver runs one query and returns the counters it collected. Only
+# "negative" solvers handle negative weights; max_edges keeps the slow ones
+# off the largest graphs unless --no-limits is given; "numpy" ones are skipped
+# when NumPy is missing.
+
+class Solver:
+    def __init__(self, name, run, negative=False, max_edges=None, numpy=False):
+        self.name = name
+        self.run = run
+        self.negative = negative
+        self.max_edges = max_edges
+        self.numpy = numpy
+
+
+def _dijkstra(queue):
+    def run(graph, source, target):
+        stats = {}
+        dijkstra_csr(graph, source, stats=stats, queue=queue)
+        return stats
+    return run
+
+
+def _dijkstra_early(graph, source, target):
+    stats = {}
+    dijkstra_csr(graph, source, target, stats=stats)
+    return stats
+
+
+def _bidirectional(graph, source, target):
+    stats = {}
+    bidirectional_dijkstra_csr(graph, source, target, stats=stats)
+    return stats
+
+
+def _astar_alt(graph, source, target):
+    stats = {}
+    astar_csr(graph, source, target, get_landmarks(graph).heuristic(target), stats)
+    return {'settled': stats['expanded']}
+
+
+def _bellman_ford(method):
+    def run(graph, source, target):
+        stats = {}
+        dist, _ = bellman_ford(graph, source, stats=stats, method=method)
+        stats['settled'] = sum(1 for d in dist if d != float('inf'))
+        return stats
+    return run
+
+
+def _delta_stepping(workers):
+    def run(graph, source, target):
+        stats = {}
+        delta_stepping(graph, source, stats=stats, workers=workers)
+        return stats
+    return run
+
+
+def delta_stepping_solvers(worker_counts):
+    # One delta-stepping entry per thread count, to show how it scales with cores
+    return [Solver(f"delta_stepping_x{workers}", _delta_stepping(workers), numpy=True) for workers in worker_counts]
+
+
+def _k_shortest(k):
+    def run(graph, source, target):
+        stats = {}
+        yen_k_shortest_paths(graph, source, target, k, stats)
+        return stats
+    return run
+
+
+def k_shortest_solvers(k_values):
+    # One k-shortest-paths entry per k, to show how the cost grows with k
+    return [Solver(f"k_shortest_k{k}", _k_shortest(k), max_edges=10 ** 6) for k in k_values]
+
+
+def many_targets(graph, source, target):
+    # The same MANY_TARGETS targets on every run of a query
+    rng = random.Random(source)
+    return [target] + [rng.randrange(graph.num_nodes) for _ in range(MANY_TARGETS - 1)]
+
+
+def _dijkstra_targets(nearest):
+    def run(graph, source, target):
+        stats = {}
+        dijkstra_targets(graph, source, many_targets(graph, source, target), nearest, stats)
+        return stats
+    return run
+
+
+def _spfa(graph, source, target):
+    stats = {}
+    dist, _, _ = spfa(graph, source, stats=stats)
+    stats['settled'] = sum(1 for d in dist if d != float('inf'))
+    return stats
+
+
+SOLVERS = [
+    Solver("dijkstra", _dijkstra("binary")),
+    Solver("dijkstra_dary", _dijkstra("dary")),
+    Solver("dijkstra_bucket", _dijkstra("bucket")),
+    Solver("dijkstra_early", _dijkstra_early),
+    Solver("bidirectional", _bidirectional),
+    Solver("astar_alt", _astar_alt),
+    Solver("delta_stepping", _delta_stepping(1), numpy=True),
+    Solver("dijkstra_targets", _dijkstra_targets(None)),
+    Solver("dijkstra_nearest_4", _dijkstra_targets(4)),
+    Solver("k_shortest_k8", _k_shortest(8), max_edges=10 ** 6),
+    Solver("bellman_ford", _bellman_ford("scalar"), negative=True, max_edges=10 ** 5),
+    Solver("bellman_ford_numpy", _bellman_ford("numpy"), negative=True, max_edges=10 ** 6, numpy=True),
+    Solver("spfa", _spfa, negative=True, max_edges=10 ** 6),
+]
+
+
+def prepare(solver, graph):
+    # One-off preprocessing that a query would reuse, kept out of the timings
+    if solver.name == "astar_alt":
+        get_landmarks(graph)
+    elif solver.name == "bidirectional" or solver.name.startswith("k_shortest"):
+        graph.reverse()
+    elif solver.name == "dijkstra_bucket" or solver.name.startswith("delta_stepping"):
+        graph.max_weight
+    graph.edge_sources()
+
+
+def pick_query(graph, rng):
+    """
+    Picks a source and a target reachable from it, about halfway down the
+    list of reachable nodes sorted by hop count.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    source = rng.randrange(graph.num_nodes)
+    # Negative DAGs only reach forward, so start them near the front
+    if graph.min_weight < 0:
+        source = rng.randrange(max(1, graph.num_nodes // 10))
+    seen = {source}
+    order = [source]
+    for u in order:
+        for edge in range(offsets[u], offsets[u + 1]):
+            v = targets[edge]
+            if v not in seen:
+                seen.add(v)
+                order.append(v)
+    return source, order[len(order) // 2]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(solver, graph, source, target, warmup, trials):
+    """
+    Times one solver on one query.
+
+    Returns:
+        dict: Median and p95 wall time in ms, peak traced memory in bytes
+        (from one extra run, so tracing does not slow the timed ones), nodes
+        settled and the solver's other counters.
+    """
+    for _ in range(warmup):
+        solver.run(graph, source, target)
+
+    times = []
+    for _ in range(trials):
+        start_time = time.perf_counter()
+        stats = solver.run(graph, source, target)
+        times.append((time.perf_counter() - start_time) * 1000)
+
+    tracemalloc.start()
+    solver.run(graph, source, target)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": statistics.median(times),
+        "p95_ms": percentile(times, 0.95),
+        "peak_memory_bytes": peak_memory,
+        "nodes_settled": stats.pop('settled', None),
+        "counters": stats,
+    }
+
+
+def run_benchmarks(families, sizes, solvers, warmup=1, trials=5, seed=42, limits=True):
+    """
+    Runs every solver on every family at every size.
+
+    Returns:
+        list: One result dict per (family, size, solver).
+    """
+    results = []
+    for family in families:
+        for size in sizes:
+            rng = random.Random(seed)
+            graph = FAMILIES[family](size, rng)
+            source, target = pick_query(graph, rng)
+            for solver in solvers:
+                if graph.min_weight < 0 and not solver.negative:
+                    continue
+                if limits and solver.max_edges is not None and graph.num_edges > solver.max_edges:
+                    continue
+                if solver.numpy and np is None:
+                    continue
+                prepare(solver, graph)
+                record = {
+                    "family": family,
+                    "num_nodes": graph.num_nodes,
+                    "num_edges": graph.num_edges,
+                    "solver": solver.name,
+                    "source": graph.label(source),
+                    "target": graph.label(target),
+                    "warmup": warmup,
+                    "trials": trials,
+                }
+                record.update(measure(solver, graph, source, target, warmup, trials))
+                results.append(record)
+                counters = record["counters"]
+                print(f"{family:>14} {graph.num_edges:>10} edges  {solver.name:<20} "
+                      f"median {record['median_ms']:10.3f} ms  p95 {record['p95_ms']:10.3f} ms  "
+                      f"settled {record['nodes_settled']}  pops {counters.get('heap_pops', '-')}  "
+                      f"peak queue {counters.get('peak_heap_size', '-')}")
+    return results
+
+
+def save_results(results, file_path=RESULTS_FILE):
+    data = {
+        "metadata": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "time_unit": "ms",
+            "memory_unit": "bytes",
+        },
+        "results": results,
+    }
+    with open(file_path, 'w') as file:
+        json.dump(data, file, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless shortest-path solver benchmarks.")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), default=list(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5],
+                        help="approximate edge counts (up to 10**7)")
+    parser.add_argument("--solvers", nargs="+", choices=[s.name for s in SOLVERS], default=[s.name for s in SOLVERS])
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--delta-workers", nargs="+", type=int, default=[],
+                        help="also run delta-stepping with each of these thread counts")
+    parser.add_argument("--k-paths", nargs="+", type=int, default=[],
+                        help="also run k shortest paths with each of these k")
+    parser.add_argument("--no-limits", action="store_true", help="run slow solvers on every size")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    args = parser.parse_args(argv)
+
+    solvers = [s for s in SOLVERS if s.name in args.solvers] + delta_stepping_solvers(args.delta_workers)
+    solvers += k_shortest_solvers(args.k_paths)
+    results = run_benchmarks(args.families, args.sizes, solvers, args.warmup, args.trials,
+                             args.seed, not args.no_limits)
+    save_results(results, args.output)
+    print(f"Saved {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,106 +1,92 @@
-import matplotlib.pyplot as plt
+import json
 import os
+import sys
+import matplotlib.pyplot as plt
+from benchmark import RESULTS_FILE
 
-def parse_file(file_path):
+def load_results(file_path):
     """
-    Parses a file containing multiple records separated by dotted lines.
-    Extracts the number of nodes, edges, and execution time for each graph.
+    Loads the machine-readable results written by benchmark.py.
 
     Args:
-        file_path (str): Path to the file.
+        file_path (str): Path to the results file.
 
     Returns:
-        list: A list of dictionaries containing data for each graph.
+        list: One dictionary per (graph family, size, solver) measurement,
+        with times in milliseconds.
     """
-    results = []
     with open(file_path, 'r') as file:
-        graph_data = {}
-        for line in file:
-            line = line.strip()
-            if line.startswith("Number of Nodes:"):
-                graph_data['num_nodes'] = int(line.split(":")[1].strip())
-            elif line.startswith("Number of Edges:"):
-                graph_data['num_edges'] = int(line.split(":")[1].strip())
-            elif line.startswith("Execution Time:"):
-                graph_data['execution_time'] = float(line.split(":")[1].strip().split()[0])
-            elif line.startswith("----"):  # Delimiter indicates end of one record
-                if graph_data:  # Save completed graph data
-                    results.append(graph_data)
-                    graph_data = {}  # Reset for the next record
-        if graph_data:  # Append the last record if no trailing delimiter
-            results.append(graph_data)
-    return results
+        data = json.load(file)
+    if data.get("metadata", {}).get("time_unit", "ms") != "ms":
+        raise ValueError("Expected benchmark times in milliseconds.")
+    return data["results"]
 
-def plot_comparative_graphs(data1, data2, labels):
+def group_results(results, key):
     """
-    Plots comparative graphs for execution time vs. number of nodes and edges for two datasets.
+    Groups results by one field, keeping the order they first appear in.
 
     Args:
-        data1 (list): First dataset (list of dictionaries).
-        data2 (list): Second dataset (list of dictionaries).
-        labels (list): Labels for the datasets (e.g., ["Bellman-Ford", "Dijkstra"]).
-    """
-    num_nodes1 = [entry['num_nodes'] for entry in data1]
-    num_edges1 = [entry['num_edges'] for entry in data1]
-    execution_times1 = [entry['execution_time'] for entry in data1]
+        results (list): Result dictionaries.
+        key (str): Field to group by (e.g. "family" or "solver").
 
-    num_nodes2 = [entry['num_nodes'] for entry in data2]
-    num_edges2 = [entry['num_edges'] for entry in data2]
-    execution_times2 = [entry['execution_time'] for entry in data2]
-
-    # Plot Execution Time vs. Number of Nodes
-    plt.figure(figsize=(10, 6))
-    plt.plot(num_nodes1, execution_times1, marker='o', linestyle='-', label=f"{labels[0]} Execution Time")
-    plt.plot(num_nodes2, execution_times2, marker='o', linestyle='--', label=f"{labels[1]} Execution Time")
-    plt.title("Execution Time vs. Number of Nodes")
-    plt.xlabel("Number of Nodes")
-    plt.ylabel("Execution Time (seconds)")
-    plt.grid()
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig("comparative_execution_time_vs_nodes.png")
+    Returns:
+        dict: Field value -> list of result dictionaries.
+    """
+    groups = {}
+    for entry in results:
+        groups.setdefault(entry[key], []).append(entry)
+    return groups
 
-    # Plot Execution Time vs. Number of Edges
-    plt.figure(figsize=(10, 6))
-    plt.plot(num_edges1, execution_times1, marker='o', linestyle='-', label=f"{labels[0]} Execution Time")
-    plt.plot(num_edges2, execution_times2, marker='o', linestyle='--', label=f"{labels[1]} Execution Time")
-    plt.title("Execution Time vs. Number of Edges")
-    plt.xlabel("Number of Edges")
-    plt.ylabel("Execution Time (seconds)")
-    plt.grid()
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig("comparative_execution_time_vs_edges.png")
+def plot_comparative_graphs(results, metric="median_ms", label="Median Execution Time (ms)"):
+    """
+    Plots one figure per graph family with one line per solver, against the
+    number of edges on log-log axes.
 
-    # Display all figures at once
-    plt.show()
+    Args:
+        results (list): Result dictionaries from load_results.
+        metric (str): Field to plot on the y axis.
+        label (str): Y axis label, including its unit.
+    """
+    for family, family_results in group_results(results, "family").items():
+        plt.figure(figsize=(10, 6))
+        for solver, entries in group_results(family_results, "solver").items():
+            entries = sorted(entries, key=lambda entry: entry['num_edges'])
+            plt.plot([entry['num_edges'] for entry in entries], [entry[metric] for entry in entries],
+                     marker='o', linestyle='-', label=solver)
+        plt.title(f"{label} vs. Number of Edges ({family})")
+        plt.xlabel("Number of Edges")
+        plt.ylabel(label)
+        plt.xscale("log")
+        plt.yscale("log")
+        plt.grid()
+        plt.legend()
+        plt.tight_layout()
+        plt.savefig(f"comparative_{metric}_{family}.png")
 
 def main():
     """
-    Main function to parse Bellman-Ford and Dijkstra files, extract graph data, and plot comparative graphs.
+    Main function to load benchmark results and plot comparative graphs.
     """
-    file_path1 = "bellman.txt"
-    file_path2 = "dijkstra.txt"
+    file_path = sys.argv[1] if len(sys.argv) > 1 else RESULTS_FILE
 
     # Verify file existence
-    if not os.path.isfile(file_path1):
-        print(f"Error: File '{file_path1}' does not exist.")
-        return
-    if not os.path.isfile(file_path2):
-        print(f"Error: File '{file_path2}' does not exist.")
+    if not os.path.isfile(file_path):
+        print(f"Error: File '{file_path}' does not exist. Run benchmark.py first.")
         return
 
-    # Parse the files and extract data
     try:
-        data1 = parse_file(file_path1)
-        data2 = parse_file(file_path2)
+        results = load_results(file_path)
 
-        if not data1 or not data2:
-            print("Error: One or both files contain no valid data.")
+        if not results:
+            print("Error: The results file contains no measurements.")
             return
 
         # Plot comparative graphs
-        plot_comparative_graphs(data1, data2, labels=["Bellman-Ford", "Dijkstra"])
+        plot_comparative_graphs(results)
+        plot_comparative_graphs(results, "peak_memory_bytes", "Peak Memory (bytes)")
+
+        # Display all figures at once
+        plt.show()
         print("Comparative plots have been saved and displayed successfully.")
     except Exception as e:
         print(f"An error occurred: {e}")
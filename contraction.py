@@ -0,0 +1,408 @@
+import heapq
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from csr_graph import INDEX_TYPE
+
+# Witness searches give up after settling this many nodes and keep the shortcut
+WITNESS_SETTLE_LIMIT = 100
+
+# File layout: header, label table padded to 8 bytes, the rank array, then
+# the upward and downward graphs as offsets, targets, weights and middle nodes
+INDEX_MAGIC = b"CHINDEX1"
+INDEX_HEADER = struct.Struct("<8s4q")
+
+
+def _witness_distances(out_edges, source, skip, limit, max_settled):
+    # Upper bounds on distances from source that avoid skip, up to limit.
+    # Unsettled entries are still lengths of real paths, so they are safe witnesses.
+    inf = float('inf')
+    dist = {source: 0}
+    queue = [(0, source)]
+    settled = 0
+    while queue:
+        current_distance, current_node = heapq.heappop(queue)
+        if current_distance > dist[current_node]:
+            continue
+        settled += 1
+        if settled > max_settled:
+            break
+        for neighbor, (weight, _) in out_edges[current_node].items():
+            distance = current_distance + weight
+            if neighbor != skip and distance <= limit and distance < dist.get(neighbor, inf):
+                dist[neighbor] = distance
+                heapq.heappush(queue, (distance, neighbor))
+    return dist
+
+
+def _shortcuts(node, out_edges, in_edges, max_settled):
+    # (u, x, weight) shortcuts needed to keep u -> node -> x distances once node is gone
+    shortcuts = []
+    inf = float('inf')
+    for u, (weight_in, _) in in_edges[node].items():
+        outgoing = [(x, weight) for x, (weight, _) in out_edges[node].items() if x != u]
+        if not outgoing:
+            continue
+        limit = weight_in + max(weight for _, weight in outgoing)
+        dist = _witness_distances(out_edges, u, node, limit, max_settled)
+        for x, weight_out in outgoing:
+            if dist.get(x, inf) > weight_in + weight_out:
+                shortcuts.append((u, x, weight_in + weight_out))
+    return shortcuts
+
+
+def _pack_rows(rows):
+    # Per-node lists of (target, weight, middle) -> CSR arrays
+    offsets = array(INDEX_TYPE, [0])
+    targets, weights, middles = array(INDEX_TYPE), array(INDEX_TYPE), array(INDEX_TYPE)
+    for row in rows:
+        for target, weight, middle in row:
+            targets.append(target)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middles
+
+
+def build_hierarchy(graph, max_settled=WITNESS_SETTLE_LIMIT):
+    """
+    Contracts every node of ``graph``, least important first.
+
+    Importance is twice the edge difference (shortcuts added minus edges
+    removed) plus the number of neighbours already contracted and the node's
+    level (one more than its highest contracted neighbour), which spreads
+    contraction evenly. Priorities are updated lazily: a node whose recomputed
+    priority is no longer the smallest goes back in the queue.
+
+    Args:
+        graph (CSRGraph): Graph with non-negative weights.
+        max_settled (int): Settle limit for each witness search. Lower values
+            preprocess faster but may add unneeded (still correct) shortcuts.
+
+    Returns:
+        ContractionHierarchy: The hierarchy, with ``shortcuts`` and
+        ``build_seconds`` set.
+    """
+    if graph.min_weight < 0:
+        raise ValueError("Contraction hierarchies need non-negative weights")
+
+    start_time = time.perf_counter()
+    n = graph.num_nodes
+    out_edges = [{} for _ in range(n)]
+    in_edges = [{} for _ in range(n)]
+    for u, v, weight in graph.edges():
+        # Self-loops never lie on a shortest path
+        if u != v:
+            out_edges[u][v] = (weight, -1)
+            in_edges[v][u] = (weight, -1)
+
+    contracted_neighbors = [0] * n
+    level = [0] * n
+
+    def priority(node):
+        shortcuts = _shortcuts(node, out_edges, in_edges, max_settled)
+        edge_difference = len(shortcuts) - len(in_edges[node]) - len(out_edges[node])
+        return 2 * edge_difference + contracted_neighbors[node] + level[node], shortcuts
+
+    queue = [(priority(node)[0], node) for node in range(n)]
+    heapq.heapify(queue)
+    rank = array(INDEX_TYPE, bytes(8 * n))
+    up_rows = [()] * n
+    down_rows = [()] * n
+    order = 0
+    added = 0
+
+    while queue:
+        _, node = heapq.heappop(queue)
+        current_priority, shortcuts = priority(node)
+        if queue and current_priority > queue[0][0]:
+            heapq.heappush(queue, (current_priority, node))
+            continue
+
+        rank[node] = order
+        order += 1
+        # Edges to the remaining (higher ranked) neighbours are final now
+        up_rows[node] = [(x, weight, middle) for x, (weight, middle) in out_edges[node].items()]
+        down_rows[node] = [(u, weight, middle) for u, (weight, middle) in in_edges[node].items()]
+        for x in out_edges[node]:
+            del in_edges[x][node]
+            contracted_neighbors[x] += 1
+            level[x] = max(level[x], level[node] + 1)
+        for u in in_edges[node]:
+            del out_edges[u][node]
+            contracted_neighbors[u] += 1
+            level[u] = max(level[u], level[node] + 1)
+        out_edges[node] = {}
+        in_edges[node] = {}
+
+        for u, x, weight in shortcuts:
+            existing = out_edges[u].get(x)
+            if existing is None or weight < existing[0]:
+                out_edges[u][x] = (weight, node)
+                in_edges[x][u] = (weight, node)
+                added += 1
+
+    hierarchy = ContractionHierarchy(list(graph.labels), rank, _pack_rows(up_rows), _pack_rows(down_rows))
+    hierarchy.shortcuts = added
+    hierarchy.build_seconds = time.perf_counter() - start_time
+    return hierarchy
+
+
+class ContractionHierarchy:
+    """
+    Point-to-point query engine over a contraction hierarchy.
+
+    ``up`` holds, per node, the edges to higher ranked nodes; ``down`` holds,
+    per node, the edges coming in from higher ranked nodes (stored reversed,
+    for the backward search). Both are ``(offsets, targets, weights, middles)``
+    CSR arrays, where ``middles[e]`` is the node a shortcut skips or -1 for an
+    original edge.
+    """
+
+    def __init__(self, labels, rank, up, down):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.shortcuts = None
+        self.build_seconds = None
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.up[1]) + len(self.down[1])
+
+    def query(self, source, target, stats=None):
+        """
+        Upward bidirectional Dijkstra between two node ids.
+
+        Returns:
+            tuple: ``(distance, path of node ids)`` with shortcuts unpacked,
+            or ``(inf, [])`` when target is unreachable.
+        """
+        inf = float('inf')
+        if source == target:
+            return 0, [source]
+
+        rows = (self.up, self.down)
+        dist = ({source: 0}, {target: 0})
+        pred = ({source: (-1, -1)}, {target: (-1, -1)})
+        queues = ([(0, source)], [(0, target)])
+        best, meeting = inf, -1
+        settled = 0
+        stalls = 0
+
+        while True:
+            forward = queues[0][0][0] if queues[0] else inf
+            backward = queues[1][0][0] if queues[1] else inf
+            # Neither side can still reach a better meeting point
+            if min(forward, backward) >= best:
+                break
+
+            side = 0 if forward <= backward else 1
+            current_distance, current_node = heapq.heappop(queues[side])
+            side_dist, side_pred, other_dist = dist[side], pred[side], dist[1 - side]
+            if current_distance > side_dist[current_node]:
+                continue
+            settled += 1
+            if current_node in other_dist and current_distance + other_dist[current_node] < best:
+                best = current_distance + other_dist[current_node]
+                meeting = current_node
+
+            # Stall-on-demand: when a higher ranked node already reaches this one
+            # more cheaply, no shortest path continues upward from here
+            offsets, targets, weights, _ = rows[1 - side]
+            stalled = False
+            for edge in range(offsets[current_node], offsets[current_node + 1]):
+                if side_dist.get(targets[edge], inf) + weights[edge] < current_distance:
+                    stalled = True
+                    break
+            if stalled:
+                stalls += 1
+                continue
+
+            offsets, targets, weights, middles = rows[side]
+            for edge in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+                if distance < side_dist.get(neighbor, inf):
+                    side_dist[neighbor] = distance
+                    side_pred[neighbor] = (current_node, middles[edge])
+                    heapq.heappush(queues[side], (distance, neighbor))
+                    if distance + other_dist.get(neighbor, inf) < best:
+                        best = distance + other_dist[neighbor]
+                        meeting = neighbor
+
+        if stats is not None:
+            stats['settled'] = settled
+            stats['stalled'] = stalls
+        if meeting < 0:
+            return inf, []
+        return best, self._unpack_path(pred, meeting)
+
+    def _unpack_path(self, pred, meeting):
+        # Hierarchy edges source .. meeting, then meeting .. target
+        edges = []
+        node = meeting
+        while pred[0][node][0] >= 0:
+            previous, middle = pred[0][node]
+            edges.append((previous, node, middle))
+            node = previous
+        edges.reverse()
+        source = node
+        node = meeting
+        while pred[1][node][0] >= 0:
+            following, middle = pred[1][node]
+            edges.append((node, following, middle))
+            node = following
+
+        path = [source]
+        for edge in edges:
+            self._unpack_edge(edge, path)
+        return path
+
+    def _unpack_edge(self, edge, path):
+        # Appends the original nodes after edge[0] up to edge[1]. The middle node
+        # ranks below both ends, so u -> middle is in middle's down row and
+        # middle -> v in its up row.
+        stack = [edge]
+        while stack:
+            u, v, middle = stack.pop()
+            if middle < 0:
+                path.append(v)
+                continue
+            stack.append((middle, v, self._middle(self.up, middle, v)))
+            stack.append((u, middle, self._middle(self.down, middle, u)))
+
+    @staticmethod
+    def _middle(rows, node, target):
+        offsets, targets, _, middles = rows
+        for edge in range(offsets[node], offsets[node + 1]):
+            if targets[edge] == target:
+                return middles[edge]
+        raise KeyError((node, target))
+
+    def shortest_path(self, start, end):
+        """
+        Returns ``(distance, path)`` between two labels, with the path as the
+        list of labels ``reconstruct_path`` gives, or ``(inf, [])``.
+        """
+        distance, path = self.query(self.index[start], self.index[end])
+        return distance, [self.labels[node] for node in path]
+
+    # ----- persistence -----
+
+    def save(self, file_path):
+        label_table = "\n".join(self.labels).encode('utf-8')
+        with open(file_path, 'wb') as file:
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, self.num_nodes, len(self.up[1]),
+                                         len(self.down[1]), len(label_table)))
+            file.write(label_table.ljust((len(label_table) + 7) // 8 * 8, b"\0"))
+            file.write(memoryview(self.rank).tobytes())
+            for part in self.up + self.down:
+                file.write(memoryview(part).tobytes())
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Memory-maps a hierarchy written by ``save``.
+        """
+        with open(file_path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, num_nodes, up_edges, down_edges, label_bytes = INDEX_HEADER.unpack_from(mapped)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{file_path} is not a contraction hierarchy file")
+
+        start = INDEX_HEADER.size
+        labels = mapped[start:start + label_bytes].decode('utf-8').split("\n") if num_nodes else []
+        start += (label_bytes + 7) // 8 * 8
+        view = memoryview(mapped)
+        sizes = [num_nodes, num_nodes + 1, up_edges, up_edges, up_edges, num_nodes + 1, down_edges, down_edges, down_edges]
+        parts = []
+        for size in sizes:
+            parts.append(view[start:start + 8 * size].cast(INDEX_TYPE))
+            start += 8 * size
+        return cls(labels, parts[0], tuple(parts[1:5]), tuple(parts[5:9]))
+
+
+def compare_with_dijkstra(graph, hierarchy, queries=100, seed=42):
+    """
+    Times random point-to-point queries with the hierarchy against
+    bidirectional Dijkstra on the original graph and checks the distances.
+
+    Returns:
+        dict: Mean query time in ms for both, the speedup and the number
+        of distance mismatches.
+    """
+    from dijkstra import bidirectional_dijkstra_csr
+
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)) for _ in range(queries)]
+    graph.reverse()
+
+    mismatches = 0
+    ch_time = dijkstra_time = 0
+    for source, target in pairs:
+        start_time = time.perf_counter()
+        ch_distance, _ = hierarchy.query(source, target)
+        ch_time += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        distance, _ = bidirectional_dijkstra_csr(graph, source, target)
+        dijkstra_time += time.perf_counter() - start_time
+        mismatches += ch_distance != distance
+
+    return {
+        "ch_ms": ch_time * 1000 / queries,
+        "bidirectional_ms": dijkstra_time * 1000 / queries,
+        "speedup": dijkstra_time / ch_time if ch_time else float('inf'),
+        "mismatches": mismatches,
+    }
+
+
+def main(argv):
+    """
+    Usage:
+        python contraction.py build <graph file> <index file>             preprocess and save
+        python contraction.py query <index file> <u> <v>                  one shortest path
+        python contraction.py compare <graph file> <index file> [count]   speedup over Dijkstra
+    """
+    from graph_loader import load_graph
+
+    if len(argv) == 3 and argv[0] == "build":
+        graph, _, _ = load_graph(argv[1])
+        hierarchy = build_hierarchy(graph)
+        hierarchy.save(argv[2])
+        print(f"Contracted {graph.num_nodes} nodes in {hierarchy.build_seconds:.6f} seconds, "
+              f"adding {hierarchy.shortcuts} shortcuts to {graph.num_edges} edges")
+        print(f"Index size: {os.path.getsize(argv[2])} bytes ({hierarchy.num_edges} hierarchy edges)")
+    elif len(argv) == 4 and argv[0] == "query":
+        hierarchy = ContractionHierarchy.load(argv[1])
+        start_time = time.perf_counter()
+        distance, path = hierarchy.shortest_path(argv[2], argv[3])
+        query_time = (time.perf_counter() - start_time) * 1000
+        if path:
+            print(f"Distance: {distance}\nPath: {' -> '.join(path)}\nQuery time: {query_time:.6f} ms")
+        else:
+            print(f"No path found from {argv[2]} to {argv[3]}")
+    elif len(argv) in (3, 4) and argv[0] == "compare":
+        graph, _, _ = load_graph(argv[1])
+        hierarchy = ContractionHierarchy.load(argv[2])
+        result = compare_with_dijkstra(graph, hierarchy, int(argv[3]) if len(argv) == 4 else 100)
+        print(f"Contraction hierarchy: {result['ch_ms']:.6f} ms per query")
+        print(f"Bidirectional Dijkstra: {result['bidirectional_ms']:.6f} ms per query")
+        print(f"Speedup: {result['speedup']:.1f}x, {result['mismatches']} distance mismatches")
+    else:
+        print(main.__doc__.strip())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
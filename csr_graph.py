@@ -0,0 +1,301 @@
+from array import array
+
+# Typecode for node ids, row offsets and edge weights (signed 64-bit)
+INDEX_TYPE = 'q'
+
+
+class CSRGraph:
+    """
+    Directed, weighted graph stored as compressed sparse rows.
+
+    Node labels are interned once to integer ids. The out-edges of node ``u``
+    are ``targets[offsets[u]:offsets[u + 1]]`` with matching ``weights``.
+    Ids follow the sorted order of the labels, so a heap ordered by
+    ``(distance, id)`` breaks ties exactly like one ordered by
+    ``(distance, label)``.
+
+    The class also behaves like the read-only ``{node: {neighbor: weight}}``
+    dict the GUIs used to work with (``in``, ``len``, iteration, ``graph[node]``
+    and ``items()``), so drawing code keeps working unchanged.
+    """
+
+    def __init__(self, labels, offsets, targets, weights, min_weight=None):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._min_weight = min_weight
+        self._max_weight = None
+        self._sources = None
+        self._reverse = None
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights):
+        """
+        Builds a graph from three parallel edge sequences.
+
+        Args:
+            sources (sequence): Source label of every edge.
+            targets (sequence): Target label of every edge.
+            weights (sequence): Integer weight of every edge.
+
+        Returns:
+            CSRGraph: The compressed graph. When an edge is listed more than
+            once the last weight wins, like repeated dict assignment.
+        """
+        labels = sorted(set(sources).union(targets))
+        index = {label: i for i, label in enumerate(labels)}
+        src = array(INDEX_TYPE, map(index.__getitem__, sources))
+        dst = array(INDEX_TYPE, map(index.__getitem__, targets))
+        return cls.from_id_edges(labels, src, dst, array(INDEX_TYPE, weights))
+
+    @classmethod
+    def from_id_edges(cls, labels, src, dst, weights):
+        """
+        Builds a graph from edges whose endpoints are already interned ids.
+
+        Args:
+            labels (list): Node label for every id.
+            src (sequence): Source id of every edge.
+            dst (sequence): Target id of every edge.
+            weights (sequence): Integer weight of every edge.
+
+        Returns:
+            CSRGraph: The compressed graph, rows kept in input order.
+        """
+        num_nodes = len(labels)
+        num_edges = len(src)
+
+        # Counting sort by source id keeps each row in file order
+        offsets = array(INDEX_TYPE, bytes(8 * (num_nodes + 1)))
+        for u in src:
+            offsets[u + 1] += 1
+        for u in range(num_nodes):
+            offsets[u + 1] += offsets[u]
+
+        position = array(INDEX_TYPE, offsets[:-1])
+        row_targets = array(INDEX_TYPE, bytes(8 * num_edges))
+        row_weights = array(INDEX_TYPE, bytes(8 * num_edges))
+        for e in range(num_edges):
+            u = src[e]
+            p = position[u]
+            row_targets[p] = dst[e]
+            row_weights[p] = weights[e]
+            position[u] = p + 1
+
+        graph = cls(labels, offsets, row_targets, row_weights)
+        graph._merge_duplicate_edges()
+        return graph
+
+    @classmethod
+    def from_dict(cls, graph):
+        """
+        Converts a ``{node: {neighbor: weight}}`` dict into a CSRGraph.
+        """
+        sources, targets, weights = [], [], []
+        for node, neighbors in graph.items():
+            for neighbor, weight in neighbors.items():
+                sources.append(node)
+                targets.append(neighbor)
+                weights.append(weight)
+        result = cls.from_edges(sources, targets, weights)
+        missing = [node for node in graph if node not in result.index]
+        if missing:
+            # Isolated nodes carry no edges, so rebuild with them interned
+            labels = sorted(set(result.labels).union(missing))
+            index = {label: i for i, label in enumerate(labels)}
+            src = array(INDEX_TYPE, (index[n] for n in sources))
+            dst = array(INDEX_TYPE, (index[n] for n in targets))
+            result = cls.from_id_edges(labels, src, dst, array(INDEX_TYPE, weights))
+        return result
+
+    def subgraph(self, node_ids):
+        """
+        Builds the subgraph induced by ``node_ids``.
+
+        Labels are kept and ids are renumbered in increasing order, so label
+        order (and with it tie-breaking) is the same as in this graph.
+
+        Args:
+            node_ids (iterable): Ids of the nodes to keep.
+
+        Returns:
+            CSRGraph: The nodes and every edge between two of them.
+        """
+        node_ids = sorted(node_ids)
+        new_id = {u: i for i, u in enumerate(node_ids)}
+        offsets = array(INDEX_TYPE, [0])
+        targets = array(INDEX_TYPE)
+        weights = array(INDEX_TYPE)
+        for u in node_ids:
+            for edge in range(self.offsets[u], self.offsets[u + 1]):
+                v = new_id.get(self.targets[edge])
+                if v is not None:
+                    targets.append(v)
+                    weights.append(self.weights[edge])
+            offsets.append(len(targets))
+        return CSRGraph([self.labels[u] for u in node_ids], offsets, targets, weights)
+
+    def _merge_duplicate_edges(self):
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        has_duplicates = False
+        for u in range(len(self.labels)):
+            start, end = offsets[u], offsets[u + 1]
+            if end - start > 1 and len(set(targets[start:end])) != end - start:
+                has_duplicates = True
+                break
+        if not has_duplicates:
+            return
+
+        new_offsets = array(INDEX_TYPE, [0])
+        new_targets = array(INDEX_TYPE)
+        new_weights = array(INDEX_TYPE)
+        for u in range(len(self.labels)):
+            row = {}
+            for e in range(offsets[u], offsets[u + 1]):
+                row[targets[e]] = weights[e]  # first position, last weight
+            new_targets.extend(row.keys())
+            new_weights.extend(row.values())
+            new_offsets.append(len(new_targets))
+        self.offsets, self.targets, self.weights = new_offsets, new_targets, new_weights
+
+    # ----- sizes and label mapping -----
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def min_weight(self):
+        if self._min_weight is None:
+            self._min_weight = min(self.weights) if len(self.weights) else 0
+        return self._min_weight
+
+    @property
+    def max_weight(self):
+        if self._max_weight is None:
+            self._max_weight = max(self.weights) if len(self.weights) else 0
+        return self._max_weight
+
+    def node_id(self, label):
+        return self.index[label]
+
+    def label(self, node_id):
+        return self.labels[node_id]
+
+    def edge_weight(self, u, v):
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[e] == v:
+                return self.weights[e]
+        raise KeyError((self.labels[u], self.labels[v]))
+
+    def path_labels(self, path_ids):
+        labels = self.labels
+        return [labels[i] for i in path_ids]
+
+    # ----- flat edge views -----
+
+    def edge_sources(self):
+        """
+        Returns the source id of every edge, aligned with ``targets``.
+        """
+        if self._sources is None:
+            offsets = self.offsets
+            sources = array(INDEX_TYPE)
+            for u in range(len(self.labels)):
+                sources.extend([u] * (offsets[u + 1] - offsets[u]))
+            self._sources = sources
+        return self._sources
+
+    def edges(self):
+        """
+        Yields every edge as a ``(source_id, target_id, weight)`` tuple.
+        """
+        return zip(self.edge_sources(), self.targets, self.weights)
+
+    def reverse(self):
+        """
+        Returns the transposed graph (every edge flipped), built once.
+        """
+        if self._reverse is None:
+            reverse = CSRGraph.from_id_edges(self.labels, self.targets, self.edge_sources(), self.weights)
+            reverse.index = self.index
+            reverse._reverse = self
+            self._reverse = reverse
+        return self._reverse
+
+    # ----- shortest-path results -----
+
+    def to_shortest_paths(self, dist, pred):
+        """
+        Converts id-indexed ``dist``/``pred`` arrays into the
+        ``{node: (predecessor, distance)}`` dict returned by ``dijkstra()``.
+
+        Args:
+            dist (list): Distance per node id, ``float('inf')`` if unreached.
+            pred (list): Predecessor id per node id, ``-1`` for none.
+
+        Returns:
+            dict: Entries for every reached node, keyed by label.
+        """
+        labels = self.labels
+        inf = float('inf')
+        return {
+            labels[v]: (labels[pred[v]] if pred[v] >= 0 else None, dist[v])
+            for v in range(len(labels)) if dist[v] != inf
+        }
+
+    # ----- dict-of-dicts compatibility -----
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __getitem__(self, label):
+        u = self.index[label]
+        labels, targets, weights = self.labels, self.targets, self.weights
+        return {labels[targets[e]]: weights[e] for e in range(self.offsets[u], self.offsets[u + 1])}
+
+    def items(self):
+        for label in self.labels:
+            yield label, self[label]
+
+
+def predecessor_path(pred, source, target):
+    """
+    Follows the predecessor ids in ``pred`` back from ``target`` to ``source``.
+
+    The walk takes at most ``len(pred)`` steps, so a chain that runs into a
+    cycle (as it can behind a negative cycle) ends instead of looping.
+
+    Args:
+        pred: Predecessor id per node id (a list, array or dict), negative
+            where there is none.
+        source (int): Node id the path starts at.
+        target (int): Node id the path ends at.
+
+    Returns:
+        list: Node ids from ``source`` to ``target``, or [] when the chain does
+        not lead back to ``source``.
+    """
+    path = [target]
+    node = target
+    while node != source:
+        if len(path) > len(pred):
+            return []
+        node = pred[node]
+        if node < 0:
+            return []
+        path.append(node)
+    path.reverse()
+    return path
@@ -0,0 +1,234 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from background import PROGRESS_INTERVAL
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is required by delta_stepping itself, not by importing this module
+    np = None
+
+# Frontiers with fewer edges than this are relaxed on the calling thread; the
+# pool only pays off once each worker has a sizeable slice
+PARALLEL_MIN_EDGES = 1 << 15
+
+
+class SplitGraph:
+    """
+    The CSR arrays of one graph as NumPy arrays, with each node's edges split
+    into light (weight <= delta) and heavy ones, as delta-stepping relaxes
+    them at different times.
+
+    Args:
+        graph (CSRGraph): The graph; weights must be non-negative.
+        delta (int): Bucket width.
+    """
+
+    def __init__(self, graph, delta):
+        self.num_nodes = graph.num_nodes
+        self.delta = delta
+        offsets = np.asarray(graph.offsets, dtype=np.int64)
+        targets = np.asarray(graph.targets, dtype=np.int64)
+        weights = np.asarray(graph.weights, dtype=np.int64)
+        sources = np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(offsets))
+        light = weights <= delta
+        # Masking keeps the edges grouped by source, so new offsets follow from counts
+        self.light = self._subset(sources[light], targets[light], weights[light])
+        self.heavy = self._subset(sources[~light], targets[~light], weights[~light])
+
+    def _subset(self, sources, targets, weights):
+        offsets = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self.num_nodes), out=offsets[1:])
+        return offsets, targets, weights
+
+
+def auto_delta(graph):
+    """
+    Picks a bucket width of about max weight / average out-degree: each
+    bucket then holds roughly one edge's worth of distance per neighbour,
+    which keeps re-relaxations rare without making buckets tiny.
+    """
+    if not graph.num_edges:
+        return 1
+    average_degree = graph.num_edges / max(1, graph.num_nodes)
+    return max(1, int(graph.max_weight / max(1.0, average_degree)))
+
+
+def delta_stepping(graph, source, target=None, delta=None, stats=None, workers=1, progress=None):
+    """
+    Delta-stepping single-source shortest paths on the graph's CSR arrays.
+
+    Nodes are grouped into buckets of tentative distance ``[i * delta,
+    (i + 1) * delta)``. The lowest non-empty bucket is emptied by relaxing
+    the light edges of all its nodes at once, repeated until no node
+    re-enters it; then their heavy edges are relaxed once. Every relaxation
+    round is a batch of NumPy array operations, split across ``workers``
+    threads (NumPy releases the GIL inside them) when the frontier is large.
+
+    Args:
+        graph (CSRGraph): The graph; weights must be non-negative.
+        source (int): Source node id.
+        target (int): Stop once this node's distance is final.
+        delta (int): Bucket width; picked by ``auto_delta`` when None.
+        stats (dict): Filled with buckets, phases, settled, relaxations,
+            delta and workers when given.
+        workers (int): Threads per relaxation round; None uses every core.
+        progress (callable): ``progress(settled)``, called after each bucket
+            once another PROGRESS_INTERVAL nodes are settled; may raise to stop.
+
+    Returns:
+        tuple: ``(dist, pred)`` lists indexed by node id, like ``dijkstra_csr``.
+    """
+    if np is None:
+        raise ImportError("delta_stepping requires NumPy")
+    if graph.num_edges and graph.min_weight < 0:
+        raise ValueError("delta_stepping does not support negative edge weights")
+    if delta is None:
+        delta = auto_delta(graph)
+    if delta < 1:
+        raise ValueError(f"Bucket width must be at least 1, got {delta}")
+    workers = workers or os.cpu_count() or 1
+
+    split = SplitGraph(graph, delta)
+    unreached = np.iinfo(np.int64).max
+    dist = np.full(graph.num_nodes, unreached, dtype=np.int64)
+    pred = np.full(graph.num_nodes, -1, dtype=np.int64)
+    dist[source] = 0
+    pending = np.array([source], dtype=np.int64)
+    counters = {'buckets': 0, 'phases': 0, 'relaxations': 0}
+    settled = 0
+    reported = 0
+    pool = ThreadPoolExecutor(workers) if workers > 1 else None
+
+    try:
+        while pending.size:
+            bucket = int(dist[pending].min()) // delta
+            upper = (bucket + 1) * delta
+            inside = dist[pending] < upper
+            frontier, pending = pending[inside], pending[~inside]
+            counters['buckets'] += 1
+
+            # Light edges can land back in this bucket, so repeat until it stays empty
+            emptied = []
+            while frontier.size:
+                emptied.append(frontier)
+                changed = _relax(split.light, frontier, dist, pred, pool, workers, counters)
+                stays = dist[changed] < upper
+                frontier = changed[stays]
+                pending = np.concatenate((pending, changed[~stays]))
+
+            # Heavy edges always leave the bucket, so one round settles them
+            emptied = np.unique(np.concatenate(emptied))
+            pending = np.concatenate((pending, _relax(split.heavy, emptied, dist, pred, pool, workers, counters)))
+            # Entries whose distance dropped into this bucket were settled with it
+            pending = np.unique(pending[dist[pending] >= upper])
+
+            settled += emptied.size
+            if progress is not None and settled - reported >= PROGRESS_INTERVAL:
+                reported = settled
+                progress(settled)
+            if target is not None and dist[target] < upper:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if stats is not None:
+        stats['settled'] = settled
+        stats.update(counters)
+        stats['delta'] = delta
+        stats['workers'] = workers
+
+    dist_list = dist.tolist()
+    for node in np.flatnonzero(dist == unreached).tolist():
+        dist_list[node] = float('inf')
+    return dist_list, pred.tolist()
+
+
+def _relax(edges, frontier, dist, pred, pool, workers, counters):
+    # Relaxes every edge out of frontier and returns the nodes whose distance dropped
+    offsets = edges[0]
+    counts = offsets[frontier + 1] - offsets[frontier]
+    total = int(counts.sum())
+    counters['phases'] += 1
+    counters['relaxations'] += total
+    if not total:
+        return frontier[:0]
+
+    if pool is None or total < PARALLEL_MIN_EDGES:
+        nodes, distances, parents = _candidates(edges, frontier, counts, dist)
+    else:
+        # Slices with about the same number of edges each
+        bounds = np.searchsorted(np.cumsum(counts), np.linspace(0, total, workers + 1)[1:-1])
+        slices = [s for s in np.split(np.arange(frontier.size), bounds) if s.size]
+        parts = list(pool.map(lambda s: _candidates(edges, frontier[s], counts[s], dist), slices))
+        nodes, distances, parents = (np.concatenate(column) for column in zip(*parts))
+        nodes, distances, parents = _best_per_node(nodes, distances, parents)
+
+    dist[nodes] = distances
+    pred[nodes] = parents
+    return nodes
+
+
+def _candidates(edges, frontier, counts, dist):
+    # Improving (node, distance, parent) triples, at most one per node
+    offsets, targets, weights = edges
+    firsts = np.repeat(offsets[frontier] - (np.cumsum(counts) - counts), counts)
+    edge_ids = firsts + np.arange(firsts.size)
+    parents = np.repeat(frontier, counts)
+    nodes = targets[edge_ids]
+    distances = dist[parents] + weights[edge_ids]
+    better = distances < dist[nodes]
+    return _best_per_node(nodes[better], distances[better], parents[better])
+
+
+def _best_per_node(nodes, distances, parents):
+    if nodes.size < 2:
+        return nodes, distances, parents
+    order = np.lexsort((distances, nodes))
+    nodes, distances, parents = nodes[order], distances[order], parents[order]
+    first = np.empty(nodes.size, dtype=bool)
+    first[0] = True
+    np.not_equal(nodes[1:], nodes[:-1], out=first[1:])
+    return nodes[first], distances[first], parents[first]
+
+
+def main(argv):
+    """
+    Usage:
+        python delta_stepping.py <graph file> <source> [delta] [workers]
+
+    Solves from the source with delta-stepping and checks every distance
+    against Dijkstra.
+    """
+    if len(argv) not in (2, 3, 4):
+        print(main.__doc__.strip())
+        return
+
+    from dijkstra import dijkstra_csr
+    from graph_loader import load_graph
+
+    graph, _, _ = load_graph(argv[0])
+    source = graph.node_id(argv[1])
+    delta = int(argv[2]) if len(argv) > 2 else None
+    workers = int(argv[3]) if len(argv) > 3 else 1
+
+    stats = {}
+    start_time = time.perf_counter()
+    dist, _ = delta_stepping(graph, source, delta=delta, stats=stats, workers=workers)
+    delta_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    reference, _ = dijkstra_csr(graph, source)
+    dijkstra_time = time.perf_counter() - start_time
+
+    mismatches = sum(1 for a, b in zip(dist, reference) if a != b)
+    print(f"Delta-stepping (delta {stats['delta']}, {stats['workers']} worker(s)) took {delta_time:.6f} seconds: "
+          f"{stats['buckets']} buckets, {stats['phases']} phases, {stats['relaxations']} relaxations")
+    print(f"Dijkstra took {dijkstra_time:.6f} seconds")
+    print("Distances match Dijkstra" if not mismatches else f"{mismatches} distances differ from Dijkstra")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
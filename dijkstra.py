@@ -1,73 +1,394 @@
 import heapq
 import os
 import time
-import tkinter as tk
-from tkinter import filedialog, messagebox
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from csr_graph import CSRGraph, predecessor_path
+from graph_loader import graph_fingerprint, load_graph
+from path_cache import ShortestPathCache, ShortestPathTree
+from astar import astar, get_landmarks
+from background import PROGRESS_INTERVAL
+from priority_queue import IndexedHeap
+from reachability import get_reachability
+from telemetry import telemetry
+
+# Shortest-path trees shared by every query in this process
+shortest_path_cache = ShortestPathCache()
+
+# Search modes offered by process_graph and the GUI
+SEARCH_MODES = ("full", "early", "bidirectional", "astar")
+
+# Priority queues offered by dijkstra_csr(queue=...): heapq with lazy deletion,
+# an indexed d-ary heap with decrease-key, and Dial's bucket queue
+QUEUE_BACKENDS = ("binary", "dary", "bucket")
+
+# Largest edge weight the bucket queue accepts; it keeps max_weight + 1 buckets
+BUCKET_MAX_WEIGHT = 1 << 16
 
 def read_graph_from_file(file_path):
-    graph = {}
-    with open(file_path, 'r') as file:
-        num_nodes = int(file.readline().strip())
-        num_edges = int(file.readline().strip())
-
-        for _ in range(num_edges):
-            line = file.readline().strip().split()
-            if len(line) != 3:
-                continue
-            node1, node2, weight = line[0], line[1], int(line[2])
-            
-            # Check for negative weights
-            if weight < 0:
-                messagebox.showerror("File Error", f"Edge encountered as negative.")
-                raise ValueError(f"Negative weight detected: {node1} -> {node2} with weight {weight}")
-            
-            if node1 not in graph:
-                graph[node1] = {}
-            if node2 not in graph:  # Ensure all nodes exist in the graph
-                graph[node2] = {}
-            graph[node1][node2] = weight
+    # Chunked parse on first load, memory-mapped binary sidecar afterwards
+    graph, num_nodes, num_edges = load_graph(file_path)
+
+    # Check for negative weights; the GUI reports the error, as this may run on a worker thread
+    if graph.min_weight < 0:
+        node1, node2, weight = next((graph.label(u), graph.label(v), w) for u, v, w in graph.edges() if w < 0)
+        raise ValueError(f"Negative weight detected: {node1} -> {node2} with weight {weight}")
 
     return graph, num_nodes, num_edges
 
-def log_execution_details(file_name, source_node, num_nodes, num_edges, execution_time, end_node=None, path=None):
-    log_file = "dijkstra.txt"
-    with open(log_file, "a") as file:
-        file.write(f"Graph File: {file_name}\n")
-        file.write(f"Source Node: {source_node}\n")
-        if end_node:
-            file.write(f"End Node: {end_node}\n")
-        file.write(f"Number of Nodes: {num_nodes}\n")
-        file.write(f"Number of Edges: {num_edges}\n")
-        file.write(f"Execution Time: {execution_time:.6f} seconds\n")
-        if path:
-            file.write(f"Path: {path}\n")
-        file.write("-" * 50 + "\n")
-
-
-def dijkstra(graph, start):
-    priority_queue = [(0, start)]
-    shortest_paths = {start: (None, 0)}
-    visited = set()
+def log_execution_details(file_name, source_node, num_nodes, num_edges, execution_time, end_node=None, path=None, **metrics):
+    # One structured record per query in the shared telemetry file; execution_time
+    # is the solve time in ms, metrics holds load_ms and the solver counters
+    telemetry.record("dijkstra", graph_file=file_name, source=source_node, target=end_node,
+                     num_nodes=num_nodes, num_edges=num_edges, solve_ms=execution_time,
+                     path=path, **metrics)
+
+
+def dijkstra_csr(graph, source, target=None, stats=None, queue="binary", progress=None):
+    # Works on integer ids: returns distance and predecessor lists indexed by node id.
+    # With a target the search stops as soon as that node is settled.
+    # Only pops are counted in the loop; pushes and stale skips follow from them.
+    # progress(settled), when given, is called every PROGRESS_INTERVAL settled
+    # nodes and may raise to abandon the search.
+    if queue == "dary":
+        return dijkstra_dary(graph, source, target, stats, progress=progress)
+    if queue == "bucket":
+        return dijkstra_dial(graph, source, target, stats, progress)
+    if queue != "binary":
+        raise ValueError(f"Unknown priority queue {queue!r}; expected one of {QUEUE_BACKENDS}")
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [float('inf')] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    visited = bytearray(graph.num_nodes)
+    dist[source] = 0
+    priority_queue = [(0, source)]
+    settled = 0
+    pops = 0
+    peak_size = 0
 
     while priority_queue:
+        # The heap only grows between pops, so its peak is seen here or at the end
+        if len(priority_queue) > peak_size:
+            peak_size = len(priority_queue)
         current_distance, current_node = heapq.heappop(priority_queue)
-        if current_node in visited:
+        pops += 1
+        if visited[current_node]:
             continue
 
-        visited.add(current_node)
+        visited[current_node] = 1
+        settled += 1
+        if progress is not None and not settled % PROGRESS_INTERVAL:
+            progress(settled)
+        if current_node == target:
+            break
+
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                pred[neighbor] = current_node
+                heapq.heappush(priority_queue, (distance, neighbor))
+
+    if stats is not None:
+        stats['settled'] = settled
+        stats['heap_pops'] = pops
+        stats['heap_pushes'] = pops + len(priority_queue)
+        stats['stale_skips'] = pops - settled
+        stats['relaxations'] = stats['heap_pushes'] - 1
+        stats['peak_heap_size'] = max(peak_size, len(priority_queue))
+    return dist, pred
+
+
+def dijkstra_dary(graph, source, target=None, stats=None, arity=4, progress=None):
+    # Same contract as dijkstra_csr, on an IndexedHeap: an improved node has its
+    # key lowered in place, so the heap holds at most one entry per node and no
+    # pop is stale
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [float('inf')] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    dist[source] = 0
+    priority_queue = IndexedHeap(graph.num_nodes, arity)
+    priority_queue.push(source, 0)
+    settled = 0
+    decreases = 0
+    peak_size = 0
 
-        for neighbor, weight in graph[current_node].items():
-            distance = current_distance + weight
-            if neighbor not in shortest_paths or distance < shortest_paths[neighbor][1]:
-                shortest_paths[neighbor] = (current_node, distance)
+    while priority_queue:
+        if len(priority_queue) > peak_size:
+            peak_size = len(priority_queue)
+        current_distance, current_node = priority_queue.pop()
+        settled += 1
+        if progress is not None and not settled % PROGRESS_INTERVAL:
+            progress(settled)
+        if current_node == target:
+            break
+
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                pred[neighbor] = current_node
+                if priority_queue.push(neighbor, distance):
+                    decreases += 1
+
+    if stats is not None:
+        stats['settled'] = settled
+        stats['heap_pops'] = settled
+        stats['heap_pushes'] = settled + len(priority_queue)
+        stats['decrease_keys'] = decreases
+        stats['stale_skips'] = 0
+        stats['relaxations'] = stats['heap_pushes'] - 1 + decreases
+        stats['peak_heap_size'] = max(peak_size, len(priority_queue))
+    return dist, pred
+
+
+def dijkstra_dial(graph, source, target=None, stats=None, progress=None):
+    # Dial's algorithm: same contract as dijkstra_csr for integer weights in
+    # [0, BUCKET_MAX_WEIGHT]. Every queued distance lies within max_weight of the
+    # one being settled, so max_weight + 1 buckets indexed by distance modulo
+    # their count are enough. Entries left behind by an improvement are skipped
+    # when their bucket comes round. Nodes at equal distance settle in bucket
+    # order rather than by id, so ties may pick another equally short path.
+    if graph.min_weight < 0:
+        raise ValueError("The bucket queue needs non-negative weights")
+    if graph.max_weight > BUCKET_MAX_WEIGHT:
+        raise ValueError(f"The bucket queue supports weights up to {BUCKET_MAX_WEIGHT}, not {graph.max_weight}")
+
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = [float('inf')] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    dist[source] = 0
+    num_buckets = graph.max_weight + 1
+    buckets = [[] for _ in range(num_buckets)]
+    buckets[0].append(source)
+    queued = 1
+    current_distance = 0
+    settled = 0
+    pops = 0
+    peak_size = 0
+    found = False
+
+    while queued:
+        bucket = buckets[current_distance % num_buckets]
+        # Zero-weight edges append to this bucket while it is being drained
+        while bucket:
+            if queued > peak_size:
+                peak_size = queued
+            current_node = bucket.pop()
+            queued -= 1
+            pops += 1
+            if dist[current_node] != current_distance:
+                continue
+
+            settled += 1
+            if progress is not None and not settled % PROGRESS_INTERVAL:
+                progress(settled)
+            if current_node == target:
+                found = True
+                break
+
+            for edge in range(offsets[current_node], offsets[current_node + 1]):
+                neighbor = targets[edge]
+                distance = current_distance + weights[edge]
+                if distance < dist[neighbor]:
+                    dist[neighbor] = distance
+                    pred[neighbor] = current_node
+                    buckets[distance % num_buckets].append(neighbor)
+                    queued += 1
+        if found:
+            break
+        current_distance += 1
+
+    if stats is not None:
+        stats['settled'] = settled
+        stats['heap_pops'] = pops
+        stats['heap_pushes'] = pops + queued
+        stats['stale_skips'] = pops - settled
+        stats['relaxations'] = stats['heap_pushes'] - 1
+        stats['peak_heap_size'] = max(peak_size, queued)
+        # Stopping at the target leaves its own bucket scanned but not yet counted
+        stats['buckets_scanned'] = current_distance + 1 if found else current_distance
+    return dist, pred
+
+
+def bidirectional_dijkstra_csr(graph, source, target, stats=None, progress=None):
+    # Searches forward from source and backward over the reverse index, always
+    # expanding the smaller frontier. Stops once the two queue minimums add up
+    # to at least the best source-target distance seen so far.
+    # Returns (distance, path of node ids), or (inf, []) when target is unreachable.
+    inf = float('inf')
+    n = graph.num_nodes
+    reverse = graph.reverse()
+    rows = ((graph.offsets, graph.targets, graph.weights), (reverse.offsets, reverse.targets, reverse.weights))
+    dist = ([inf] * n, [inf] * n)
+    pred = ([-1] * n, [-1] * n)
+    visited = (bytearray(n), bytearray(n))
+    queues = ([(0, source)], [(0, target)])
+    dist[0][source] = 0
+    dist[1][target] = 0
+    best, meeting = (0, source) if source == target else (inf, -1)
+    settled = 0
+    pops = 0
+
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        current_distance, current_node = heapq.heappop(queues[side])
+        pops += 1
+        if visited[side][current_node]:
+            continue
+
+        visited[side][current_node] = 1
+        settled += 1
+        if progress is not None and not settled % PROGRESS_INTERVAL:
+            progress(settled)
+
+        offsets, targets, weights = rows[side]
+        side_dist, side_pred, other_dist = dist[side], pred[side], dist[1 - side]
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < side_dist[neighbor]:
+                side_dist[neighbor] = distance
+                side_pred[neighbor] = current_node
+                heapq.heappush(queues[side], (distance, neighbor))
+                if distance + other_dist[neighbor] < best:
+                    best = distance + other_dist[neighbor]
+                    meeting = neighbor
+
+    if stats is not None:
+        stats['settled'] = settled
+        stats['heap_pops'] = pops
+        stats['heap_pushes'] = pops + len(queues[0]) + len(queues[1])
+        stats['stale_skips'] = pops - settled
+        stats['relaxations'] = stats['heap_pushes'] - 2
+    if meeting < 0:
+        return inf, []
+
+    # The backward search's predecessors lead from the meeting node to the target
+    path = predecessor_path(pred[0], source, meeting) + predecessor_path(pred[1], target, meeting)[-2::-1]
+    return best, path
+
+
+def dijkstra_targets(graph, source, targets, nearest=None, stats=None, progress=None):
+    # One-to-many dijkstra_csr: stops as soon as every id in targets is settled,
+    # or once the nearest `nearest` of them are. Returns (dist, pred, found) where
+    # found lists (target, distance) in the order they were settled, nearest
+    # first; targets it never reached are left out. Only reads the CSR arrays,
+    # so it runs on batch.SharedGraph as well.
+    offsets, weights = graph.offsets, graph.weights
+    edge_targets = graph.targets
+    dist = [float('inf')] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    visited = bytearray(graph.num_nodes)
+    wanted = bytearray(graph.num_nodes)
+    for target in targets:
+        wanted[target] = 1
+    remaining = sum(wanted)
+    if nearest is not None:
+        remaining = min(remaining, nearest)
+    found = []
+    dist[source] = 0
+    priority_queue = [(0, source)]
+    settled = 0
+    pops = 0
+
+    while priority_queue and remaining > 0:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        pops += 1
+        if visited[current_node]:
+            continue
+
+        visited[current_node] = 1
+        settled += 1
+        if progress is not None and not settled % PROGRESS_INTERVAL:
+            progress(settled)
+        if wanted[current_node]:
+            found.append((current_node, current_distance))
+            remaining -= 1
+            if not remaining:
+                break
+
+        for edge in range(offsets[current_node], offsets[current_node + 1]):
+            neighbor = edge_targets[edge]
+            distance = current_distance + weights[edge]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                pred[neighbor] = current_node
                 heapq.heappush(priority_queue, (distance, neighbor))
 
+    if stats is not None:
+        stats['settled'] = settled
+        stats['heap_pops'] = pops
+        stats['heap_pushes'] = pops + len(priority_queue)
+        stats['stale_skips'] = pops - settled
+        stats['targets_found'] = len(found)
+    return dist, pred, found
+
+
+def dijkstra(graph, start, end=None, stats=None, queue="binary", progress=None):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+
+    target = graph.node_id(end) if end is not None else None
+    dist, pred = dijkstra_csr(graph, graph.node_id(start), target, stats, queue, progress)
+    # Map ids back to labels so reconstruct_path sees {node: (previous, distance)}
+    return graph.to_shortest_paths(dist, pred)
+
+
+def bidirectional_dijkstra(graph, start, end, stats=None, progress=None):
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+
+    _, path = bidirectional_dijkstra_csr(graph, graph.node_id(start), graph.node_id(end), stats, progress)
+    # Only the nodes on the path get entries, which is all reconstruct_path needs
+    shortest_paths = {}
+    previous, distance = None, 0
+    for node in path:
+        if previous is not None:
+            distance += graph.edge_weight(previous, node)
+        shortest_paths[graph.label(node)] = (graph.label(previous) if previous is not None else None, distance)
+        previous = node
     return shortest_paths
 
 
+def nearest_targets(graph, start, ends, nearest=None, stats=None, progress=None, tree=None):
+    """
+    Distances and paths from ``start`` to several labels at once.
+
+    The search stops as soon as every reachable label in ``ends`` is settled,
+    or once the ``nearest`` closest of them are. Labels the reachability index
+    rules out are dropped first, so they never force a full search, and a
+    cached ``ShortestPathTree`` for ``start`` answers without searching.
+
+    Args:
+        graph (CSRGraph): The graph; weights must be non-negative.
+        start: Source label.
+        ends (list): Target labels.
+        nearest (int): Only return this many, the closest ones.
+        stats (dict): Receives the solver's counters when given.
+        progress (callable): Passed on to ``dijkstra_targets``.
+        tree (ShortestPathTree): Solved tree for ``start``, when there is one.
+
+    Returns:
+        list: ``(label, distance, path)`` tuples, nearest first; unreachable
+        labels are left out.
+    """
+    if tree is not None:
+        found = sorted(((tree[end][1], end) for end in dict.fromkeys(ends) if end in tree), key=lambda item: item[0])
+        return [(end, distance, reconstruct_path(tree, start, end)) for distance, end in found[:nearest]]
+
+    index = get_reachability(graph)
+    source = graph.node_id(start)
+    targets = [target for target in (graph.node_id(end) for end in ends) if index.reachable(source, target)]
+    _, pred, found = dijkstra_targets(graph, source, targets, nearest, stats, progress)
+    return [(graph.label(target), distance, graph.path_labels(predecessor_path(pred, source, target)))
+            for target, distance in found]
+
+
 def reconstruct_path(shortest_paths, start, end):
     path = []
     current_node = end
@@ -81,19 +402,67 @@ def reconstruct_path(shortest_paths, start, end):
     else:
         return []
 
-def process_graph(file_path, start_node, end_node):
+def process_graph(file_path, start_node, end_node, graph=None, mode="full", heuristic=None, stats=None, queue="binary", progress=None):
+    # mode: "full" solves (and caches) the whole tree, "early" stops once end_node
+    # is settled, "bidirectional" meets in the middle from both ends, "astar" is
+    # guided by heuristic(node, end_node) or, when that is None, by ALT landmarks.
+    # queue picks the priority queue (see QUEUE_BACKENDS) for "full" and "early";
+    # progress(settled) is passed on to the solver.
+    # stats, when given, receives the solver's counters and whether the cache answered.
+    # Targets in no component reachable from start_node are answered without a
+    # search, and the point-to-point modes only search the components on some
+    # path between the two nodes.
     if not os.path.isfile(file_path):
         print(f"File not found: {file_path}")
         return None, None, None
     
-    graph, num_nodes, num_edges = read_graph_from_file(file_path)
+    # Callers that already loaded the file pass the graph in to skip reloading it
+    if graph is None:
+        graph, num_nodes, num_edges = read_graph_from_file(file_path)
     
     if start_node not in graph or end_node not in graph:
         print(f"Start node ({start_node}) or end node ({end_node}) not in graph.")
         return None, None, None  # Return None when nodes are not in the graph
 
+    # Components and their reachability index are built once per loaded graph
+    index = get_reachability(graph)
+    source_id, target_id = graph.node_id(start_node), graph.node_id(end_node)
+
     start_time = time.perf_counter()  # Start measuring time
-    shortest_paths = dijkstra(graph, start_node)
+    if stats is not None:
+        stats['components'] = index.num_components
+    if not index.reachable(source_id, target_id):
+        if stats is not None:
+            stats['unreachable'] = True
+        print(f"No path found from {start_node} to {end_node}")
+        return None, None, (time.perf_counter() - start_time) * 1000
+
+    # Reuse the whole shortest-path tree when this source was already solved on this file version
+    fingerprint = graph_fingerprint(file_path)
+    shortest_paths = shortest_path_cache.get(fingerprint, start_node)
+    if stats is not None:
+        stats['cache_hit'] = shortest_paths is not None
+    if shortest_paths is None and mode in ("early", "bidirectional", "astar"):
+        # Nodes outside the relevant components cannot be on the path; the
+        # index returns None when they are too few to be worth cutting away
+        search_graph = index.relevant_subgraph(source_id, target_id) or graph
+        if stats is not None:
+            stats['searched_nodes'] = search_graph.num_nodes
+        if mode == "astar" and heuristic is None and search_graph is not graph:
+            # Landmark bounds from the whole graph stay admissible on a subgraph
+            bound = get_landmarks(graph).heuristic(target_id)
+            heuristic = lambda node, end: bound(graph.index[node])
+
+        if mode == "early":
+            shortest_paths = dijkstra(search_graph, start_node, end_node, stats, queue, progress)
+        elif mode == "bidirectional":
+            shortest_paths = bidirectional_dijkstra(search_graph, start_node, end_node, stats, progress)
+        else:
+            shortest_paths = astar(search_graph, start_node, end_node, heuristic, stats, progress)
+    elif shortest_paths is None:
+        dist, pred = dijkstra_csr(graph, source_id, stats=stats, queue=queue, progress=progress)
+        shortest_paths = ShortestPathTree(graph, start_node, dist, pred)
+        shortest_path_cache.put(fingerprint, start_node, shortest_paths)
     end_time = time.perf_counter()  # End measuring time
 
     execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
@@ -106,130 +475,19 @@ def process_graph(file_path, start_node, end_node):
         return None, None, execution_time  # Return None for no path found
 
 
-class GraphApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Graph Shortest Path Finder")
-
-        # Create a frame for the input section
-        input_frame = tk.Frame(root)
-        input_frame.pack(pady=10)
-
-        # Load graph file button
-        self.load_button = tk.Button(input_frame, text="Load Graph File", command=self.load_file)
-        self.load_button.grid(row=0, column=4, padx=5)
-
-        # Start node input field
-        self.start_label = tk.Label(input_frame, text="Start Node:")
-        self.start_label.grid(row=0, column=0, padx=5)
-        self.start_entry = tk.Entry(input_frame)
-        self.start_entry.grid(row=0, column=1, padx=5)
-
-        # End node input field
-        self.end_label = tk.Label(input_frame, text="End Node:")
-        self.end_label.grid(row=0, column=2, padx=5)
-        self.end_entry = tk.Entry(input_frame)
-        self.end_entry.grid(row=0, column=3, padx=5)
-
-        # Find shortest path button
-        self.find_button = tk.Button(input_frame, text="Find Shortest Path", command=self.find_shortest_path)
-        self.find_button.grid(row=0, column=5, padx=5)
-
-        # Result label for displaying the shortest path and execution time
-        self.result_label = tk.Label(root, text="Find Shortest Path\nExecution time: 0.0 ms")
-        self.result_label.pack(pady=10)
-
-        # Create a canvas for the graph
-        self.canvas_frame = tk.Frame(root)
-        self.canvas_frame.pack(fill=tk.BOTH, expand=True)
-        self.canvas = tk.Canvas(self.canvas_frame, height=1)
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-
-        self.graph_file = None
-
-    def load_file(self):
-        self.graph_file = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
-        if self.graph_file:
-            messagebox.showinfo("File Loaded", f"Graph file loaded: {self.graph_file}")
-
-    def find_shortest_path(self):
-        start_node = self.start_entry.get()
-        end_node = self.end_entry.get()
-
-        if not self.graph_file or not start_node or not end_node:
-            messagebox.showerror("Input Error", "Please load a graph file and specify start and end nodes.")
-            return
-
-        # Read the graph from the file
-        graph, num_nodes, num_edges = read_graph_from_file(self.graph_file)
-
-        # Check if the start and end nodes exist in the graph
-        if start_node not in graph:
-            messagebox.showerror("Node Error", f"Start node '{start_node}' does not exist in the graph.")
-            return
-        if end_node not in graph:
-            messagebox.showerror("Node Error", f"End node '{end_node}' does not exist in the graph.")
-            return
-
-        # Process the graph if both nodes exist
-        path, distance, execution_time = process_graph(self.graph_file, start_node, end_node)
-
-        if path is None:
-            self.result_label.config(text=f"No path found.\nExecution time: {execution_time:.6f} ms")
-            log_execution_details(self.graph_file, start_node, num_nodes, num_edges, execution_time)
-        else:
-            path_str = " -> ".join(path)
-            self.result_label.config(text=f"Shortest Path: {path_str}\nDistance: {distance}\nExecution time: {execution_time:.6f} ms")
-            self.display_graph(path)
-
-            # Log the details including the end node and path
-            log_execution_details(self.graph_file, start_node, num_nodes, num_edges, execution_time, end_node, path_str)
-
-
-
-    def display_graph(self, path=None):
-        # Clear the previous graph from the canvas (ensures no overlapping content)
-        self.canvas.delete("all")  # Clears everything on the canvas
-        
-        # Clear the current matplotlib figure before creating a new one
-        plt.clf()  # Clears the current figure
-        
-        # Read the graph from the file
-        graph, _, _ = read_graph_from_file(self.graph_file)
-
-        # Create a NetworkX graph
-        G = nx.DiGraph()
-        for node, neighbors in graph.items():
-            for neighbor, weight in neighbors.items():
-                G.add_edge(node, neighbor, weight=weight)
-
-        # Use Kamada-Kawai layout for better spacing
-        pos = nx.kamada_kawai_layout(G)
-
-        # Draw the graph
-        nx.draw(G, pos, with_labels=True, node_size=400, node_color='lavender', font_size=6, font_weight='bold', width=1)
-
-        if path:
-            edges_in_path = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-            nx.draw_networkx_edges(G, pos, edgelist=edges_in_path, edge_color='purple', width=3, arrows=True)
-
-        # Draw edge labels
-        edge_labels = nx.get_edge_attributes(G, 'weight')
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8)
-
-        # Embed the plot into the canvas
-        self.fig = plt.gcf()  # Get the current figure (matplotlib figure)
-
-        # Check if the canvas widget exists and destroy the old one before creating a new one
-        if hasattr(self, 'canvas_widget'):
-            self.canvas_widget.get_tk_widget().destroy()  # Destroy the old canvas widget
+# The GUI lives in dijkstra_gui.py and drawing in graph_layout.py, so that solving
+# never loads Tk, matplotlib or networkx; these names keep resolving from here,
+# imported on first use
+def __getattr__(name):
+    if name == "GraphApp":
+        from dijkstra_gui import GraphApp
+        return GraphApp
+    if name == "layout_graph":
+        from graph_layout import layout_graph
+        return layout_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-        # Create a new FigureCanvasTkAgg widget
-        self.canvas_widget = FigureCanvasTkAgg(self.fig, master=self.canvas_frame)
-        self.canvas_widget.draw()
-        self.canvas_widget.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = GraphApp(root)
-    root.mainloop()
+    from dijkstra_gui import main
+    main()
@@ -0,0 +1,469 @@
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from astar import coordinate_heuristic, read_coordinates
+from background import BackgroundTask, Cancelled
+from dijkstra import (QUEUE_BACKENDS, SEARCH_MODES, log_execution_details, nearest_targets, process_graph,
+                      read_graph_from_file, shortest_path_cache)
+from dynamic_sssp import DynamicShortestPaths, read_diff
+from graph_layout import VIEW_MODES, draw_path, draw_view, get_layout, layout_graph, view_nodes
+from graph_loader import graph_fingerprint
+from k_shortest import k_shortest_paths
+from reachability import get_reachability
+from telemetry import telemetry
+
+# Queries offered by the GUI: one shortest path, the K shortest loopless paths
+# to the end node, or the K nearest of several end nodes (all of them when K is blank)
+QUERY_TYPES = ("shortest path", "k shortest paths", "nearest targets")
+
+# Results listed in the result label; longer lists are cut short
+RESULT_LINES = 10
+
+
+class GraphApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Graph Shortest Path Finder")
+
+        # Create a frame for the input section
+        input_frame = tk.Frame(root)
+        input_frame.pack(pady=10)
+
+        # Load graph file button
+        self.load_button = tk.Button(input_frame, text="Load Graph File", command=self.load_file)
+        self.load_button.grid(row=0, column=4, padx=5)
+
+        # Start node input field
+        self.start_label = tk.Label(input_frame, text="Start Node:")
+        self.start_label.grid(row=0, column=0, padx=5)
+        self.start_entry = tk.Entry(input_frame)
+        self.start_entry.grid(row=0, column=1, padx=5)
+
+        # End node input field
+        self.end_label = tk.Label(input_frame, text="End Node:")
+        self.end_label.grid(row=0, column=2, padx=5)
+        self.end_entry = tk.Entry(input_frame)
+        self.end_entry.grid(row=0, column=3, padx=5)
+
+        # Find shortest path button
+        self.find_button = tk.Button(input_frame, text="Find Shortest Path", command=self.find_shortest_path)
+        self.find_button.grid(row=0, column=5, padx=5)
+
+        # Search mode selector
+        self.mode_label = tk.Label(input_frame, text="Mode:")
+        self.mode_label.grid(row=1, column=0, padx=5)
+        self.mode_var = tk.StringVar(value=SEARCH_MODES[0])
+        self.mode_menu = tk.OptionMenu(input_frame, self.mode_var, *SEARCH_MODES)
+        self.mode_menu.grid(row=1, column=1, padx=5, sticky="w")
+
+        # Optional node coordinates for the A* heuristic
+        self.coords_button = tk.Button(input_frame, text="Load Coordinates", command=self.load_coordinates)
+        self.coords_button.grid(row=1, column=2, padx=5)
+        self.metric_var = tk.StringVar(value="euclidean")
+        self.metric_menu = tk.OptionMenu(input_frame, self.metric_var, "euclidean", "manhattan")
+        self.metric_menu.grid(row=1, column=3, padx=5, sticky="w")
+
+        # Edge changes applied to the start node's tree without a full rerun
+        self.diff_button = tk.Button(input_frame, text="Apply Edge Diff", command=self.apply_diff)
+        self.diff_button.grid(row=0, column=6, padx=5)
+
+        # Priority queue used by the Dijkstra modes
+        self.queue_label = tk.Label(input_frame, text="Queue:")
+        self.queue_label.grid(row=1, column=4, padx=5)
+        self.queue_var = tk.StringVar(value=QUEUE_BACKENDS[0])
+        self.queue_menu = tk.OptionMenu(input_frame, self.queue_var, *QUEUE_BACKENDS)
+        self.queue_menu.grid(row=1, column=5, padx=5, sticky="w")
+
+        # Abandons the query running in the background
+        self.cancel_button = tk.Button(input_frame, text="Cancel", command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_button.grid(row=1, column=6, padx=5)
+
+        # Whole graph or only the path's neighbourhood, and its radius in hops
+        self.view_label = tk.Label(input_frame, text="View:")
+        self.view_label.grid(row=2, column=0, padx=5)
+        self.view_var = tk.StringVar(value=VIEW_MODES[0])
+        self.view_menu = tk.OptionMenu(input_frame, self.view_var, *VIEW_MODES)
+        self.view_menu.grid(row=2, column=1, padx=5, sticky="w")
+        self.hops_label = tk.Label(input_frame, text="Hops:")
+        self.hops_label.grid(row=2, column=2, padx=5)
+        self.hops_entry = tk.Entry(input_frame, width=5)
+        self.hops_entry.insert(0, "1")
+        self.hops_entry.grid(row=2, column=3, padx=5, sticky="w")
+
+        # Query type and its K; "nearest targets" takes several end nodes
+        self.query_label = tk.Label(input_frame, text="Query:")
+        self.query_label.grid(row=2, column=4, padx=5)
+        self.query_var = tk.StringVar(value=QUERY_TYPES[0])
+        self.query_menu = tk.OptionMenu(input_frame, self.query_var, *QUERY_TYPES)
+        self.query_menu.grid(row=2, column=5, padx=5, sticky="w")
+        self.k_label = tk.Label(input_frame, text="K:")
+        self.k_label.grid(row=3, column=0, padx=5)
+        self.k_entry = tk.Entry(input_frame, width=5)
+        self.k_entry.insert(0, "3")
+        self.k_entry.grid(row=3, column=1, padx=5, sticky="w")
+
+        # Result label for displaying the shortest path and execution time
+        self.result_label = tk.Label(root, text="Find Shortest Path\nExecution time: 0.0 ms")
+        self.result_label.pack(pady=10)
+
+        # Progress of the background query
+        self.status_label = tk.Label(root, text="")
+        self.status_label.pack()
+
+        # Create a canvas for the graph
+        self.canvas_frame = tk.Frame(root)
+        self.canvas_frame.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(self.canvas_frame, height=1)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+
+        self.graph_file = None
+        self.coordinates = None
+        self.dynamic = None
+        self.task = None
+
+        # What the canvas shows: (graph file version, drawn nodes), so a new
+        # path over the same view only restyles the highlighted edges
+        self.drawn_key = None
+        self.drawn_graph = None
+        self.drawn_pos = None
+        self.highlight = []
+
+    def load_file(self):
+        self.graph_file = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        self.dynamic = None
+        if self.graph_file:
+            messagebox.showinfo("File Loaded", f"Graph file loaded: {self.graph_file}")
+
+    def load_coordinates(self):
+        coords_file = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        if coords_file:
+            self.coordinates = read_coordinates(coords_file)
+            messagebox.showinfo("File Loaded", f"Coordinates loaded for {len(self.coordinates)} nodes.")
+
+    def run_task(self, work, on_done):
+        # Runs work(task) on a worker thread with the query buttons disabled;
+        # on_done(result) and any error come back on the Tk thread
+        if self.task is not None:
+            return
+        for button in (self.find_button, self.diff_button, self.load_button):
+            button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+        def finish(message):
+            self.task = None
+            for button in (self.find_button, self.diff_button, self.load_button):
+                button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_label.config(text=message)
+
+        def done(result):
+            finish("")
+            on_done(result)
+
+        def failed(error):
+            if isinstance(error, Cancelled):
+                finish("Query cancelled.")
+            else:
+                finish("")
+                messagebox.showerror("Error", str(error))
+
+        self.task = BackgroundTask(self.root, work, done, failed, lambda message: self.status_label.config(text=message))
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.status_label.config(text="Cancelling...")
+
+    def view_options(self):
+        hops = int(self.hops_entry.get() or 1)
+        if hops < 0:
+            raise ValueError(f"Negative hop count: {hops}")
+        return self.view_var.get(), hops
+
+    def query_options(self, end_text):
+        # (query, end nodes, K); end nodes are split on commas and whitespace
+        query = self.query_var.get()
+        if query == QUERY_TYPES[0]:
+            return query, [end_text], None
+        end_nodes = end_text.replace(",", " ").split()
+        k_text = self.k_entry.get().strip()
+        count = int(k_text) if k_text.isdigit() else None
+        if k_text and not count:
+            raise ValueError("K must be a positive integer.")
+        if query == "k shortest paths" and (count is None or len(end_nodes) != 1):
+            raise ValueError("K shortest paths needs a K and exactly one end node.")
+        return query, end_nodes, count
+
+    def apply_diff(self):
+        start_node = self.start_entry.get()
+        if not self.graph_file or not start_node:
+            messagebox.showerror("Input Error", "Please load a graph file and specify a start node.")
+            return
+        diff_file = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        if not diff_file:
+            return
+        graph_file = self.graph_file
+        # Later diffs keep editing the same tree as long as the start node is unchanged
+        dynamic = self.dynamic if self.dynamic is not None and self.dynamic.source_label == start_node else None
+
+        # Edits a private tree; self.dynamic is only replaced on the UI thread
+        def work(task):
+            if dynamic is None:
+                task.report("Loading graph...")
+                graph, _, _ = read_graph_from_file(graph_file)
+                if start_node not in graph:
+                    raise ValueError(f"Start node '{start_node}' does not exist in the graph.")
+                task.report("Solving the start node's tree...")
+                tree = DynamicShortestPaths(graph, start_node)
+            else:
+                tree = dynamic.copy()
+
+            task.report("Applying edge changes...")
+            start_time = time.perf_counter()
+            applied = tree.apply_diff(read_diff(diff_file))
+            return tree, applied, (time.perf_counter() - start_time) * 1000
+
+        def done(result):
+            tree, applied, execution_time = result
+            self.dynamic = tree
+            messagebox.showinfo("Diff Applied", f"Applied {applied} edge change(s) in {execution_time:.6f} ms; "
+                                                f"{tree.repaired} node(s) re-settled.")
+
+        self.run_task(work, done)
+
+    def find_dynamic_path(self, start_node, end_node):
+        # Answers from the tree the applied diffs keep up to date
+        dynamic = self.dynamic
+        view, hops = self.view_options()
+
+        def work(task):
+            if end_node not in dynamic:
+                raise ValueError(f"End node '{end_node}' does not exist in the graph.")
+            start_time = time.perf_counter()
+            path = dynamic.path(end_node)
+            execution_time = (time.perf_counter() - start_time) * 1000
+            layout = None
+            if path:
+                # The edited graph matches no file, so its layout is not cached
+                task.report("Computing layout...")
+                graph = dynamic.to_graph()
+                layout = (None,) + layout_graph(graph, nodes=view_nodes(graph, path, view, hops))
+            return path, execution_time, layout
+
+        def done(result):
+            path, execution_time, layout = result
+            if not path:
+                self.result_label.config(text=f"No path found.\nExecution time: {execution_time:.6f} ms")
+                return
+            path_str = " -> ".join(path)
+            self.result_label.config(text=f"Shortest Path: {path_str}\nDistance: {dynamic.distance(end_node)}\nExecution time: {execution_time:.6f} ms")
+            self.display_graph(path, layout=layout)
+
+        self.run_task(work, done)
+
+    def find_shortest_path(self):
+        start_node = self.start_entry.get()
+        end_node = self.end_entry.get()
+
+        if not self.graph_file or not start_node or not end_node:
+            messagebox.showerror("Input Error", "Please load a graph file and specify start and end nodes.")
+            return
+
+        try:
+            self.view_options()
+        except ValueError:
+            messagebox.showerror("Input Error", "Hops must be a non-negative integer.")
+            return
+        try:
+            query, end_nodes, count = self.query_options(end_node)
+        except ValueError as error:
+            messagebox.showerror("Input Error", str(error))
+            return
+        if query != QUERY_TYPES[0]:
+            self.find_many_paths(start_node, end_nodes, query, count)
+            return
+
+        # After edge diffs the file no longer matches the graph being queried
+        if self.dynamic is not None and self.dynamic.source_label == start_node:
+            self.find_dynamic_path(start_node, end_node)
+            return
+
+        # A* uses the loaded coordinates when there are any, ALT landmarks otherwise
+        heuristic = None
+        if self.coordinates:
+            heuristic = coordinate_heuristic(self.coordinates, self.metric_var.get())
+        graph_file = self.graph_file
+        mode = self.mode_var.get()
+        queue = self.queue_var.get()
+        view, hops = self.view_options()
+        drawn_key = self.drawn_key
+
+        # Runs on the worker thread: load, solve and lay out, but never touch Tk
+        def work(task):
+            task.report("Loading graph...")
+            load_start = time.perf_counter()
+            graph, num_nodes, num_edges = read_graph_from_file(graph_file)
+            load_time = (time.perf_counter() - load_start) * 1000
+
+            # Check if the start and end nodes exist in the graph
+            if start_node not in graph:
+                raise ValueError(f"Start node '{start_node}' does not exist in the graph.")
+            if end_node not in graph:
+                raise ValueError(f"End node '{end_node}' does not exist in the graph.")
+
+            task.report("Indexing components...")
+            get_reachability(graph)
+
+            stats = telemetry.stats()
+            task.report("Searching...")
+            path, distance, execution_time = process_graph(graph_file, start_node, end_node, graph, mode, heuristic, stats, queue,
+                                                           lambda settled: task.report(f"Settled {settled} nodes..."))
+            layout = None
+            if path is not None:
+                # Positions come from the layout cache; when the same nodes are
+                # already on the canvas only the path needs redrawing
+                task.report("Computing layout...")
+                nodes = view_nodes(graph, path, view, hops)
+                key = (graph_fingerprint(graph_file), nodes)
+                if key == drawn_key:
+                    layout = (key, None, None)
+                else:
+                    layout = (key,) + layout_graph(graph, get_layout(graph_file, graph), nodes)
+            metrics = dict(stats or {}, mode=mode, queue=queue, load_ms=load_time)
+            return num_nodes, num_edges, path, distance, execution_time, layout, metrics
+
+        def done(result):
+            num_nodes, num_edges, path, distance, execution_time, layout, metrics = result
+            if path is None:
+                self.result_label.config(text=f"No path found.\nExecution time: {execution_time:.6f} ms")
+                log_execution_details(graph_file, start_node, num_nodes, num_edges, execution_time, end_node, **metrics)
+            else:
+                path_str = " -> ".join(path)
+                self.result_label.config(text=f"Shortest Path: {path_str}\nDistance: {distance}\nExecution time: {execution_time:.6f} ms")
+                self.display_graph(path, layout=layout)
+
+                # Log the details including the end node and path
+                log_execution_details(graph_file, start_node, num_nodes, num_edges, execution_time, end_node, path_str, distance=distance, **metrics)
+
+        self.run_task(work, done)
+
+    def find_many_paths(self, start_node, end_nodes, query, count):
+        # K shortest paths to one end node, or the nearest of several end nodes;
+        # after edge diffs from this start node they run on the edited graph
+        dynamic = self.dynamic if self.dynamic is not None and self.dynamic.source_label == start_node else None
+        graph_file = self.graph_file
+        view, hops = self.view_options()
+        drawn_key = self.drawn_key
+
+        def work(task):
+            task.report("Loading graph...")
+            load_start = time.perf_counter()
+            if dynamic is not None:
+                graph = dynamic.to_graph()
+            else:
+                graph, _, _ = read_graph_from_file(graph_file)
+            load_time = (time.perf_counter() - load_start) * 1000
+            for node in [start_node] + end_nodes:
+                if node not in graph:
+                    raise ValueError(f"Node '{node}' does not exist in the graph.")
+
+            stats = telemetry.stats()
+            task.report("Searching...")
+            start_time = time.perf_counter()
+            if query == "k shortest paths":
+                paths = k_shortest_paths(graph, start_node, end_nodes[0], count, stats,
+                                         lambda found: task.report(f"Found {found} paths..."))
+                results = [(end_nodes[0], distance, path) for distance, path in paths]
+            else:
+                # A tree cached by an earlier "full" query answers every target at once
+                tree = shortest_path_cache.get(graph_fingerprint(graph_file), start_node) if dynamic is None else None
+                results = nearest_targets(graph, start_node, end_nodes, count, stats,
+                                          lambda settled: task.report(f"Settled {settled} nodes..."), tree)
+            execution_time = (time.perf_counter() - start_time) * 1000
+
+            layout = None
+            if results:
+                task.report("Computing layout...")
+                nodes = view_nodes(graph, [node for _, _, path in results for node in path], view, hops)
+                if dynamic is not None:
+                    layout = (None,) + layout_graph(graph, nodes=nodes)
+                else:
+                    key = (graph_fingerprint(graph_file), nodes)
+                    if key == drawn_key:
+                        layout = (key, None, None)
+                    else:
+                        layout = (key,) + layout_graph(graph, get_layout(graph_file, graph), nodes)
+            metrics = dict(stats or {}, query=query, k=count, results=len(results), load_ms=load_time)
+            return graph.num_nodes, graph.num_edges, results, execution_time, layout, metrics
+
+        def done(result):
+            num_nodes, num_edges, results, execution_time, layout, metrics = result
+            end_text = " ".join(end_nodes)
+            if not results:
+                self.result_label.config(text=f"No path found.\nExecution time: {execution_time:.6f} ms")
+                log_execution_details(graph_file, start_node, num_nodes, num_edges, execution_time, end_text, **metrics)
+                return
+
+            lines = [f"{rank}. {end} ({distance}): {' -> '.join(path)}"
+                     for rank, (end, distance, path) in enumerate(results[:RESULT_LINES], 1)]
+            if len(results) > RESULT_LINES:
+                lines.append(f"... and {len(results) - RESULT_LINES} more")
+            self.result_label.config(text="\n".join(lines) + f"\nExecution time: {execution_time:.6f} ms")
+            # The best path is highlighted; the view covers all of them
+            best = results[0][2]
+            self.display_graph(best, layout=layout)
+            log_execution_details(graph_file, start_node, num_nodes, num_edges, execution_time, end_text,
+                                  " -> ".join(best), distance=results[0][1], **metrics)
+
+        self.run_task(work, done)
+
+    def display_graph(self, path=None, graph=None, layout=None):
+        # layout is (key, G, pos); G is None when the view for key is already drawn
+        if layout is None:
+            if graph is None:
+                graph, _, _ = read_graph_from_file(self.graph_file)
+            layout = (None,) + layout_graph(graph, get_layout(self.graph_file, graph))
+        key, G, pos = layout
+        edges_in_path = [(path[i], path[i + 1]) for i in range(len(path) - 1)] if path else []
+
+        if G is None:
+            # Same nodes on screen: swap the highlighted edges and repaint
+            for artist in self.highlight:
+                artist.remove()
+            self.highlight = draw_path(self.fig.gca(), self.drawn_graph, self.drawn_pos, edges_in_path)
+            self.canvas_widget.draw_idle()
+            return
+
+        # Clear the previous graph from the canvas (ensures no overlapping content)
+        self.canvas.delete("all")  # Clears everything on the canvas
+        
+        # Clear the current matplotlib figure before creating a new one
+        plt.clf()  # Clears the current figure
+
+        draw_view(plt.gca(), G, pos)
+        self.highlight = draw_path(plt.gca(), G, pos, edges_in_path)
+        self.drawn_key, self.drawn_graph, self.drawn_pos = key, G, pos
+
+        # Embed the plot into the canvas
+        self.fig = plt.gcf()  # Get the current figure (matplotlib figure)
+
+        # Check if the canvas widget exists and destroy the old one before creating a new one
+        if hasattr(self, 'canvas_widget'):
+            self.canvas_widget.get_tk_widget().destroy()  # Destroy the old canvas widget
+
+        # Create a new FigureCanvasTkAgg widget
+        self.canvas_widget = FigureCanvasTkAgg(self.fig, master=self.canvas_frame)
+        self.canvas_widget.draw()
+        self.canvas_widget.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+
+def main():
+    root = tk.Tk()
+    app = GraphApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+import heapq
+import sys
+import time
+from array import array
+from csr_graph import CSRGraph, INDEX_TYPE, predecessor_path
+
+
+class DynamicShortestPaths:
+    """
+    Shortest-path tree from one source, repaired in place as edges change.
+
+    Follows Ramalingam and Reps: a cheaper or new edge ``u -> v`` only
+    improves the nodes reachable through ``v``, so a Dijkstra search seeded at
+    ``v`` fixes them. A dearer or removed edge only matters when it is the
+    tree edge into ``v``; then just the subtree hanging below it is reset and
+    re-solved from the unaffected nodes around it. Distances always equal a
+    full rerun on the edited graph; between equally short paths the
+    predecessors may differ.
+
+    Args:
+        graph (CSRGraph): Starting graph with non-negative weights.
+        source (str): Label of the source node.
+    """
+
+    def __init__(self, graph, source):
+        from dijkstra import dijkstra_csr
+
+        if graph.min_weight < 0:
+            raise ValueError("Dynamic shortest paths need non-negative weights")
+        self.labels = list(graph.labels)
+        self.index = dict(graph.index)
+        self.out_edges = [{} for _ in range(graph.num_nodes)]
+        self.in_edges = [{} for _ in range(graph.num_nodes)]
+        for u, v, weight in graph.edges():
+            self.out_edges[u][v] = weight
+            self.in_edges[v][u] = weight
+        self.source_label = source
+        self.source = graph.node_id(source)
+        self.dist, self.pred = dijkstra_csr(graph, self.source)
+        # Nodes settled while repairing after the most recent change
+        self.repaired = 0
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def copy(self):
+        """
+        Returns an independent tree in the same state, so changes can be
+        applied to it while this one stays readable.
+        """
+        other = object.__new__(DynamicShortestPaths)
+        other.labels = list(self.labels)
+        other.index = dict(self.index)
+        other.out_edges = [dict(edges) for edges in self.out_edges]
+        other.in_edges = [dict(edges) for edges in self.in_edges]
+        other.source_label = self.source_label
+        other.source = self.source
+        other.dist = list(self.dist)
+        other.pred = list(self.pred)
+        other.repaired = self.repaired
+        return other
+
+    def _node_id(self, label):
+        # Edges may introduce nodes the graph did not have yet
+        node = self.index.get(label)
+        if node is None:
+            node = len(self.labels)
+            self.index[label] = node
+            self.labels.append(label)
+            self.out_edges.append({})
+            self.in_edges.append({})
+            self.dist.append(float('inf'))
+            self.pred.append(-1)
+        return node
+
+    # ----- edge changes -----
+
+    def set_edge(self, start, end, weight):
+        """
+        Inserts the edge ``start -> end``, or changes its weight if it exists.
+        """
+        if weight < 0:
+            raise ValueError(f"Negative weight {weight} on {start} -> {end}")
+        u, v = self._node_id(start), self._node_id(end)
+        old_weight = self.out_edges[u].get(v)
+        self.out_edges[u][v] = weight
+        self.in_edges[v][u] = weight
+        self.repaired = 0
+        if old_weight is None or weight < old_weight:
+            self._decrease(u, v)
+        elif weight > old_weight:
+            self._increase(u, v)
+
+    def reweight_edge(self, start, end, weight):
+        """
+        Changes the weight of an existing edge.
+
+        Raises:
+            KeyError: If there is no such edge.
+        """
+        if self.index.get(end) not in self.out_edges[self.index[start]]:
+            raise KeyError((start, end))
+        self.set_edge(start, end, weight)
+
+    def delete_edge(self, start, end):
+        """
+        Removes the edge ``start -> end``.
+
+        Raises:
+            KeyError: If there is no such edge.
+        """
+        u, v = self.index[start], self.index[end]
+        del self.out_edges[u][v]
+        del self.in_edges[v][u]
+        self.repaired = 0
+        self._increase(u, v)
+
+    def apply_diff(self, changes):
+        """
+        Applies ``(op, start, end, weight)`` changes from ``read_diff`` in order.
+        Deletions and reweights of missing edges are reported and skipped.
+
+        Returns:
+            int: Number of changes applied.
+        """
+        applied = 0
+        repaired = 0
+        for op, start, end, weight in changes:
+            try:
+                if op == "+":
+                    self.set_edge(start, end, weight)
+                elif op == "~":
+                    self.reweight_edge(start, end, weight)
+                else:
+                    self.delete_edge(start, end)
+            except KeyError:
+                print(f"Skipping change to missing edge: {op} {start} {end}")
+                continue
+            applied += 1
+            repaired += self.repaired
+        self.repaired = repaired
+        return applied
+
+    def _decrease(self, u, v):
+        distance = self.dist[u] + self.out_edges[u][v]
+        if distance < self.dist[v]:
+            self.dist[v] = distance
+            self.pred[v] = u
+            self._propagate([(distance, v)])
+
+    def _increase(self, u, v):
+        dist, pred = self.dist, self.pred
+        if pred[v] != u:
+            return
+
+        # The subtree below u -> v: nodes whose tree path runs through that edge
+        affected = [v]
+        marked = {v}
+        for node in affected:
+            for child in self.out_edges[node]:
+                if pred[child] == node and child not in marked:
+                    marked.add(child)
+                    affected.append(child)
+
+        inf = float('inf')
+        for node in affected:
+            dist[node] = inf
+            pred[node] = -1
+        # Seed each affected node with its best edge from an unaffected one
+        queue = []
+        for node in affected:
+            for neighbor, weight in self.in_edges[node].items():
+                if neighbor not in marked and dist[neighbor] + weight < dist[node]:
+                    dist[node] = dist[neighbor] + weight
+                    pred[node] = neighbor
+            if dist[node] != inf:
+                queue.append((dist[node], node))
+        heapq.heapify(queue)
+        self._propagate(queue)
+
+    def _propagate(self, queue):
+        # Dijkstra from the given (distance, node) entries over the current edges
+        dist, pred, out_edges = self.dist, self.pred, self.out_edges
+        while queue:
+            current_distance, current_node = heapq.heappop(queue)
+            if current_distance > dist[current_node]:
+                continue
+            self.repaired += 1
+            for neighbor, weight in out_edges[current_node].items():
+                distance = current_distance + weight
+                if distance < dist[neighbor]:
+                    dist[neighbor] = distance
+                    pred[neighbor] = current_node
+                    heapq.heappush(queue, (distance, neighbor))
+
+    # ----- queries -----
+
+    def distance(self, label):
+        """
+        Returns the shortest distance to ``label``, or ``float('inf')``.
+        """
+        return self.dist[self.index[label]]
+
+    def path(self, label):
+        """
+        Returns the shortest path to ``label`` as a list of labels, or [].
+        """
+        node = self.index[label]
+        if self.dist[node] == float('inf'):
+            return []
+        return [self.labels[v] for v in predecessor_path(self.pred, self.source, node)]
+
+    def shortest_paths(self):
+        """
+        Returns the ``{node: (predecessor, distance)}`` dict ``dijkstra()`` returns.
+        """
+        labels, dist, pred = self.labels, self.dist, self.pred
+        return {
+            labels[v]: (labels[pred[v]] if pred[v] >= 0 else None, dist[v])
+            for v in range(len(labels)) if dist[v] != float('inf')
+        }
+
+    def to_graph(self):
+        """
+        Returns the edited graph as a CSRGraph.
+
+        Its ids follow the sorted labels like every CSRGraph. Nodes added by a
+        diff sit at the end of this tree's ids, so once there are any the two
+        numberings differ; go through the labels to match them up.
+        """
+        labels = sorted(self.labels)
+        index = {label: i for i, label in enumerate(labels)}
+        new_id = [index[label] for label in self.labels]
+        src, dst, weights = array(INDEX_TYPE), array(INDEX_TYPE), array(INDEX_TYPE)
+        for u, edges in enumerate(self.out_edges):
+            for v, weight in edges.items():
+                src.append(new_id[u])
+                dst.append(new_id[v])
+                weights.append(weight)
+        return CSRGraph.from_id_edges(labels, src, dst, weights)
+
+
+def read_diff(file_path):
+    """
+    Reads edge changes, one per line:
+
+        + u v w    insert edge u -> v (or overwrite its weight)
+        ~ u v w    change the weight of the existing edge u -> v
+        - u v      delete edge u -> v
+
+    Returns:
+        list: ``(op, u, v, weight)`` tuples in file order; weight is None for
+        deletions. Malformed lines are skipped.
+    """
+    changes = []
+    with open(file_path, 'r') as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+            try:
+                if parts[0] in ("+", "~") and len(parts) == 4:
+                    changes.append((parts[0], parts[1], parts[2], int(parts[3])))
+                    continue
+                if parts[0] == "-" and len(parts) == 3:
+                    changes.append(("-", parts[1], parts[2], None))
+                    continue
+            except ValueError:
+                pass
+            print(f"Skipping invalid line: {line.strip()}")
+    return changes
+
+
+def main(argv):
+    """
+    Usage:
+        python dynamic_sssp.py <graph file> <diff file> <source>
+
+    Applies the diff incrementally, then checks every distance against a
+    full Dijkstra rerun on the edited graph.
+    """
+    if len(argv) != 3:
+        print(main.__doc__.strip())
+        return
+
+    from dijkstra import dijkstra_csr
+    from graph_loader import load_graph
+
+    graph, _, _ = load_graph(argv[0])
+    tree = DynamicShortestPaths(graph, argv[2])
+    changes = read_diff(argv[1])
+
+    start_time = time.perf_counter()
+    applied = tree.apply_diff(changes)
+    incremental_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    edited = tree.to_graph()
+    dist, _ = dijkstra_csr(edited, edited.node_id(tree.source_label))
+    full_time = time.perf_counter() - start_time
+
+    mismatches = sum(1 for label, distance in zip(edited.labels, dist) if tree.distance(label) != distance)
+    print(f"Applied {applied} of {len(changes)} changes in {incremental_time:.6f} seconds "
+          f"({tree.repaired} nodes re-settled)")
+    print(f"Full rerun took {full_time:.6f} seconds")
+    print("Distances match the full rerun" if not mismatches else f"{mismatches} distances differ from the full rerun")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,206 @@
+import os
+import struct
+from array import array
+import networkx as nx
+from graph_loader import graph_fingerprint
+
+# Layout cache next to the graph file: header, then x, y per node id (float64)
+LAYOUT_SUFFIX = ".layout"
+LAYOUT_MAGIC = b"LAYOUT01"
+LAYOUT_HEADER = struct.Struct("<8s3q")
+
+# Kamada-Kawai up to this many nodes, spring layout up to SPRING_MAX_NODES,
+# spectral layout (near-linear with sparse eigensolvers) beyond that
+KAMADA_KAWAI_MAX_NODES = 200
+SPRING_MAX_NODES = 1000
+
+# Views larger than these are drawn without edge labels, arrows or node labels
+EDGE_LABEL_MAX_EDGES = 200
+ARROW_MAX_EDGES = 1000
+NODE_LABEL_MAX_NODES = 300
+
+# Views offered by the GUI; "auto" shows only the path's neighbourhood on
+# graphs with more than FULL_VIEW_MAX_NODES nodes
+VIEW_MODES = ("auto", "full", "neighborhood")
+FULL_VIEW_MAX_NODES = 300
+
+# Most recent layout per graph file version, shared by every query in this process
+_layouts = {}
+
+
+def layout_path(file_path):
+    return file_path + LAYOUT_SUFFIX
+
+
+def compute_layout(graph):
+    """
+    Positions every node of ``graph``, picking the layout by graph size.
+
+    Returns:
+        dict: ``{label: (x, y)}``.
+    """
+    nx_graph = nx.DiGraph()
+    nx_graph.add_nodes_from(graph.labels)
+    labels = graph.labels
+    nx_graph.add_weighted_edges_from((labels[u], labels[v], w) for u, v, w in graph.edges())
+
+    if graph.num_nodes <= KAMADA_KAWAI_MAX_NODES:
+        # Use Kamada-Kawai layout for better spacing
+        positions = nx.kamada_kawai_layout(nx_graph)
+    elif graph.num_nodes <= SPRING_MAX_NODES:
+        positions = nx.spring_layout(nx_graph, weight=None, seed=42)
+    else:
+        positions = nx.spectral_layout(nx_graph, weight=None)
+    return {label: (float(x), float(y)) for label, (x, y) in positions.items()}
+
+
+def write_layout(file_path, graph, positions):
+    """
+    Saves ``positions`` for this version of ``file_path``. Like the graph
+    sidecar it is written atomically and failures are ignored.
+    """
+    _, size, mtime_ns = graph_fingerprint(file_path)
+    coordinates = array('d')
+    for label in graph.labels:
+        coordinates.extend(positions[label])
+    target = layout_path(file_path)
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as file:
+            file.write(LAYOUT_HEADER.pack(LAYOUT_MAGIC, size, mtime_ns, graph.num_nodes))
+            file.write(coordinates.tobytes())
+        os.replace(temp, target)
+    except OSError:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def read_layout(file_path, graph):
+    """
+    Returns the saved ``{label: (x, y)}`` for ``file_path``, or None when there
+    is none or it belongs to another version of the file.
+    """
+    try:
+        with open(layout_path(file_path), 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < LAYOUT_HEADER.size:
+        return None
+
+    magic, size, mtime_ns, num_nodes = LAYOUT_HEADER.unpack_from(data)
+    _, current_size, current_mtime_ns = graph_fingerprint(file_path)
+    if (magic != LAYOUT_MAGIC or (size, mtime_ns) != (current_size, current_mtime_ns)
+            or num_nodes != graph.num_nodes or len(data) != LAYOUT_HEADER.size + 16 * num_nodes):
+        return None
+
+    coordinates = array('d', data[LAYOUT_HEADER.size:])
+    return {label: (coordinates[2 * i], coordinates[2 * i + 1]) for i, label in enumerate(graph.labels)}
+
+
+def get_layout(file_path, graph):
+    """
+    Positions for ``graph`` loaded from ``file_path``: from memory, then from
+    the layout file, and only computed (and saved) when neither is current.
+    """
+    fingerprint = graph_fingerprint(file_path)
+    positions = _layouts.get(fingerprint)
+    if positions is None:
+        positions = read_layout(file_path, graph)
+        if positions is None:
+            positions = compute_layout(graph)
+            write_layout(file_path, graph, positions)
+        _layouts.clear()
+        _layouts[fingerprint] = positions
+    return positions
+
+
+def neighborhood(graph, nodes, hops=1):
+    """
+    Labels within ``hops`` edges of ``nodes``, following edges either way.
+
+    Args:
+        graph (CSRGraph): The graph.
+        nodes (iterable): Labels to start from, e.g. a shortest path.
+        hops (int): How far to reach out.
+
+    Returns:
+        set: The labels in the neighbourhood, including ``nodes``.
+    """
+    reverse = graph.reverse()
+    seen = {graph.node_id(label) for label in nodes}
+    frontier = list(seen)
+    for _ in range(hops):
+        next_frontier = []
+        for u in frontier:
+            for rows in (graph, reverse):
+                for edge in range(rows.offsets[u], rows.offsets[u + 1]):
+                    v = rows.targets[edge]
+                    if v not in seen:
+                        seen.add(v)
+                        next_frontier.append(v)
+        frontier = next_frontier
+    return {graph.label(u) for u in seen}
+
+
+def view_nodes(graph, path, view="auto", hops=1):
+    """
+    Picks the nodes to draw for one result.
+
+    Args:
+        graph (CSRGraph): The graph.
+        path (list): The shortest path, as labels.
+        view (str): One of ``VIEW_MODES``; "auto" shows the neighbourhood only
+            for graphs above ``FULL_VIEW_MAX_NODES``.
+        hops (int): Neighbourhood radius around the path.
+
+    Returns:
+        frozenset or None: The labels to draw, or None for the whole graph.
+    """
+    if view == "full" or (view == "auto" and graph.num_nodes <= FULL_VIEW_MAX_NODES) or not path:
+        return None
+    return frozenset(neighborhood(graph, path, hops))
+
+
+def layout_graph(graph, positions=None, nodes=None):
+    # NetworkX graph of the nodes to draw (all of them when nodes is None) and
+    # their positions; safe to run off the Tk thread
+    if positions is None:
+        positions = compute_layout(graph)
+    G = nx.DiGraph()
+    G.add_nodes_from(graph.labels if nodes is None else nodes)
+    for node in G.nodes:
+        for neighbor, weight in graph[node].items():
+            if nodes is None or neighbor in nodes:
+                G.add_edge(node, neighbor, weight=weight)
+    return G, {node: positions[node] for node in G}
+
+
+def draw_view(ax, G, pos):
+    """
+    Draws the nodes and edges of a ``layout_graph`` view on ``ax``. Labels and
+    arrows are left out of views too large to read them in.
+    """
+    num_nodes, num_edges = G.number_of_nodes(), G.number_of_edges()
+    small = num_nodes <= NODE_LABEL_MAX_NODES
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=400 if small else max(4, 40000 // max(1, num_nodes)), node_color='lavender')
+    nx.draw_networkx_edges(G, pos, ax=ax, width=1 if small else 0.3, arrows=num_edges <= ARROW_MAX_EDGES)
+    if small:
+        nx.draw_networkx_labels(G, pos, ax=ax, font_size=6, font_weight='bold')
+    if num_edges <= EDGE_LABEL_MAX_EDGES:
+        edge_labels = nx.get_edge_attributes(G, 'weight')
+        nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels=edge_labels, font_size=8)
+    ax.set_axis_off()
+
+
+def draw_path(ax, G, pos, edges_in_path):
+    """
+    Highlights ``edges_in_path`` on ``ax``.
+
+    Returns:
+        list: The artists drawn, so they can be removed again.
+    """
+    if not edges_in_path:
+        return []
+    artists = nx.draw_networkx_edges(G, pos, ax=ax, edgelist=edges_in_path, edge_color='purple', width=3, arrows=True)
+    return artists if isinstance(artists, list) else [artists]
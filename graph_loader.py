@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+from array import array
+from csr_graph import CSRGraph, INDEX_TYPE
+
+# Bytes of the text file parsed per read
+CHUNK_SIZE = 1 << 24
+
+# Sidecar layout: magic, fixed header, then offsets/targets/weights (int64) and the label table
+SIDECAR_SUFFIX = ".csr"
+SIDECAR_MAGIC = b"CSRGRPH1"
+SIDECAR_HEADER = struct.Struct("<8s8q")
+
+# Most recent graph per path, so repeated loads in one process share one object
+# (and whatever it has built lazily, such as its reverse index)
+_loaded = {}
+
+
+def graph_fingerprint(file_path):
+    """
+    Identifies one version of a graph file.
+
+    Args:
+        file_path (str): Path to the graph text file.
+
+    Returns:
+        tuple: ``(absolute path, size in bytes, mtime in ns)``.
+    """
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def sidecar_path(file_path):
+    return file_path + SIDECAR_SUFFIX
+
+
+def parse_graph_text(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Parses the ``num_nodes / num_edges / u v w`` text format in large chunks.
+
+    Only the ``num_edges`` lines after the header are read, as before. Lines
+    that do not hold exactly two labels and an integer weight are skipped.
+
+    Args:
+        file_path (str): Path to the graph text file.
+        chunk_size (int): Bytes read per chunk.
+
+    Returns:
+        tuple: ``(graph, num_nodes, num_edges)`` with a CSRGraph.
+    """
+    interned = {}
+    intern = interned.setdefault
+    src = array(INDEX_TYPE)
+    dst = array(INDEX_TYPE)
+    weights = array(INDEX_TYPE)
+
+    with open(file_path, 'rb') as file:
+        num_nodes = int(file.readline().strip())
+        num_edges = int(file.readline().strip())
+        remaining = num_edges
+        carry = b""
+
+        while remaining > 0:
+            chunk = file.read(chunk_size)
+            if chunk:
+                block = carry + chunk
+                cut = block.rfind(b"\n")
+                if cut < 0:
+                    carry = block
+                    continue
+                block, carry = block[:cut], block[cut + 1:]
+            elif carry:
+                block, carry = carry, b""
+            else:
+                break
+
+            lines = block.split(b"\n", remaining)[:remaining]
+            remaining -= len(lines)
+            rows = [line.split() for line in lines]
+
+            if not all(len(row) == 3 for row in rows):
+                rows = [row for row in rows if len(row) == 3 or _skip_line(row)]
+            try:
+                chunk_weights = array(INDEX_TYPE, [int(row[2]) for row in rows])
+            except ValueError:
+                rows = [row for row in rows if _is_int(row[2]) or _skip_line(row)]
+                chunk_weights = array(INDEX_TYPE, [int(row[2]) for row in rows])
+
+            src.extend([intern(row[0], len(interned)) for row in rows])
+            dst.extend([intern(row[1], len(interned)) for row in rows])
+            weights.extend(chunk_weights)
+
+    # Renumber ids in sorted label order (UTF-8 bytes sort like the decoded strings)
+    raw_labels = sorted(interned)
+    final_id = array(INDEX_TYPE, bytes(8 * len(raw_labels)))
+    for new_id, label in enumerate(raw_labels):
+        final_id[interned[label]] = new_id
+    src = array(INDEX_TYPE, [final_id[u] for u in src])
+    dst = array(INDEX_TYPE, [final_id[v] for v in dst])
+
+    labels = [label.decode('utf-8') for label in raw_labels]
+    graph = CSRGraph.from_id_edges(labels, src, dst, weights)
+    return graph, num_nodes, num_edges
+
+
+def _is_int(token):
+    try:
+        int(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _skip_line(row):
+    if row:
+        print(f"Skipping invalid line: {b' '.join(row).decode('utf-8', 'replace')}")
+    return False
+
+
+def write_sidecar(file_path, graph, num_nodes, num_edges):
+    """
+    Writes the binary cache for ``file_path`` next to it.
+
+    The write goes through a temporary file and ``os.replace``, so readers
+    never see a half-written sidecar. Failures (e.g. a read-only directory)
+    are ignored: the sidecar is only a cache.
+    """
+    _, size, mtime_ns = graph_fingerprint(file_path)
+    label_table = "\n".join(graph.labels).encode('utf-8')
+    header = SIDECAR_HEADER.pack(SIDECAR_MAGIC, size, mtime_ns, num_nodes, num_edges,
+                                 graph.num_nodes, graph.num_edges, len(label_table), graph.min_weight)
+    target = sidecar_path(file_path)
+    temp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as file:
+            file.write(header)
+            file.write(array(INDEX_TYPE, graph.offsets).tobytes())
+            file.write(array(INDEX_TYPE, graph.targets).tobytes())
+            file.write(array(INDEX_TYPE, graph.weights).tobytes())
+            file.write(label_table)
+        os.replace(temp, target)
+    except OSError:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def read_sidecar(file_path):
+    """
+    Memory-maps the binary cache for ``file_path`` if it is still current.
+
+    Returns:
+        tuple or None: ``(graph, num_nodes, num_edges)``, or None when there is
+        no sidecar or the text file's size/mtime no longer match.
+    """
+    target = sidecar_path(file_path)
+    try:
+        with open(target, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < SIDECAR_HEADER.size:
+                return None
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+
+    (magic, size, mtime_ns, num_nodes, num_edges,
+     node_count, edge_count, label_bytes, min_weight) = SIDECAR_HEADER.unpack_from(mapped)
+    _, current_size, current_mtime_ns = graph_fingerprint(file_path)
+    if magic != SIDECAR_MAGIC or (size, mtime_ns) != (current_size, current_mtime_ns):
+        mapped.close()
+        return None
+
+    view = memoryview(mapped)
+    start = SIDECAR_HEADER.size
+    offsets = view[start:start + 8 * (node_count + 1)].cast(INDEX_TYPE)
+    start += 8 * (node_count + 1)
+    targets = view[start:start + 8 * edge_count].cast(INDEX_TYPE)
+    start += 8 * edge_count
+    weights = view[start:start + 8 * edge_count].cast(INDEX_TYPE)
+    start += 8 * edge_count
+    label_table = bytes(view[start:start + label_bytes]).decode('utf-8')
+    labels = label_table.split("\n") if node_count else []
+
+    graph = CSRGraph(labels, offsets, targets, weights, min_weight)
+    return graph, num_nodes, num_edges
+
+
+def load_graph(file_path, use_sidecar=True):
+    """
+    Loads a graph file, using its binary sidecar when it is current.
+
+    On the first load the text is parsed in chunks and the sidecar is
+    written; later loads map the sidecar instead of reparsing. Within one
+    process the same graph object is returned until the file changes.
+
+    Args:
+        file_path (str): Path to the graph text file.
+        use_sidecar (bool): Read and write the binary cache.
+
+    Returns:
+        tuple: ``(graph, num_nodes, num_edges)`` with a CSRGraph.
+    """
+    if not use_sidecar:
+        return parse_graph_text(file_path)
+
+    fingerprint = graph_fingerprint(file_path)
+    loaded = _loaded.get(fingerprint[0])
+    if loaded is not None and loaded[0] == fingerprint:
+        return loaded[1]
+
+    result = read_sidecar(file_path)
+    if result is None:
+        result = parse_graph_text(file_path)
+        write_sidecar(file_path, *result)
+    _loaded[fingerprint[0]] = (fingerprint, result)
+    return result
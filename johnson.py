@@ -0,0 +1,222 @@
+import mmap
+import struct
+import sys
+import time
+from array import array
+from csr_graph import CSRGraph, INDEX_TYPE, predecessor_path
+from dijkstra import dijkstra_csr
+
+# Stored in the matrix for pairs with no path
+UNREACHABLE = 2 ** 63 - 1
+
+# File layout: header, label table padded to 8 bytes, then one row per source
+# holding num_nodes int64 distances followed by num_nodes int64 predecessors
+MATRIX_MAGIC = b"APSPMAT1"
+MATRIX_HEADER = struct.Struct("<8s2q")
+
+
+def compute_potentials(graph):
+    """
+    Bellman-Ford from a virtual source joined to every node by a 0-weight edge.
+
+    Returns:
+        list: Potential ``h`` per node id, with ``w + h[u] - h[v] >= 0`` for
+        every edge ``u -> v``.
+
+    Raises:
+        ValueError: If the graph contains a negative cycle.
+    """
+    edge_sources, edge_targets, edge_weights = graph.edge_sources(), graph.targets, graph.weights
+    potential = [0] * graph.num_nodes
+    if not potential:
+        return potential  # No passes run on an empty graph, so none can report a cycle
+
+    for _ in range(graph.num_nodes):
+        updated = False
+        for u, v, weight in zip(edge_sources, edge_targets, edge_weights):
+            if potential[u] + weight < potential[v]:
+                potential[v] = potential[u] + weight
+                updated = True
+        if not updated:
+            return potential
+
+    raise ValueError("Graph contains a negative cycle; shortest paths are undefined")
+
+
+def reweight(graph, potential):
+    """
+    Returns a copy of ``graph`` sharing its structure, with every weight
+    replaced by the non-negative ``w + h[u] - h[v]``.
+    """
+    weights = array(INDEX_TYPE, (
+        weight + potential[u] - potential[v]
+        for u, v, weight in graph.edges()
+    ))
+    reweighted = CSRGraph(graph.labels, graph.offsets, graph.targets, weights)
+    reweighted.index = graph.index
+    return reweighted
+
+
+def johnson_rows(graph):
+    """
+    Johnson's all-pairs shortest paths, one source at a time.
+
+    Bellman-Ford runs once for the potentials; each row is then one
+    ``dijkstra_csr`` run on the reweighted graph, shifted back to real
+    distances.
+
+    Yields:
+        tuple: ``(source_id, dist_row, pred_row)`` as int64 arrays, with
+        ``UNREACHABLE`` distances and ``-1`` predecessors for missing paths.
+    """
+    potential = compute_potentials(graph)
+    reweighted = reweight(graph, potential)
+    inf = float('inf')
+
+    for source in range(graph.num_nodes):
+        dist, pred = dijkstra_csr(reweighted, source)
+        offset = potential[source]
+        dist_row = array(INDEX_TYPE, (
+            UNREACHABLE if d == inf else d - offset + potential[v]
+            for v, d in enumerate(dist)
+        ))
+        yield source, dist_row, array(INDEX_TYPE, pred)
+
+
+class DistanceMatrix:
+    """
+    All-pairs distances and predecessors, in memory or memory-mapped from
+    a file written by ``save_johnson``.
+
+    Any ``(u, v)`` distance or path is answered from the stored rows
+    without recomputation.
+    """
+
+    def __init__(self, labels, dist, pred):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.dist = dist
+        self.pred = pred
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, num_nodes, label_bytes = MATRIX_HEADER.unpack_from(mapped)
+        if magic != MATRIX_MAGIC:
+            raise ValueError(f"{file_path} is not a distance matrix file")
+
+        start = MATRIX_HEADER.size
+        labels = mapped[start:start + label_bytes].decode('utf-8').split("\n") if num_nodes else []
+        start += _padded(label_bytes)
+        rows = memoryview(mapped)[start:start + 16 * num_nodes * num_nodes].cast(INDEX_TYPE)
+        return cls(labels, _RowView(rows, num_nodes, 0), _RowView(rows, num_nodes, num_nodes))
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    def distance(self, start, end):
+        """
+        Returns the shortest distance, or ``float('inf')`` if there is no path.
+        """
+        d = self.dist[self.index[start] * self.num_nodes + self.index[end]]
+        return float('inf') if d == UNREACHABLE else d
+
+    def path(self, start, end):
+        """
+        Returns the shortest path as a list of labels, or [] if there is none.
+        """
+        source, target = self.index[start], self.index[end]
+        row = source * self.num_nodes
+        if self.dist[row + target] == UNREACHABLE:
+            return []
+        return [self.labels[v] for v in predecessor_path(_Row(self.pred, row, self.num_nodes), source, target)]
+
+
+class _RowView:
+    # Flat [source * num_nodes + target] indexing over the interleaved file rows
+    def __init__(self, rows, num_nodes, shift):
+        self.rows = rows
+        self.num_nodes = num_nodes
+        self.shift = shift
+
+    def __getitem__(self, i):
+        source, target = divmod(i, self.num_nodes)
+        return self.rows[2 * self.num_nodes * source + self.shift + target]
+
+
+class _Row:
+    # One source's row of a flat matrix, indexed by target
+    def __init__(self, matrix, start, length):
+        self.matrix = matrix
+        self.start = start
+        self.length = length
+
+    def __getitem__(self, i):
+        return self.matrix[self.start + i]
+
+    def __len__(self):
+        return self.length
+
+
+def _padded(size):
+    return (size + 7) // 8 * 8
+
+
+def johnson(graph):
+    """
+    Computes the full matrix in memory.
+
+    Returns:
+        DistanceMatrix: ``num_nodes * num_nodes`` int64 distances and
+        predecessors (16 bytes per pair).
+    """
+    dist = array(INDEX_TYPE)
+    pred = array(INDEX_TYPE)
+    for _, dist_row, pred_row in johnson_rows(graph):
+        dist.extend(dist_row)
+        pred.extend(pred_row)
+    return DistanceMatrix(graph.labels, dist, pred)
+
+
+def save_johnson(graph, file_path):
+    """
+    Streams the matrix to ``file_path`` one row at a time, so only one row is
+    ever held in memory. Load it back with ``DistanceMatrix.load``.
+    """
+    label_table = "\n".join(graph.labels).encode('utf-8')
+    with open(file_path, 'wb') as file:
+        file.write(MATRIX_HEADER.pack(MATRIX_MAGIC, graph.num_nodes, len(label_table)))
+        file.write(label_table.ljust(_padded(len(label_table)), b"\0"))
+        for _, dist_row, pred_row in johnson_rows(graph):
+            file.write(dist_row.tobytes())
+            file.write(pred_row.tobytes())
+
+
+def main(argv):
+    """
+    Usage:
+        python johnson.py <graph file> <matrix file>      compute and save all pairs
+        python johnson.py --query <matrix file> <u> <v>   look up one pair
+    """
+    if len(argv) == 4 and argv[0] == "--query":
+        matrix = DistanceMatrix.load(argv[1])
+        path = matrix.path(argv[2], argv[3])
+        if path:
+            print(f"Distance: {matrix.distance(argv[2], argv[3])}\nPath: {' -> '.join(path)}")
+        else:
+            print(f"No path found from {argv[2]} to {argv[3]}")
+    elif len(argv) == 2:
+        from graph_loader import load_graph
+
+        graph, _, _ = load_graph(argv[0])
+        start_time = time.perf_counter()
+        save_johnson(graph, argv[1])
+        print(f"All pairs for {graph.num_nodes} nodes saved to {argv[1]} in {time.perf_counter() - start_time:.6f} seconds")
+    else:
+        print(main.__doc__.strip())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,154 @@
+import heapq
+import sys
+import time
+from csr_graph import predecessor_path
+from dijkstra import dijkstra_csr
+
+
+def yen_k_shortest_paths(graph, source, target, k, stats=None, progress=None, reverse=None):
+    """
+    The ``k`` shortest loopless paths from ``source`` to ``target`` (node ids),
+    by Yen's algorithm with Lawler's rule (a path only spurs from where it
+    left the path it was derived from).
+
+    One Dijkstra tree towards ``target`` (over the reverse graph) gives the
+    first path and the exact distance to the target from every node. Removing
+    nodes and edges can only make those distances longer, so they are a
+    consistent A* heuristic for every spur search, which then goes almost
+    straight to the target instead of growing a full Dijkstra ball.
+
+    Args:
+        graph: CSRGraph (or anything with ``offsets``, ``targets``,
+            ``weights``, ``num_nodes`` and ``reverse()``); weights must be
+            non-negative.
+        source (int): Start node id.
+        target (int): End node id.
+        k (int): Number of paths wanted.
+        stats (dict): Filled with settled (by the tree towards the target),
+            spur_searches, expanded and candidates.
+        progress (callable): ``progress(found)``, called after each path is
+            accepted; may raise to stop.
+        reverse: The reverse graph, when the caller already has it.
+
+    Returns:
+        list: Up to ``k`` ``(distance, path of node ids)`` tuples, shortest
+        first; fewer when the graph has fewer loopless paths.
+    """
+    inf = float('inf')
+    if reverse is None:
+        reverse = graph.reverse()
+    tree_stats = {}
+    to_target, successor = dijkstra_csr(reverse, target, stats=tree_stats)
+    counters = {'settled': tree_stats['settled'], 'spur_searches': 0, 'expanded': 0, 'candidates': 0}
+    accepted = []
+
+    if k > 0 and to_target[source] != inf:
+        # The reverse tree's predecessors lead from source to target along a shortest path
+        path = predecessor_path(successor, target, source)[::-1]
+        prefix = tuple(to_target[source] - to_target[node] for node in path)
+        accepted.append((to_target[source], tuple(path), prefix, 0))
+
+    candidates = []
+    seen = set()
+    blocked = bytearray(graph.num_nodes)
+    while accepted and len(accepted) < k:
+        if progress is not None:
+            progress(len(accepted))
+        _, path, prefix, deviation = accepted[-1]
+        for i in range(deviation, len(path) - 1):
+            spur, root = path[i], path[:i + 1]
+            # Edges out of the spur node taken by accepted paths with this root
+            taken = {other[i + 1] for _, other, _, _ in accepted if len(other) > i + 1 and other[:i + 1] == root}
+            for node in root[:-1]:
+                blocked[node] = 1
+            found = _spur_search(graph, spur, target, blocked, taken, to_target, counters)
+            for node in root[:-1]:
+                blocked[node] = 0
+            if found is None:
+                continue
+
+            spur_path, spur_dist = found
+            candidate = root[:-1] + spur_path
+            if candidate in seen:
+                continue
+            seen.add(candidate)
+            counters['candidates'] += 1
+            candidate_prefix = prefix[:i] + tuple(prefix[i] + d for d in spur_dist)
+            heapq.heappush(candidates, (candidate_prefix[-1], candidate, candidate_prefix, i))
+
+        if not candidates:
+            break
+        accepted.append(heapq.heappop(candidates))
+
+    if stats is not None:
+        stats.update(counters)
+    return [(distance, list(path)) for distance, path, _, _ in accepted[:k]]
+
+
+def _spur_search(graph, spur, target, blocked, taken, to_target, counters):
+    # A* from spur to target around blocked nodes and the taken edges out of
+    # spur, guided by the exact distances to target in the whole graph.
+    # Returns (path, distance from spur of each node on it) or None.
+    inf = float('inf')
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    counters['spur_searches'] += 1
+    dist = {spur: 0}
+    pred = {}
+    heap = [(to_target[spur], 0, spur)]
+    while heap:
+        _, distance, u = heapq.heappop(heap)
+        if distance > dist[u]:
+            continue
+        counters['expanded'] += 1
+        if u == target:
+            path = predecessor_path(pred, spur, target)
+            return tuple(path), [dist[node] for node in path]
+        for edge in range(offsets[u], offsets[u + 1]):
+            v = targets[edge]
+            if blocked[v] or to_target[v] == inf or (u == spur and v in taken):
+                continue
+            candidate = distance + weights[edge]
+            if candidate < dist.get(v, inf):
+                dist[v] = candidate
+                pred[v] = u
+                heapq.heappush(heap, (candidate + to_target[v], candidate, v))
+    return None
+
+
+def k_shortest_paths(graph, start, end, k, stats=None, progress=None):
+    """
+    ``yen_k_shortest_paths`` on labels.
+
+    Returns:
+        list: Up to ``k`` ``(distance, [labels])`` tuples, shortest first.
+    """
+    paths = yen_k_shortest_paths(graph, graph.node_id(start), graph.node_id(end), k, stats, progress)
+    return [(distance, graph.path_labels(path)) for distance, path in paths]
+
+
+def main(argv):
+    """
+    Usage:
+        python k_shortest.py <graph file> <start> <end> <k>
+
+    Prints the k shortest loopless paths and the time taken.
+    """
+    if len(argv) != 4:
+        print(main.__doc__.strip())
+        return
+
+    from graph_loader import load_graph
+
+    graph, _, _ = load_graph(argv[0])
+    stats = {}
+    start_time = time.perf_counter()
+    paths = k_shortest_paths(graph, argv[1], argv[2], int(argv[3]), stats)
+    elapsed = time.perf_counter() - start_time
+    for rank, (distance, path) in enumerate(paths, 1):
+        print(f"{rank}. {distance}: {' -> '.join(path)}")
+    print(f"Found {len(paths)} path(s) in {elapsed:.6f} seconds "
+          f"({stats['spur_searches']} spur searches, {stats['expanded']} nodes expanded)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,121 @@
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from csr_graph import INDEX_TYPE
+
+# Default memory budget for cached trees, in bytes
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Predecessor markers in a ShortestPathTree
+NO_PREDECESSOR = -1
+UNREACHED = -2
+
+
+class ShortestPathTree(Mapping):
+    """
+    Compact single-source result: one int64 distance and one int64
+    predecessor per node id, 16 bytes per node.
+
+    Reads like the ``{node: (predecessor, distance)}`` dict returned by
+    ``dijkstra()``, so ``reconstruct_path`` can walk it directly.
+    """
+
+    def __init__(self, graph, source, dist, pred):
+        self.graph = graph
+        self.source = source
+        inf = float('inf')
+        self.dist = array(INDEX_TYPE, (0 if d == inf else d for d in dist))
+        self.pred = array(INDEX_TYPE, (
+            UNREACHED if dist[v] == inf else (p if p >= 0 else NO_PREDECESSOR)
+            for v, p in enumerate(pred)
+        ))
+        self.size = sum(1 for p in self.pred if p != UNREACHED)
+
+    @property
+    def nbytes(self):
+        return self.dist.itemsize * len(self.dist) + self.pred.itemsize * len(self.pred)
+
+    def __getitem__(self, label):
+        v = self.graph.index[label]
+        p = self.pred[v]
+        if p == UNREACHED:
+            raise KeyError(label)
+        return (self.graph.labels[p] if p >= 0 else None), self.dist[v]
+
+    def __contains__(self, label):
+        v = self.graph.index.get(label)
+        return v is not None and self.pred[v] != UNREACHED
+
+    def __iter__(self):
+        labels = self.graph.labels
+        return (labels[v] for v, p in enumerate(self.pred) if p != UNREACHED)
+
+    def __len__(self):
+        return self.size
+
+
+class ShortestPathCache:
+    """
+    LRU cache of shortest-path trees keyed by ``(graph fingerprint, source)``.
+
+    The fingerprint is ``graph_loader.graph_fingerprint(path)``, i.e. the file
+    path plus its size and mtime. Looking up a path whose size or mtime has
+    changed drops every tree cached for the older version of that file.
+
+    Args:
+        max_bytes (int): Memory budget for all cached trees. Least recently
+            used trees are evicted once it is exceeded; a tree larger than
+            the whole budget is never cached.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+        self._versions = {}
+
+    def _check_version(self, fingerprint):
+        path, version = fingerprint[0], fingerprint[1:]
+        if self._versions.get(path, version) != version:
+            self.invalidate(path)
+        self._versions[path] = version
+
+    def get(self, fingerprint, source):
+        self._check_version(fingerprint)
+        key = (fingerprint, source)
+        tree = self._trees.get(key)
+        if tree is None:
+            self.misses += 1
+            return None
+        self._trees.move_to_end(key)
+        self.hits += 1
+        return tree
+
+    def put(self, fingerprint, source, tree):
+        self._check_version(fingerprint)
+        if tree.nbytes > self.max_bytes:
+            return
+        key = (fingerprint, source)
+        if key in self._trees:
+            self.current_bytes -= self._trees.pop(key).nbytes
+        self._trees[key] = tree
+        self.current_bytes += tree.nbytes
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._trees.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+
+    def invalidate(self, path=None):
+        """
+        Drops every tree cached for ``path``, or everything when path is None.
+        """
+        for key in [key for key in self._trees if path is None or key[0][0] == path]:
+            self.current_bytes -= self._trees.pop(key).nbytes
+        if path is None:
+            self._versions.clear()
+        else:
+            self._versions.pop(path, None)
+
+    def __len__(self):
+        return len(self._trees)
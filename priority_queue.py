@@ -0,0 +1,97 @@
+class IndexedHeap:
+    """
+    d-ary min-heap of node ids keyed by priority, with decrease-key.
+
+    Each node is held at most once, so the heap never grows past the number
+    of nodes and pops are never stale. Ties break by node id, the same order
+    as ``(priority, node)`` tuples in ``heapq``.
+
+    Args:
+        num_nodes (int): Node ids run from 0 to num_nodes - 1.
+        arity (int): Children per heap entry; 2 is a binary heap, 4 trades
+            slightly dearer pops for shallower sift-ups.
+    """
+
+    def __init__(self, num_nodes, arity=4):
+        self.arity = arity
+        self.heap = []
+        self.key = [0] * num_nodes
+        self.position = [-1] * num_nodes
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, node):
+        return self.position[node] >= 0
+
+    def push(self, node, priority):
+        """
+        Inserts ``node``, or lowers its priority if it is already queued.
+        The priority must not be higher than the one it is queued with.
+
+        Returns:
+            bool: True for a decrease-key, False for a new entry.
+        """
+        position = self.position[node]
+        decrease = position >= 0
+        if not decrease:
+            position = len(self.heap)
+            self.heap.append(node)
+        self.key[node] = priority
+        self._sift_up(node, position)
+        return decrease
+
+    def pop(self):
+        """
+        Removes the node with the lowest priority.
+
+        Returns:
+            tuple: ``(priority, node)``.
+        """
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            self._sift_down(last, 0)
+        return self.key[top], top
+
+    def _sift_up(self, node, i):
+        heap, key, position, arity = self.heap, self.key, self.position, self.arity
+        priority = key[node]
+        while i > 0:
+            parent_index = (i - 1) // arity
+            parent = heap[parent_index]
+            parent_priority = key[parent]
+            if parent_priority < priority or (parent_priority == priority and parent < node):
+                break
+            heap[i] = parent
+            position[parent] = i
+            i = parent_index
+        heap[i] = node
+        position[node] = i
+
+    def _sift_down(self, node, i):
+        heap, key, position, arity = self.heap, self.key, self.position, self.arity
+        size = len(heap)
+        priority = key[node]
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                break
+            # Smallest of the up to `arity` children
+            best, child = first, heap[first]
+            best_priority = key[child]
+            for index in range(first + 1, min(first + arity, size)):
+                other = heap[index]
+                other_priority = key[other]
+                if other_priority < best_priority or (other_priority == best_priority and other < child):
+                    best, child, best_priority = index, other, other_priority
+            if best_priority < priority or (best_priority == priority and child < node):
+                heap[i] = child
+                position[child] = i
+                i = best
+            else:
+                break
+        heap[i] = node
+        position[node] = i
@@ -0,0 +1,347 @@
+import sys
+import time
+import weakref
+from array import array
+from collections import OrderedDict
+from csr_graph import INDEX_TYPE
+
+# Up to this many components the index keeps each one's full set of reachable
+# components as a bitset (at most CLOSURE_MAX_COMPONENTS ** 2 / 8 bytes);
+# beyond that it falls back to interval labels plus a pruned search
+CLOSURE_MAX_COMPONENTS = 1 << 14
+
+# Searches are only moved to the relevant subgraph when it keeps at most this
+# share of the nodes; otherwise copying it costs more than it saves
+RESTRICT_MAX_FRACTION = 0.5
+
+# Relevant subgraphs kept per index, keyed by (source component, target component):
+# the most recently used ones, at most SUBGRAPH_CACHE_SIZE of them and together
+# at most SUBGRAPH_CACHE_FRACTION of the graph's nodes plus edges, so the cache
+# never holds more than that share of the graph again
+SUBGRAPH_CACHE_SIZE = 16
+SUBGRAPH_CACHE_FRACTION = 1.0
+
+# Index per graph object, built on first use
+_index_cache = weakref.WeakKeyDictionary()
+
+
+def strongly_connected_components(graph):
+    """
+    Tarjan's algorithm on the CSR arrays, without recursion.
+
+    Returns:
+        tuple: ``(component, count)`` where ``component[u]`` is the component
+        id of node ``u``. Ids are topologically ordered: every edge between
+        two components goes from a lower id to a higher one.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    n = graph.num_nodes
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    component = [-1] * n
+    counter = 0
+    count = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+        while work:
+            u, edge = work[-1]
+            end = offsets[u + 1]
+            while edge < end:
+                v = targets[edge]
+                edge += 1
+                if index[v] < 0:
+                    # Descend into v and resume u's edges after it is done
+                    work[-1] = (u, edge)
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = 1
+                    work.append((v, offsets[v]))
+                    break
+                if on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+            else:
+                work.pop()
+                if low[u] == index[u]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = count
+                        if w == u:
+                            break
+                    count += 1
+                if work:
+                    parent = work[-1][0]
+                    if low[u] < low[parent]:
+                        low[parent] = low[u]
+
+    # Tarjan finishes a component after everything it reaches, i.e. in
+    # reverse topological order
+    return [count - 1 - c for c in component], count
+
+
+class ReachabilityIndex:
+    """
+    Strongly connected components of a graph, their condensation DAG and a
+    reachability index over it.
+
+    ``reachable(u, v)`` is O(1) whenever the answer is "no" for graphs with
+    up to ``CLOSURE_MAX_COMPONENTS`` components (an exact bitset closure).
+    Larger graphs answer most "no"s in O(1) from topological order and DFS
+    interval labels and search the DAG, pruned by the same tests, otherwise.
+
+    Args:
+        graph (CSRGraph): The graph to index.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.component, self.num_components = strongly_connected_components(graph)
+        component = self.component
+        count = self.num_components
+
+        # Nodes grouped by component
+        self.member_offsets = array(INDEX_TYPE, bytes(8 * (count + 1)))
+        for c in component:
+            self.member_offsets[c + 1] += 1
+        for c in range(count):
+            self.member_offsets[c + 1] += self.member_offsets[c]
+        position = array(INDEX_TYPE, self.member_offsets[:-1])
+        self.members = array(INDEX_TYPE, bytes(8 * graph.num_nodes))
+        for u, c in enumerate(component):
+            self.members[position[c]] = u
+            position[c] += 1
+
+        # Condensation DAG as CSR, one edge per connected pair of components
+        successors = [set() for _ in range(count)]
+        offsets, targets = graph.offsets, graph.targets
+        for u in range(graph.num_nodes):
+            cu = component[u]
+            for edge in range(offsets[u], offsets[u + 1]):
+                cv = component[targets[edge]]
+                if cv != cu:
+                    successors[cu].add(cv)
+        self.dag_offsets = array(INDEX_TYPE, [0])
+        self.dag_targets = array(INDEX_TYPE)
+        for row in successors:
+            self.dag_targets.extend(sorted(row))
+            self.dag_offsets.append(len(self.dag_targets))
+
+        self.closure = self._build_closure() if count <= CLOSURE_MAX_COMPONENTS else None
+        self.post, self.low = (None, None) if self.closure is not None else self._build_intervals()
+        self._subgraphs = OrderedDict()
+        self._cached_size = 0
+
+    def _build_closure(self):
+        # Successors have higher ids, so fill in from the last component back
+        dag_offsets, dag_targets = self.dag_offsets, self.dag_targets
+        closure = [0] * self.num_components
+        for c in range(self.num_components - 1, -1, -1):
+            bits = 1 << c
+            for edge in range(dag_offsets[c], dag_offsets[c + 1]):
+                bits |= closure[dag_targets[edge]]
+            closure[c] = bits
+        return closure
+
+    def _build_intervals(self):
+        # Post-order number of every component, and the lowest one among its
+        # descendants: whatever c reaches has its number in [low[c], post[c]]
+        dag_offsets, dag_targets = self.dag_offsets, self.dag_targets
+        count = self.num_components
+        post = [-1] * count
+        visited = bytearray(count)
+        number = 0
+        for root in range(count):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            work = [(root, dag_offsets[root])]
+            while work:
+                c, edge = work[-1]
+                end = dag_offsets[c + 1]
+                while edge < end:
+                    d = dag_targets[edge]
+                    edge += 1
+                    if not visited[d]:
+                        visited[d] = 1
+                        work[-1] = (c, edge)
+                        work.append((d, dag_offsets[d]))
+                        break
+                else:
+                    work.pop()
+                    post[c] = number
+                    number += 1
+
+        low = list(post)
+        for c in range(count - 1, -1, -1):
+            for edge in range(dag_offsets[c], dag_offsets[c + 1]):
+                d = dag_targets[edge]
+                if low[d] < low[c]:
+                    low[c] = low[d]
+        return post, low
+
+    def _may_reach(self, c, d):
+        # False only when component c certainly cannot reach component d
+        if d < c:
+            return False
+        if self.closure is not None:
+            return bool(self.closure[c] >> d & 1)
+        return self.low[c] <= self.post[d] <= self.post[c]
+
+    def component_reachable(self, c, d):
+        """
+        Tells whether component ``c`` reaches component ``d`` in the DAG.
+        """
+        if c == d:
+            return True
+        if not self._may_reach(c, d):
+            return False
+        if self.closure is not None:
+            return True
+
+        dag_offsets, dag_targets = self.dag_offsets, self.dag_targets
+        seen = {c}
+        stack = [c]
+        while stack:
+            current = stack.pop()
+            for edge in range(dag_offsets[current], dag_offsets[current + 1]):
+                e = dag_targets[edge]
+                if e == d:
+                    return True
+                if e not in seen and self._may_reach(e, d):
+                    seen.add(e)
+                    stack.append(e)
+        return False
+
+    def reachable(self, u, v):
+        """
+        Tells whether node id ``v`` can be reached from node id ``u``.
+        """
+        return self.component_reachable(self.component[u], self.component[v])
+
+    def relevant_components(self, source, target):
+        """
+        Components that lie on some path from node id ``source`` to node id
+        ``target``; every other node is a dead end for this query or cannot be
+        reached from the source at all.
+
+        Returns:
+            list: Component ids in topological order, empty when ``target``
+            is unreachable.
+        """
+        cs, ct = self.component[source], self.component[target]
+        if not self.component_reachable(cs, ct):
+            return []
+
+        # Forward from the source, keeping only components that may still reach the target
+        dag_offsets, dag_targets = self.dag_offsets, self.dag_targets
+        forward = {cs}
+        stack = [cs]
+        while stack:
+            c = stack.pop()
+            for edge in range(dag_offsets[c], dag_offsets[c + 1]):
+                d = dag_targets[edge]
+                if d not in forward and self._may_reach(d, ct):
+                    forward.add(d)
+                    stack.append(d)
+
+        # Then keep those that do reach it, deciding later components first
+        useful = set()
+        for c in sorted(forward, reverse=True):
+            if c == ct or any(dag_targets[edge] in useful for edge in range(dag_offsets[c], dag_offsets[c + 1])):
+                useful.add(c)
+        return sorted(useful)
+
+    def relevant_subgraph(self, source, target):
+        """
+        The subgraph a search from node id ``source`` to node id ``target``
+        needs, or None when it would keep more than ``RESTRICT_MAX_FRACTION``
+        of the graph (search the whole graph then). Recently used subgraphs
+        are kept within the ``SUBGRAPH_CACHE_SIZE`` and
+        ``SUBGRAPH_CACHE_FRACTION`` limits, so repeated queries between the
+        same components reuse them.
+        """
+        key = (self.component[source], self.component[target])
+        if key in self._subgraphs:
+            self._subgraphs.move_to_end(key)
+            return self._subgraphs[key]
+
+        components = self.relevant_components(source, target)
+        size = sum(self.member_offsets[c + 1] - self.member_offsets[c] for c in components)
+        subgraph = None
+        if size <= RESTRICT_MAX_FRACTION * self.graph.num_nodes:
+            nodes = []
+            for c in components:
+                nodes.extend(self.members[self.member_offsets[c]:self.member_offsets[c + 1]])
+            subgraph = self.graph.subgraph(nodes)
+
+        self._subgraphs[key] = subgraph
+        self._cached_size += _cache_size(subgraph)
+        budget = SUBGRAPH_CACHE_FRACTION * (self.graph.num_nodes + self.graph.num_edges)
+        while len(self._subgraphs) > SUBGRAPH_CACHE_SIZE or (self._cached_size > budget and len(self._subgraphs) > 1):
+            _, evicted = self._subgraphs.popitem(last=False)
+            self._cached_size -= _cache_size(evicted)
+        return subgraph
+
+
+def _cache_size(subgraph):
+    # What a cached entry counts against SUBGRAPH_CACHE_FRACTION; the None
+    # markers for queries that search the whole graph cost nothing
+    return 0 if subgraph is None else subgraph.num_nodes + subgraph.num_edges
+
+
+def get_reachability(graph):
+    """
+    Returns the reachability index of ``graph``, building it on first use.
+    """
+    index = _index_cache.get(graph)
+    if index is None:
+        index = ReachabilityIndex(graph)
+        _index_cache[graph] = index
+    return index
+
+
+def main(argv):
+    """
+    Usage:
+        python reachability.py <graph file> [<start> <end>]
+
+    Prints the component structure of the graph and, for a query, whether
+    the end can be reached and how much of the graph a search needs.
+    """
+    if len(argv) not in (1, 3):
+        print(main.__doc__.strip())
+        return
+
+    from graph_loader import load_graph
+
+    graph, _, _ = load_graph(argv[0])
+    start_time = time.perf_counter()
+    index = get_reachability(graph)
+    build_time = time.perf_counter() - start_time
+    largest = max((index.member_offsets[c + 1] - index.member_offsets[c] for c in range(index.num_components)), default=0)
+    print(f"{graph.num_nodes} nodes in {index.num_components} strongly connected components "
+          f"(largest {largest}), {len(index.dag_targets)} DAG edges; indexed in {build_time:.6f} seconds")
+
+    if len(argv) == 3:
+        source, target = graph.node_id(argv[1]), graph.node_id(argv[2])
+        if not index.reachable(source, target):
+            print(f"{argv[2]} is unreachable from {argv[1]}")
+            return
+        components = index.relevant_components(source, target)
+        size = sum(index.member_offsets[c + 1] - index.member_offsets[c] for c in components)
+        print(f"{argv[2]} is reachable from {argv[1]}; a search needs {size} of {graph.num_nodes} nodes "
+              f"in {len(components)} components")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
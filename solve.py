@@ -0,0 +1,238 @@
+import argparse
+import json
+import sys
+import time
+from csr_graph import predecessor_path
+from dijkstra import QUEUE_BACKENDS
+from graph_loader import load_graph
+from telemetry import telemetry
+
+# Solvers offered on the command line. Tree solvers answer every target of a
+# source from one run; point-to-point ones run once per (source, target) pair.
+TREE_ALGORITHMS = ("dijkstra", "delta_stepping", "bellman_ford", "bellman_ford_numpy", "spfa")
+PAIR_ALGORITHMS = ("bidirectional", "astar")
+ALGORITHMS = TREE_ALGORITHMS + PAIR_ALGORITHMS
+
+# Solvers whose answers are only right without negative edge weights
+NON_NEGATIVE_ALGORITHMS = ("dijkstra", "delta_stepping", "bidirectional", "astar")
+
+OUTPUT_FORMATS = ("tsv", "jsonl")
+
+
+def solve_tree(graph, algorithm, source, target=None, stats=None, queue="binary", delta=None, workers=1,
+               fail_on_negative_cycle=False):
+    """
+    Runs one of ``TREE_ALGORITHMS`` from node id ``source``.
+
+    Args:
+        target (int): Lets Dijkstra and delta-stepping stop once it is settled.
+        queue (str): Priority queue for Dijkstra.
+        delta (int): Bucket width for delta-stepping (None picks one).
+        workers (int): Threads for delta-stepping.
+        fail_on_negative_cycle (bool): Raise instead of answering when a
+            negative cycle is reachable from ``source``.
+
+    Returns:
+        tuple: ``(dist, pred)`` lists indexed by node id. Nodes a negative
+        cycle reaches have distance ``-inf`` (Bellman-Ford and SPFA only; the
+        others need non-negative weights).
+
+    Raises:
+        ValueError: A negative cycle is reachable from ``source`` and
+            ``fail_on_negative_cycle`` is set.
+    """
+    # Each solver module is imported only when it is used
+    if algorithm == "dijkstra":
+        from dijkstra import dijkstra_csr
+        return dijkstra_csr(graph, source, target, stats, queue)
+    if algorithm == "delta_stepping":
+        from delta_stepping import delta_stepping
+        return delta_stepping(graph, source, target, delta, stats, workers)
+    if algorithm == "spfa":
+        from bellmanFord import spfa
+        dist, pred, cycles = spfa(graph, source, stats=stats)
+    else:
+        from bellmanFord import bellman_ford, find_negative_cycles
+        dist, pred = bellman_ford(graph, source, stats=stats, method="numpy" if algorithm == "bellman_ford_numpy" else "scalar")
+        dist, cycles = find_negative_cycles(graph, dist, pred)
+        if stats is not None:
+            stats['negative_cycles'] = len(cycles)
+    if cycles and fail_on_negative_cycle:
+        cycle = graph.path_labels(cycles[0] + cycles[0][:1])
+        raise ValueError(f"Negative cycle reachable from {graph.label(source)}: {' -> '.join(cycle)}")
+    return dist, pred
+
+
+def solve_pair(graph, algorithm, source, target, stats=None, coordinates=None, metric="euclidean"):
+    """
+    Runs one of ``PAIR_ALGORITHMS`` from node id ``source`` to node id ``target``.
+
+    Returns:
+        tuple: ``(distance, path of node ids)``, or ``(inf, [])`` when there is no path.
+    """
+    if algorithm == "bidirectional":
+        from dijkstra import bidirectional_dijkstra_csr
+        return bidirectional_dijkstra_csr(graph, source, target, stats)
+
+    from astar import astar_csr, coordinate_heuristic, get_landmarks
+    if coordinates is None:
+        heuristic = get_landmarks(graph).heuristic(target)
+    else:
+        bound, labels, end = coordinate_heuristic(coordinates, metric), graph.labels, graph.label(target)
+        heuristic = lambda node: bound(labels[node], end)
+    dist, pred = astar_csr(graph, source, target, heuristic, stats)
+    return dist[target], predecessor_path(pred, source, target) if dist[target] != float('inf') else []
+
+
+def run_queries(graph, algorithm, sources, targets=None, stats=None, **options):
+    """
+    Answers every (source, target) query on node ids.
+
+    Args:
+        graph (CSRGraph): The graph.
+        algorithm (str): One of ``ALGORITHMS``.
+        sources (list): Source node ids.
+        targets (list): Target node ids; None means every node (tree solvers only).
+        stats (dict): Receives the counters of the last solver run.
+        **options: Passed on to ``solve_tree`` or ``solve_pair``.
+
+    Yields:
+        tuple: ``(source, target, distance, path)`` with ids; the distance is
+        ``inf`` and the path empty when there is no path, and ``-inf`` with
+        an empty path when a negative cycle lies on the way.
+
+    Raises:
+        ValueError: A negative cycle is reachable from one of the sources and
+            ``fail_on_negative_cycle`` is set.
+    """
+    for source in sources:
+        if algorithm in PAIR_ALGORITHMS:
+            pair_options = {k: v for k, v in options.items() if k in ("coordinates", "metric")}
+            for target in targets:
+                distance, path = solve_pair(graph, algorithm, source, target, stats, **pair_options)
+                yield source, target, distance, path
+            continue
+
+        tree_options = {k: v for k, v in options.items() if k in ("queue", "delta", "workers", "fail_on_negative_cycle")}
+        # A single target lets the solvers that support it stop early
+        early_target = targets[0] if targets is not None and len(targets) == 1 else None
+        dist, pred = solve_tree(graph, algorithm, source, early_target, stats, **tree_options)
+        for target in (targets if targets is not None else range(graph.num_nodes)):
+            distance = dist[target]
+            path = predecessor_path(pred, source, target) if abs(distance) != float('inf') else []
+            yield source, target, distance, path
+
+
+def format_result(graph, source, target, distance, path, output_format, with_paths=True):
+    labels = graph.labels
+    if output_format == "jsonl":
+        record = {"source": labels[source], "target": labels[target],
+                  "distance": distance if abs(distance) != float('inf') else None}
+        if distance == float('-inf'):
+            record["negative_cycle"] = True  # JSON has no -inf; null alone would read as unreachable
+        if with_paths:
+            record["path"] = [labels[node] for node in path]
+        return json.dumps(record)
+    # Tab-separated like batch.py: source, target, distance, path
+    fields = [labels[source], labels[target], str(distance)]
+    if with_paths:
+        fields.append(" -> ".join(labels[node] for node in path))
+    return "\t".join(fields)
+
+
+def save_plot(graph_file, graph, path, file_path, hops=1):
+    """
+    Draws ``path`` (labels) over its ``hops``-neighbourhood, or the whole
+    graph when it is small, into an image file. matplotlib and networkx are
+    loaded here, never on the solving path.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    from graph_layout import draw_path, draw_view, get_layout, layout_graph, view_nodes
+
+    G, pos = layout_graph(graph, get_layout(graph_file, graph), view_nodes(graph, path, "auto", hops))
+    figure = Figure(figsize=(10, 6))
+    ax = figure.add_subplot()
+    draw_view(ax, G, pos)
+    draw_path(ax, G, pos, list(zip(path, path[1:])))
+    figure.tight_layout(pad=1)
+    figure.savefig(file_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve shortest-path queries without the GUI.")
+    parser.add_argument("graph_file", help="graph file (num_nodes / num_edges / u v w)")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="dijkstra")
+    parser.add_argument("-s", "--sources", nargs="+", required=True, help="source node labels")
+    parser.add_argument("-t", "--targets", nargs="+", help="target node labels (default: every node)")
+    parser.add_argument("--queue", choices=QUEUE_BACKENDS, default="binary", help="Dijkstra priority queue")
+    parser.add_argument("--delta", type=int, help="delta-stepping bucket width (default: automatic)")
+    parser.add_argument("--workers", type=int, default=1, help="delta-stepping threads (0: every core)")
+    parser.add_argument("--fail-on-negative-cycle", action="store_true",
+                        help="stop with an error instead of reporting -inf behind a negative cycle")
+    parser.add_argument("--coordinates", help="node coordinates file for the A* heuristic (default: ALT landmarks)")
+    parser.add_argument("--metric", choices=("euclidean", "manhattan"), default="euclidean")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="tsv")
+    parser.add_argument("-o", "--output", help="results file (default: standard output)")
+    parser.add_argument("--no-paths", action="store_true", help="print distances only")
+    parser.add_argument("--stats", action="store_true", help="print timings and solver counters to standard error")
+    parser.add_argument("--plot", help="also draw the first path found into this image file")
+    parser.add_argument("--hops", type=int, default=1, help="neighbourhood drawn around the plotted path")
+    args = parser.parse_args(argv)
+
+    if args.algorithm in PAIR_ALGORITHMS and not args.targets:
+        parser.error(f"--algorithm {args.algorithm} needs --targets")
+
+    load_start = time.perf_counter()
+    graph, _, _ = load_graph(args.graph_file)
+    load_time = (time.perf_counter() - load_start) * 1000
+    missing = [node for node in args.sources + (args.targets or []) if node not in graph]
+    if missing:
+        parser.error(f"unknown node(s): {', '.join(missing)}")
+    if args.algorithm in NON_NEGATIVE_ALGORITHMS and graph.num_edges and graph.min_weight < 0:
+        parser.error(f"--algorithm {args.algorithm} needs non-negative edge weights; use bellman_ford or spfa")
+
+    coordinates = None
+    if args.coordinates:
+        from astar import read_coordinates
+        coordinates = read_coordinates(args.coordinates)
+
+    sources = [graph.node_id(node) for node in args.sources]
+    targets = [graph.node_id(node) for node in args.targets] if args.targets else None
+    stats = {}
+    answered = 0
+    plotted = None
+    output = open(args.output, 'w') if args.output else sys.stdout
+    solve_start = time.perf_counter()
+    try:
+        results = run_queries(graph, args.algorithm, sources, targets, stats, queue=args.queue, delta=args.delta,
+                              workers=args.workers or None, coordinates=coordinates, metric=args.metric,
+                              fail_on_negative_cycle=args.fail_on_negative_cycle)
+        for source, target, distance, path in results:
+            output.write(format_result(graph, source, target, distance, path, args.format, not args.no_paths) + "\n")
+            answered += 1
+            if plotted is None and len(path) > 1:
+                plotted = path
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    solve_time = (time.perf_counter() - solve_start) * 1000
+
+    telemetry.record("solve", graph_file=args.graph_file, algorithm=args.algorithm, sources=len(sources),
+                     queries=answered, num_nodes=graph.num_nodes, num_edges=graph.num_edges,
+                     load_ms=load_time, solve_ms=solve_time, **stats)
+    if args.stats:
+        counters = " ".join(f"{key}={value}" for key, value in stats.items())
+        print(f"load {load_time:.3f} ms, solve {solve_time:.3f} ms; {counters}", file=sys.stderr)
+    if args.plot:
+        if plotted is None:
+            print("No path to plot", file=sys.stderr)
+        else:
+            save_plot(args.graph_file, graph, graph.path_labels(plotted), args.plot, args.hops)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,91 @@
+import atexit
+import json
+import os
+import time
+
+# Set SPS_TELEMETRY=0 to switch telemetry off; solvers then get no stats dict
+ENABLED = os.environ.get("SPS_TELEMETRY", "1") != "0"
+
+# Default JSON Lines file the records are flushed to
+TELEMETRY_FILE = "telemetry.jsonl"
+
+
+class Telemetry:
+    """
+    Buffers per-query metric records in memory and appends them to a JSON
+    Lines file in batches.
+
+    A batch is written once ``batch_size`` records are waiting or the oldest
+    waiting record is ``flush_interval`` seconds old, and again at exit.
+
+    Args:
+        file_path (str): JSON Lines file to append to.
+        batch_size (int): Records buffered before a flush.
+        flush_interval (float): Longest time in seconds a record waits.
+    """
+
+    def __init__(self, file_path=TELEMETRY_FILE, batch_size=100, flush_interval=30.0):
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = ENABLED
+        self._buffer = []
+        self._oldest = None
+
+    def stats(self):
+        """
+        Returns a fresh counter dict for a solver, or None when disabled so
+        the solver skips filling it in.
+        """
+        return {} if self.enabled else None
+
+    def record(self, event, **metrics):
+        """
+        Buffers one record: ``event`` names what was measured (e.g. "dijkstra"),
+        ``metrics`` holds its JSON-serialisable values. Times are in ms.
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        metrics["event"] = event
+        metrics["timestamp"] = now
+        self._buffer.append(metrics)
+        if self._oldest is None:
+            self._oldest = now
+        if len(self._buffer) >= self.batch_size or now - self._oldest >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in self._buffer)
+        with open(self.file_path, "a") as file:
+            file.write(lines)
+        self._buffer = []
+        self._oldest = None
+
+
+def read_records(file_path=TELEMETRY_FILE, event=None):
+    """
+    Reads records back from a telemetry file.
+
+    Args:
+        file_path (str): JSON Lines file written by Telemetry.
+        event (str): Only return records of this event, if given.
+
+    Returns:
+        list: Record dictionaries in the order they were written.
+    """
+    records = []
+    with open(file_path, "r") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                if event is None or record.get("event") == event:
+                    records.append(record)
+    return records
+
+
+# Shared recorder for the whole process
+telemetry = Telemetry()
+atexit.register(telemetry.flush)